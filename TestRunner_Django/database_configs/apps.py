@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class DatabaseConfigsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "database_configs"
+
+    def ready(self):
+        # 注册数据库配置变更时释放连接池的信号处理器
+        import database_configs.signals  # noqa: F401
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, pre_save
+from django.dispatch import receiver
+
+from .models import DatabaseConfig
+
+
+@receiver(pre_save, sender=DatabaseConfig)
+def dispose_engine_on_change(sender, instance, **kwargs):
+    """数据库配置变更时释放旧连接串对应的引擎连接池，后续SQL使用新配置重新建立连接"""
+    if not instance.pk:
+        return
+
+    from utils.db_utils import dispose_database_engine
+
+    old_config = DatabaseConfig.objects.filter(pk=instance.pk).first()
+    if old_config:
+        dispose_database_engine(old_config.connection_string)
+
+
+@receiver(post_delete, sender=DatabaseConfig)
+def dispose_engine_on_delete(sender, instance, **kwargs):
+    """数据库配置删除时释放对应的引擎连接池"""
+    from utils.db_utils import dispose_database_engine
+    dispose_database_engine(instance.connection_string)
@@ -14,6 +14,7 @@ class EnvironmentResource(resources.ModelResource):
         exclude = ('id', 'created_time', 'updated_time')
         export_order = (
             'name', 'project', 'base_url', 'verify_ssl',
+            'pool_maxsize', 'keep_alive', 'max_retries', 'http2', 'spill_threshold_mb',
             'description', 'parent', 'database_config',
             'is_active', 'created_by'
         )
@@ -50,6 +51,14 @@ class EnvironmentAdmin(ImportExportModelAdmin):
             'fields': ('parent', 'database_config'),
             'description': _('父环境必须与当前环境属于同一项目；数据库配置同理')
         }),
+        (_('连接池配置'), {
+            'fields': ('pool_maxsize', 'keep_alive', 'max_retries', 'http2'),
+            'description': _('同一次执行中的用例共享连接池; 启用HTTP/2需安装httpx[http2]')
+        }),
+        (_('响应配置'), {
+            'fields': ('spill_threshold_mb',),
+            'description': _('超过阈值的响应体写入临时文件, 报告仅记录哈希、大小和预览; 0表示不启用')
+        }),
         (_('元数据'), {
             'fields': ('created_by', 'created_time', 'updated_time'),
             'classes': ('collapse',)  # 可折叠
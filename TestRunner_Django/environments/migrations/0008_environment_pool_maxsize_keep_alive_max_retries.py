@@ -0,0 +1,28 @@
+# Generated by Django 4.2.17 on 2026-10-17 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("environments", "0007_environment_database_config"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="environment",
+            name="pool_maxsize",
+            field=models.PositiveIntegerField(default=10, verbose_name="连接池大小"),
+        ),
+        migrations.AddField(
+            model_name="environment",
+            name="keep_alive",
+            field=models.BooleanField(default=True, verbose_name="保持长连接"),
+        ),
+        migrations.AddField(
+            model_name="environment",
+            name="max_retries",
+            field=models.PositiveIntegerField(default=0, verbose_name="连接失败重试次数"),
+        ),
+    ]
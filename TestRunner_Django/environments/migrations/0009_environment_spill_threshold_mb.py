@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-17 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("environments", "0008_environment_pool_maxsize_keep_alive_max_retries"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="environment",
+            name="spill_threshold_mb",
+            field=models.PositiveIntegerField(default=10, verbose_name="响应体落盘阈值(MB)"),
+        ),
+    ]
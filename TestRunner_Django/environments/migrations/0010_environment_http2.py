@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-17 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("environments", "0009_environment_spill_threshold_mb"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="environment",
+            name="http2",
+            field=models.BooleanField(default=False, verbose_name="启用HTTP/2"),
+        ),
+    ]
@@ -9,6 +9,14 @@ class Environment(models.Model):
     name = models.CharField("环境名称", max_length=100)
     base_url = models.URLField("基础URL", max_length=200)
     verify_ssl = models.BooleanField("验证SSL证书", default=True)
+    # 连接池配置, 同一次执行中的用例共享连接
+    pool_maxsize = models.PositiveIntegerField("连接池大小", default=10)
+    keep_alive = models.BooleanField("保持长连接", default=True)
+    max_retries = models.PositiveIntegerField("连接失败重试次数", default=0)
+    # 使用HTTP/2传输, 并发请求在一个连接上多路复用
+    http2 = models.BooleanField("启用HTTP/2", default=False)
+    # 超过阈值的响应体写入临时文件, 0表示不启用
+    spill_threshold_mb = models.PositiveIntegerField("响应体落盘阈值(MB)", default=10)
     description = models.TextField("环境描述", blank=True)
     project = models.ForeignKey(
         Project,
@@ -36,6 +36,7 @@ class EnvironmentSerializer(serializers.ModelSerializer):
         model = Environment
         fields = [
             'id', 'name', 'base_url', 'verify_ssl',
+            'pool_maxsize', 'keep_alive', 'max_retries', 'http2', 'spill_threshold_mb',
             'description', 'project', 'project_info',
             'parent', 'parent_info', 'is_active',
             'created_by', 'created_time', 'updated_time',
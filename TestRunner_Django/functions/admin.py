@@ -16,7 +16,7 @@ class CustomFunctionResource(resources.ModelResource):
         # 导出字段顺序（贴合模型字段逻辑）
         export_order = (
             'name', 'project', 'code', 'description',
-            'is_active', 'created_by'
+            'is_active', 'is_pure', 'cache_scope', 'cache_ttl', 'created_by'
         )
 
 
@@ -28,12 +28,12 @@ class CustomFunctionAdmin(ImportExportModelAdmin):
 
     # 列表页展示字段（核心信息优先）
     list_display = [
-        'id', 'name', 'project', 'is_active',
+        'id', 'name', 'project', 'is_active', 'is_pure',
         'created_by', 'created_time'
     ]
     # 筛选条件（快速过滤）
     list_filter = [
-        'is_active', 'project', 'created_by', 'created_time'
+        'is_active', 'is_pure', 'project', 'created_by', 'created_time'
     ]
     # 搜索字段（支持跨表搜索项目名称）
     search_fields = [
@@ -54,6 +54,10 @@ class CustomFunctionAdmin(ImportExportModelAdmin):
             'fields': ('name', 'project', 'code', 'description', 'is_active'),
             'description': _('同一项目下函数名称不可重复，请确保函数代码语法正确')
         }),
+        (_('缓存配置'), {
+            'fields': ('is_pure', 'cache_scope', 'cache_ttl'),
+            'description': _('仅当函数对相同参数总是返回相同结果时才开启缓存')
+        }),
         (_('元数据'), {
             'fields': ('created_by', 'created_time', 'updated_time'),
             'classes': ('collapse',)  # 可折叠（非核心信息）
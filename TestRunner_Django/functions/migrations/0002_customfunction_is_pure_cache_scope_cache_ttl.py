@@ -0,0 +1,41 @@
+# Generated by Django 4.2.17 on 2026-10-17 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("functions", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customfunction",
+            name="is_pure",
+            field=models.BooleanField(default=False, verbose_name="是否纯函数(可缓存)"),
+        ),
+        migrations.AddField(
+            model_name="customfunction",
+            name="cache_scope",
+            field=models.CharField(
+                choices=[
+                    ("step", "步骤"),
+                    ("testcase", "用例执行"),
+                    ("task", "任务执行"),
+                ],
+                default="testcase",
+                max_length=20,
+                verbose_name="缓存范围",
+            ),
+        ),
+        migrations.AddField(
+            model_name="customfunction",
+            name="cache_ttl",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="0表示在缓存范围内一直有效",
+                verbose_name="缓存有效期(秒)",
+            ),
+        ),
+    ]
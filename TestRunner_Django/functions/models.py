@@ -6,6 +6,12 @@ User = get_user_model()
 
 class CustomFunction(models.Model):
     """自定义函数模型"""
+    CACHE_SCOPE_CHOICES = (
+        ('step', '步骤'),
+        ('testcase', '用例执行'),
+        ('task', '任务执行'),
+    )
+
     name = models.CharField("函数名称", max_length=100)
     code = models.TextField("函数代码")
     description = models.TextField("函数描述", blank=True)
@@ -16,6 +22,12 @@ class CustomFunction(models.Model):
         verbose_name="所属项目"
     )
     is_active = models.BooleanField("是否启用", default=True)
+    # 纯函数: 相同参数总是返回相同结果, 执行时按参数缓存结果
+    is_pure = models.BooleanField("是否纯函数(可缓存)", default=False)
+    cache_scope = models.CharField(
+        "缓存范围", max_length=20, choices=CACHE_SCOPE_CHOICES, default='testcase'
+    )
+    cache_ttl = models.PositiveIntegerField("缓存有效期(秒)", default=0, help_text="0表示在缓存范围内一直有效")
     created_by = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
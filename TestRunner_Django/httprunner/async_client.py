@@ -0,0 +1,307 @@
+import asyncio
+import json
+import sys
+import time
+from datetime import timedelta
+from typing import Dict, Optional, Text
+from urllib.parse import urlencode
+
+import requests
+from loguru import logger
+from requests import Request, Response
+from requests.cookies import cookiejar_from_dict
+from requests.exceptions import InvalidURL, RequestException
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from httprunner import exceptions
+from httprunner.client import (
+    RECORD_NONE,
+    RECORD_TRUNCATED,
+    ApiResponse,
+    get_req_resp_record,
+    log_spilled_body,
+    record_timing,
+)
+from httprunner.models import SessionData
+from httprunner.spill import BODY_SPILL_THRESHOLD, SPILL_CHUNK_SIZE, BodySpool
+from httprunner.timing import to_ms
+from httprunner.utils import lower_dict_keys
+
+try:
+    import aiohttp
+
+    AIOHTTP_READY = True
+except ModuleNotFoundError:
+    AIOHTTP_READY = False
+
+
+def ensure_aiohttp_ready():
+    if AIOHTTP_READY:
+        return
+
+    msg = """
+    asyncio http engine dependencies uninstalled, install first and try again.
+    install with pip:
+    $ pip install aiohttp
+    """
+    logger.error(msg)
+    sys.exit(1)
+
+
+def create_connector(limit: int = 100) -> "aiohttp.TCPConnector":
+    """create connection pool shared by async sessions, must be called in event loop"""
+    ensure_aiohttp_ready()
+    return aiohttp.TCPConnector(limit=limit)
+
+
+def create_timing_trace_config() -> "aiohttp.TraceConfig":
+    """record connection phases into dict passed as trace_request_ctx.
+    aiohttp does not expose TLS handshake separately, it is included in tcp_ms."""
+
+    def on_start(key):
+        async def callback(session, ctx, params):
+            ctx.trace_request_ctx[key] = time.perf_counter()
+
+        return callback
+
+    async def on_request_start(session, ctx, params):
+        # only phases of the last request are kept if redirected
+        ctx.trace_request_ctx.clear()
+
+    async def on_dns_resolvehost_end(session, ctx, params):
+        timing = ctx.trace_request_ctx
+        timing["dns_ms"] = to_ms(time.perf_counter() - timing.pop("dns_start"))
+
+    async def on_connection_create_end(session, ctx, params):
+        timing = ctx.trace_request_ctx
+        connect_ms = to_ms(time.perf_counter() - timing.pop("connect_start"))
+        timing["tcp_ms"] = round(max(0, connect_ms - timing.get("dns_ms", 0)), 2)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_dns_resolvehost_start.append(on_start("dns_start"))
+    trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(on_start("connect_start"))
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    return trace_config
+
+
+def encode_request_body(kwargs: Dict, headers: Dict):
+    """encode json/data arguments of requests into bytes body like requests does,
+    content-type header is set if not specified"""
+    lower_headers = lower_dict_keys(headers)
+    json_data = kwargs.pop("json", None)
+    data = kwargs.pop("data", None)
+
+    if not data and json_data is not None:
+        if "content-type" not in lower_headers:
+            headers["Content-Type"] = "application/json"
+        return json.dumps(json_data, allow_nan=False).encode("utf-8")
+
+    if isinstance(data, dict):
+        if "content-type" not in lower_headers:
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        return urlencode(data, doseq=True).encode("utf-8")
+
+    if isinstance(data, str):
+        return data.encode("utf-8")
+
+    return data
+
+
+def build_response(
+    resp: "aiohttp.ClientResponse",
+    content: bytes,
+    request_body,
+    elapsed: float,
+    history=None,
+) -> Response:
+    """convert aiohttp response into requests.Response, thus response object,
+    extractors, validators and recorders work the same with both engines"""
+    response = Response()
+    response.status_code = resp.status
+    response.reason = resp.reason
+    response.headers = CaseInsensitiveDict(resp.headers)
+    response.url = str(resp.url)
+    response._content = content
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.elapsed = timedelta(seconds=elapsed)
+    response.cookies = cookiejar_from_dict(
+        {name: morsel.value for name, morsel in resp.cookies.items()}
+    )
+    response.history = history or []
+
+    request_info = resp.request_info
+    response.request = Request(
+        request_info.method,
+        str(request_info.real_url),
+        headers=dict(request_info.headers),
+    ).prepare()
+    response.request.body = request_body
+    return response
+
+
+class AsyncHttpSession(object):
+    """asyncio counterpart of HttpSession based on aiohttp.
+
+    Request arguments are the same as requests, response is converted into
+    requests.Response and recorded into SessionData (req_resps, address, stat) the
+    same way as HttpSession, so steps can switch engines without other changes.
+    Sessions may share one aiohttp.TCPConnector, e.g. testcases multiplexed in one
+    event loop, while cookies are kept per session.
+    """
+
+    def __init__(
+        self,
+        connector: "aiohttp.BaseConnector" = None,
+        record_level: str = RECORD_TRUNCATED,
+        spill_threshold: Optional[int] = BODY_SPILL_THRESHOLD,
+    ):
+        ensure_aiohttp_ready()
+        self.data = SessionData()
+        self.record_level = record_level
+        self.spill_threshold = spill_threshold
+        self.__connector = connector
+        self.__session = None
+        self.__timing = {}
+
+    def __get_session(self) -> "aiohttp.ClientSession":
+        if self.__session is None or self.__session.closed:
+            self.__session = aiohttp.ClientSession(
+                connector=self.__connector,
+                connector_owner=self.__connector is None,
+                cookie_jar=aiohttp.CookieJar(unsafe=True),
+                trace_configs=[create_timing_trace_config()],
+            )
+        return self.__session
+
+    async def request(self, method: Text, url: Text, name=None, **kwargs) -> Response:
+        """send a HTTP request, arguments are the same as HttpSession.request"""
+        self.data = SessionData()
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        request_body = encode_request_body(kwargs, headers)
+        verify = kwargs.pop("verify", True)
+        timeout = kwargs.pop("timeout", 120)
+        allow_redirects = kwargs.pop("allow_redirects", True)
+        params = kwargs.pop("params", None) or None
+        cookies = kwargs.pop("cookies", None) or None
+        for unsupported in ("files", "auth", "proxies", "cert", "stream"):
+            if kwargs.pop(unsupported, None):
+                # silently dropping them would send a different request
+                raise exceptions.ParamsError(
+                    f"argument {unsupported} is not supported by async session, "
+                    f"use the requests engine instead"
+                )
+
+        start_timestamp = time.time()
+        self.__timing = {}
+        try:
+            response = await self.__send_request(
+                method,
+                url,
+                params=params,
+                headers=headers,
+                cookies=cookies,
+                data=request_body,
+                ssl=None if verify else False,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                allow_redirects=allow_redirects,
+            )
+        except aiohttp.InvalidURL as ex:
+            raise InvalidURL(str(ex))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+            response = ApiResponse()
+            response.error = requests.exceptions.ConnectionError(str(ex) or repr(ex))
+            response.status_code = 0  # with this status_code, content returns None
+            response.request = Request(method, url).prepare()
+            response.elapsed = timedelta(seconds=time.time() - start_timestamp)
+
+        response_time_ms = round((time.time() - start_timestamp) * 1000, 2)
+
+        # get length of the response content
+        content_size = int(dict(response.headers).get("content-length") or 0)
+        if not content_size and response.content:
+            # e.g. chunked transfer encoding
+            content_size = len(response.content)
+
+        # record the consumed time
+        self.data.stat.response_time_ms = response_time_ms
+        record_timing(
+            self.data.stat,
+            response.elapsed.total_seconds(),
+            self.__timing,
+            self.__timing.get("download_ms", 0),
+        )
+        self.data.stat.content_size = content_size
+
+        self.data.stat.status_code = response.status_code
+
+        # record request and response histories, include 30X redirection
+        if self.record_level != RECORD_NONE:
+            response_list = response.history + [response]
+            self.data.req_resps = [
+                get_req_resp_record(resp_obj, self.record_level)
+                for resp_obj in response_list
+            ]
+
+        try:
+            response.raise_for_status()
+        except RequestException as ex:
+            logger.error(f"{str(ex)}")
+        else:
+            logger.info(
+                f"status_code: {response.status_code}, "
+                f"response_time(ms): {response_time_ms} ms, "
+                f"response_length: {content_size} bytes"
+            )
+
+        return response
+
+    async def __send_request(self, method: Text, url: Text, **kwargs) -> Response:
+        session = self.__get_session()
+        request_body = kwargs["data"]
+        start_timestamp = time.time()
+        async with session.request(
+            method, url, trace_request_ctx=self.__timing, **kwargs
+        ) as resp:
+            # time to response headers, same as requests.Response.elapsed
+            elapsed = time.time() - start_timestamp
+            self.__record_address(resp)
+            download_start = time.perf_counter()
+            spool = BodySpool(self.spill_threshold)
+            async for chunk in resp.content.iter_chunked(SPILL_CHUNK_SIZE):
+                spool.write(chunk)
+            content = spool.getvalue()
+            self.__timing["download_ms"] = to_ms(time.perf_counter() - download_start)
+
+        history = [
+            build_response(history_resp, b"", request_body, elapsed)
+            for history_resp in resp.history
+        ]
+        response = build_response(resp, content, request_body, elapsed, history)
+        response._spilled_body = spool.spilled
+        log_spilled_body(response)
+        return response
+
+    def __record_address(self, resp: "aiohttp.ClientResponse") -> None:
+        try:
+            # connection is released once small body is fully received, while
+            # protocol keeps the transport
+            transport = (resp.connection or resp._protocol).transport
+            client_ip, client_port = transport.get_extra_info("sockname")[:2]
+            server_ip, server_port = transport.get_extra_info("peername")[:2]
+        except Exception:
+            return
+
+        self.data.address.client_ip = client_ip
+        self.data.address.client_port = client_port
+        self.data.address.server_ip = server_ip
+        self.data.address.server_port = server_port
+        logger.debug(f"client IP: {client_ip}, Port: {client_port}")
+        logger.debug(f"server IP: {server_ip}, Port: {server_port}")
+
+    async def close(self) -> None:
+        if self.__session is not None and not self.__session.closed:
+            await self.__session.close()
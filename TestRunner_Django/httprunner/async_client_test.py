@@ -0,0 +1,136 @@
+import asyncio
+import json
+from http.server import BaseHTTPRequestHandler
+
+from httprunner import Config, RunRequest, Step
+from httprunner.async_client import AsyncHttpSession
+from httprunner.exceptions import ParamsError
+from httprunner.runner import SessionRunner
+from httprunner.testing import LocalServerTestCase
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, thus address can be recorded
+
+    def do_GET(self):
+        if self.path.startswith("/redirect"):
+            self.send_response(302)
+            self.send_header("Location", "/get")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.__reply({"path": self.path, "token": self.headers.get("token")})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"null")
+        self.__reply({"path": self.path, "json": body, "token": body.get("token")})
+
+    def __reply(self, data):
+        content = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAsyncHttpSession(LocalServerTestCase):
+    handler_class = EchoHandler
+
+    def test_request(self):
+        async def request():
+            session = AsyncHttpSession()
+            try:
+                resp = await session.request(
+                    "POST", f"{self.base_url}/post", json={"token": "abc"}
+                )
+            finally:
+                await session.close()
+            return session, resp
+
+        session, resp = asyncio.run(request())
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["json"], {"token": "abc"})
+        self.assertEqual(session.data.address.server_port, self.server.server_address[1])
+        self.assertEqual(session.data.req_resps[0].request.method, "POST")
+        self.assertEqual(session.data.req_resps[0].request.body, {"token": "abc"})
+        self.assertGreater(session.data.stat.tcp_ms, 0)
+        self.assertGreater(session.data.stat.ttfb_ms, 0)
+
+    def test_request_redirects(self):
+        async def request():
+            session = AsyncHttpSession()
+            try:
+                resp = await session.request("GET", f"{self.base_url}/redirect")
+            finally:
+                await session.close()
+            return session, resp
+
+        session, resp = asyncio.run(request())
+        self.assertEqual(resp.json()["path"], "/get")
+        self.assertEqual(len(session.data.req_resps), 2)
+        self.assertEqual(session.data.req_resps[0].response.status_code, 302)
+
+    def test_request_connection_error(self):
+        async def request():
+            session = AsyncHttpSession()
+            try:
+                return await session.request("GET", "http://127.0.0.1:1/get", timeout=5)
+            finally:
+                await session.close()
+
+        resp = asyncio.run(request())
+        self.assertEqual(resp.status_code, 0)
+        self.assertIsNotNone(resp.error)
+
+    def test_request_unsupported_argument(self):
+        async def request():
+            session = AsyncHttpSession()
+            try:
+                return await session.request(
+                    "POST", f"{self.base_url}/post", files={"file": b"abc"}
+                )
+            finally:
+                await session.close()
+
+        with self.assertRaises(ParamsError):
+            asyncio.run(request())
+
+    def test_async_test_start(self):
+        base_url = self.base_url
+
+        class TestCaseAsync(SessionRunner):
+            config = Config("async testcase").base_url(base_url)
+            teststeps = [
+                Step(
+                    RunRequest("login")
+                    .post("/login")
+                    .with_json({"token": "abc"})
+                    .extract()
+                    .with_jmespath("body.token", "token")
+                    .validate()
+                    .assert_equal("status_code", 200)
+                ),
+                Step(
+                    RunRequest("get profile")
+                    .get("/profile")
+                    .with_headers(**{"token": "$token"})
+                    .validate()
+                    .assert_equal("body.token", "abc")
+                ),
+            ]
+
+        async def run_testcases():
+            runners = [TestCaseAsync(), TestCaseAsync()]
+            await asyncio.gather(*[runner.async_test_start() for runner in runners])
+            return runners
+
+        for runner in asyncio.run(run_testcases()):
+            summary = runner.get_summary()
+            self.assertTrue(summary.success)
+            self.assertEqual(len(summary.step_results), 2)
+            self.assertIsNone(runner.async_session)
@@ -1,5 +1,7 @@
 import json
 import time
+from collections import OrderedDict
+from typing import Dict, Optional
 
 import requests
 import urllib3
@@ -12,12 +14,30 @@ from requests.exceptions import (
     RequestException,
 )
 
-from httprunner.models import RequestData, ResponseData
+from httprunner import json_codec
+from httprunner.connection_pool import ConnectionPoolRegistry
+from httprunner.models import RequestData, RequestStat, ResponseData
 from httprunner.models import SessionData, ReqRespData
+from httprunner.response_view import ResponseView
+from httprunner.spill import BODY_SPILL_THRESHOLD, read_response_body
+from httprunner.timing import TimingHTTPAdapter, pop_connection_timing, to_ms
 from httprunner.utils import lower_dict_keys, omit_long_data
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# recording levels of request and response data
+# none: nothing is recorded
+RECORD_NONE = "none"
+# metadata: method, url, status code, headers and cookies, without bodies
+RECORD_METADATA = "metadata"
+# truncated: bodies larger than RECORD_TRUNCATE_SIZE are omitted without decoding
+RECORD_TRUNCATED = "truncated"
+# full: bodies are recorded without omission
+RECORD_FULL = "full"
+
+RECORD_LEVELS = (RECORD_NONE, RECORD_METADATA, RECORD_TRUNCATED, RECORD_FULL)
+RECORD_TRUNCATE_SIZE = 64 * 1024
+
 
 class ApiResponse(Response):
     def raise_for_status(self):
@@ -26,26 +46,46 @@ class ApiResponse(Response):
         Response.raise_for_status(self)
 
 
-def get_req_resp_record(resp_obj: Response) -> ReqRespData:
+def format_req_resp(req_or_resp, r_type) -> str:
+    msg = f"\n================== {r_type} details ==================\n"
+    for key, value in req_or_resp.dict().items():
+        if isinstance(value, dict) or isinstance(value, list):
+            value = json_codec.dumps(value, indent=True, default=json_codec.safe_default)
+
+        msg += "{:<8} : {}\n".format(key, value)
+    return msg
+
+
+def is_body_truncated(body, record_level: str) -> bool:
+    """large bodies are omitted without decoding in truncated level"""
+    return (
+        record_level == RECORD_TRUNCATED
+        and isinstance(body, (str, bytes))
+        and len(body) > RECORD_TRUNCATE_SIZE
+    )
+
+
+def get_req_resp_record(
+    resp_obj: Response, record_level: str = RECORD_TRUNCATED
+) -> ReqRespData:
     """get request and response info from Response() object."""
 
     def log_print(req_or_resp, r_type):
-        msg = f"\n================== {r_type} details ==================\n"
-        for key, value in req_or_resp.dict().items():
-            if isinstance(value, dict) or isinstance(value, list):
-                value = json.dumps(value, indent=4, ensure_ascii=False)
-
-            msg += "{:<8} : {}\n".format(key, value)
-        logger.debug(msg)
+        # formatted only if any sink consumes DEBUG messages
+        logger.opt(lazy=True).debug("{}", lambda: format_req_resp(req_or_resp, r_type))
 
     # record actual request info
     request_headers = dict(resp_obj.request.headers)
     request_cookies = resp_obj.request._cookies.get_dict()
 
     request_body = resp_obj.request.body
-    if request_body is not None:
+    if record_level == RECORD_METADATA:
+        request_body = None
+    elif is_body_truncated(request_body, record_level):
+        request_body = omit_long_data(request_body)
+    elif request_body is not None:
         try:
-            request_body = json.loads(request_body)
+            request_body = json_codec.loads(request_body)
         except json.JSONDecodeError:
             # str: a=1&b=2
             pass
@@ -72,22 +112,31 @@ def get_req_resp_record(resp_obj: Response) -> ReqRespData:
     # log request details in debug mode
     log_print(request_data, "request")
 
-    # record response info
+    # record response info, body is decoded once and shared with ResponseObject
+    resp_view = ResponseView.of(resp_obj)
     resp_headers = dict(resp_obj.headers)
     lower_resp_headers = lower_dict_keys(resp_headers)
     content_type = lower_resp_headers.get("content-type", "")
 
-    if "image" in content_type:
+    if record_level == RECORD_METADATA:
+        response_body = None
+    elif resp_view.spilled:
+        # hash, size and preview of large body, raw payload is never recorded
+        response_body = resp_view.spilled.summary()
+    elif is_body_truncated(resp_obj.content, record_level):
+        response_body = omit_long_data(resp_obj.content)
+    elif "image" in content_type:
         # response is image type, record bytes content only
         response_body = resp_obj.content
+    elif resp_view.is_json:
+        # try to record json data
+        response_body = resp_view.json()
     else:
-        try:
-            # try to record json data
-            response_body = resp_obj.json()
-        except ValueError:
+        resp_text = resp_view.text
+        if record_level != RECORD_FULL:
             # only record at most 512 text charactors
-            resp_text = resp_obj.text
-            response_body = omit_long_data(resp_text)
+            resp_text = omit_long_data(resp_text)
+        response_body = resp_text
 
     response_data = ResponseData(
         status_code=resp_obj.status_code,
@@ -105,6 +154,33 @@ def get_req_resp_record(resp_obj: Response) -> ReqRespData:
     return req_resp_data
 
 
+def log_spilled_body(response: Response) -> None:
+    spilled = ResponseView.of(response).spilled
+    if spilled:
+        logger.info(
+            f"response body spilled to file, size: {spilled.size} bytes, "
+            f"sha256: {spilled.sha256}"
+        )
+
+
+def record_timing(
+    stat: RequestStat, elapsed: float, connection_timing: Dict, download_ms: float
+) -> None:
+    """record timing phases of the last response into stat"""
+    stat.elapsed_ms = to_ms(elapsed)
+    stat.dns_ms = connection_timing.get("dns_ms", 0)
+    stat.tcp_ms = connection_timing.get("tcp_ms", 0)
+    stat.tls_ms = connection_timing.get("tls_ms", 0)
+    stat.ttfb_ms = round(
+        max(0, stat.elapsed_ms - stat.dns_ms - stat.tcp_ms - stat.tls_ms), 2
+    )
+    stat.download_ms = download_ms
+    logger.debug(
+        f"timing(ms): dns {stat.dns_ms}, tcp {stat.tcp_ms}, tls {stat.tls_ms}, "
+        f"ttfb {stat.ttfb_ms}, download {stat.download_ms}"
+    )
+
+
 class HttpSession(requests.Session):
     """
     Class for performing HTTP requests and holding (session-) cookies between requests (in order
@@ -115,9 +191,32 @@ class HttpSession(requests.Session):
     :py:class:`requests.Session` class and mostly this class works exactly the same.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        pool_registry: ConnectionPoolRegistry = None,
+        record_level: str = RECORD_TRUNCATED,
+        spill_threshold: Optional[int] = BODY_SPILL_THRESHOLD,
+    ):
         super(HttpSession, self).__init__()
         self.data = SessionData()
+        self.mount("https://", TimingHTTPAdapter())
+        self.mount("http://", TimingHTTPAdapter())
+        # connection pools shared with other sessions, e.g. testcases in one task
+        self.pool_registry = pool_registry
+        self.record_level = record_level
+        # response bodies larger than threshold are spilled to temp file
+        self.spill_threshold = spill_threshold
+
+    def fork(self) -> "HttpSession":
+        """create session sharing connection pools, cookies and settings with this one,
+        while request and response data are recorded separately.
+        used to send requests of independent steps concurrently."""
+        session = HttpSession(self.pool_registry, self.record_level, self.spill_threshold)
+        for attr in self.__attrs__:
+            setattr(session, attr, getattr(self, attr))
+        # adapters are shared, while mounting on one session never mutates the others
+        session.adapters = OrderedDict(self.adapters)
+        return session
 
     def update_last_req_resp_record(self, resp_obj):
         """
@@ -125,7 +224,7 @@ class HttpSession(requests.Session):
         """
         # TODO: fix
         self.data.req_resps.pop()
-        self.data.req_resps.append(get_req_resp_record(resp_obj))
+        self.data.req_resps.append(get_req_resp_record(resp_obj, self.record_level))
 
     def request(self, method, url, name=None, **kwargs):
         """
@@ -174,6 +273,9 @@ class HttpSession(requests.Session):
         # set stream to True, in order to get client/server IP/Port
         kwargs["stream"] = True
 
+        if self.pool_registry is not None:
+            self.pool_registry.mount(self, url, kwargs.get("verify", self.verify))
+
         start_timestamp = time.time()
         response = self._send_request_safe_mode(method, url, **kwargs)
         response_time_ms = round((time.time() - start_timestamp) * 1000, 2)
@@ -194,19 +296,51 @@ class HttpSession(requests.Session):
         except Exception:
             pass
 
+        connection_timing = pop_connection_timing(response)
+
+        # download body here, thus it is not counted in parsing of later consumers
+        download_start = time.perf_counter()
+        read_response_body(response, self.spill_threshold)
+        download_ms = to_ms(time.perf_counter() - download_start)
+        log_spilled_body(response)
+
+        self._record_response(response, response_time_ms, connection_timing, download_ms)
+        return response
+
+    def _record_response(
+        self,
+        response: Response,
+        response_time_ms: float,
+        connection_timing: Dict,
+        download_ms: float,
+    ) -> None:
+        """record stat and request/response histories of downloaded response"""
         # get length of the response content
+        content = response.content
         content_size = int(dict(response.headers).get("content-length") or 0)
+        if not content_size and content:
+            # e.g. chunked transfer encoding
+            content_size = len(content)
 
         # record the consumed time
         self.data.stat.response_time_ms = response_time_ms
-        self.data.stat.elapsed_ms = response.elapsed.microseconds / 1000.0
+        record_timing(
+            self.data.stat,
+            response.elapsed.total_seconds(),
+            connection_timing,
+            download_ms,
+        )
         self.data.stat.content_size = content_size
 
+        self.data.stat.status_code = response.status_code
+
         # record request and response histories, include 30X redirection
-        response_list = response.history + [response]
-        self.data.req_resps = [
-            get_req_resp_record(resp_obj) for resp_obj in response_list
-        ]
+        if self.record_level != RECORD_NONE:
+            response_list = response.history + [response]
+            self.data.req_resps = [
+                get_req_resp_record(resp_obj, self.record_level)
+                for resp_obj in response_list
+            ]
 
         try:
             response.raise_for_status()
@@ -219,8 +353,6 @@ class HttpSession(requests.Session):
                 f"response_length: {content_size} bytes"
             )
 
-        return response
-
     def _send_request_safe_mode(self, method, url, **kwargs):
         """
         Send a HTTP request, and catch any exception that might occur due to connection problems.
@@ -1,6 +1,17 @@
+import json
 import unittest
 
-from httprunner.client import HttpSession
+from requests import Request, Response
+from requests.structures import CaseInsensitiveDict
+
+from httprunner.client import (
+    RECORD_FULL,
+    RECORD_METADATA,
+    RECORD_TRUNCATE_SIZE,
+    RECORD_TRUNCATED,
+    HttpSession,
+    get_req_resp_record,
+)
 from httprunner.utils import HTTP_BIN_URL
 
 
@@ -71,3 +82,43 @@ class TestHttpSession(unittest.TestCase):
         self.assertEqual(address.server_port, 0)
         self.assertEqual(address.client_ip, "N/A")
         self.assertEqual(address.client_port, 0)
+
+
+class TestReqRespRecord(unittest.TestCase):
+    @staticmethod
+    def build_response(content: bytes, content_type="application/json") -> Response:
+        response = Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict({"Content-Type": content_type})
+        response._content = content
+        response.encoding = "utf-8"
+        response.request = Request(
+            "POST", "https://postman-echo.com/post", json={"a": 1}
+        ).prepare()
+        return response
+
+    def test_record_levels(self):
+        response = self.build_response(b'{"b": 2}')
+
+        record = get_req_resp_record(response, RECORD_METADATA)
+        self.assertEqual(record.response.status_code, 200)
+        self.assertIsNone(record.request.body)
+        self.assertIsNone(record.response.body)
+
+        record = get_req_resp_record(response, RECORD_TRUNCATED)
+        self.assertEqual(record.request.body, {"a": 1})
+        self.assertEqual(record.response.body, {"b": 2})
+
+    def test_record_large_body(self):
+        text = "x" * (RECORD_TRUNCATE_SIZE + 1)
+        response = self.build_response(text.encode("utf-8"), "text/plain")
+        self.assertEqual(
+            len(get_req_resp_record(response, RECORD_FULL).response.body), len(text)
+        )
+
+        response = self.build_response(json.dumps([text]).encode("utf-8"))
+        body = get_req_resp_record(response, RECORD_TRUNCATED).response.body
+        self.assertTrue(body.endswith("CHARACTORS ..."))
+        self.assertEqual(
+            get_req_resp_record(response, RECORD_FULL).response.body, [text]
+        )
@@ -115,6 +115,18 @@ class Config(object):
         self.__config.verify = verify
         return self
 
+    def concurrent_steps(self, max_workers: int = 4) -> "Config":
+        """run steps which do not depend on each other's extracted variables concurrently.
+
+        Dependencies only come from variables extracted or exported by earlier steps,
+        cookies set by responses, e.g. session cookie of login step, are not tracked.
+        A step relying on such cookies runs after the step setting them only if it
+        references a variable extracted by that step, e.g. `.extract()` a dummy
+        variable from login step and reference it, otherwise run steps in order.
+        """
+        self.__config.step_concurrency = max_workers
+        return self
+
     def export(self, *export_var_name: Text) -> "Config":
         self.__config.export.extend(export_var_name)
         self.__config.export = list(set(self.__config.export))
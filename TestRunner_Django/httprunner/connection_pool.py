@@ -0,0 +1,112 @@
+import threading
+from typing import Dict, Text, Tuple
+from urllib.parse import urlsplit
+
+from loguru import logger
+from requests.adapters import DEFAULT_POOLSIZE
+from urllib3.util.retry import Retry
+
+from httprunner.timing import TimingHTTPAdapter
+
+
+class SharedHTTPAdapter(TimingHTTPAdapter):
+    """adapter mounted on many sessions, only closed by its registry"""
+
+    def close(self):
+        # session.close() closes all mounted adapters, keep pooled connections alive
+        pass
+
+    def close_pool(self):
+        super(SharedHTTPAdapter, self).close()
+
+
+class ConnectionPoolRegistry(object):
+    """registry of HTTP adapters shared by sessions of one execution.
+
+    Adapters are keyed by scheme, host and verify, thus connections established by
+    previous testcases (DNS, TCP and TLS handshakes done) are reused by later ones,
+    while cookies are still kept in each session.
+
+    Examples:
+        >>> registry = ConnectionPoolRegistry(pool_maxsize=20, max_retries=1)
+        >>> session = HttpSession(pool_registry=registry)
+        >>> session.request("GET", "https://postman-echo.com/get")
+        >>> registry.get_stats()
+            {"hits": 0, "misses": 1, "pools": 1}
+
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = DEFAULT_POOLSIZE,
+        keep_alive: bool = True,
+        max_retries: int = 0,
+    ) -> None:
+        self.pool_maxsize = max(1, int(pool_maxsize or DEFAULT_POOLSIZE))
+        self.keep_alive = keep_alive
+        self.max_retries = max(0, int(max_retries or 0))
+        self.__adapters: Dict[Tuple, SharedHTTPAdapter] = {}
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_pool_key(url: Text, verify) -> Tuple:
+        parts = urlsplit(url)
+        return parts.scheme.lower(), parts.netloc.lower(), verify
+
+    def __create_adapter(self) -> SharedHTTPAdapter:
+        # only retry on connection errors, requests already sent are never resent
+        max_retries = Retry(total=self.max_retries, connect=self.max_retries, read=False)
+        return SharedHTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=max_retries,
+        )
+
+    def get_adapter(self, url: Text, verify=True) -> SharedHTTPAdapter:
+        """get adapter for url, create one if not exists"""
+        key = self.get_pool_key(url, verify)
+        with self.__lock:
+            adapter = self.__adapters.get(key)
+            if adapter is not None:
+                self.hits += 1
+                return adapter
+
+            self.misses += 1
+            adapter = self.__adapters[key] = self.__create_adapter()
+
+        logger.debug(f"create connection pool: {key}")
+        return adapter
+
+    def mount(self, session, url: Text, verify=True) -> None:
+        """mount shared adapter for url on session"""
+        scheme, netloc, _ = self.get_pool_key(url, verify)
+        if not scheme or not netloc:
+            return
+
+        # trailing slash avoids matching hosts with the same prefix
+        prefix = f"{scheme}://{netloc}/"
+        adapter = self.get_adapter(url, verify)
+        # mount once per session, mount() reorders adapters of session which may be
+        # iterated by requests of forked sessions in other threads
+        if session.adapters.get(prefix) is not adapter:
+            session.mount(prefix, adapter)
+        if not self.keep_alive and session.headers.get("Connection") != "close":
+            session.headers["Connection"] = "close"
+
+    def get_stats(self) -> Dict:
+        with self.__lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "pools": len(self.__adapters),
+            }
+
+    def close(self) -> None:
+        with self.__lock:
+            adapters = list(self.__adapters.values())
+            self.__adapters.clear()
+
+        for adapter in adapters:
+            adapter.close_pool()
@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+
+from httprunner.client import HttpSession
+from httprunner.connection_pool import ConnectionPoolRegistry
+from httprunner.testing import LocalServerTestCase
+
+
+class CookieHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        content = (self.headers.get("Cookie") or "").encode("utf-8")
+        self.send_response(200)
+        if self.path.startswith("/login"):
+            self.send_header("Set-Cookie", f"sid={self.path[-1]}; Path=/")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestConnectionPoolRegistry(LocalServerTestCase):
+    handler_class = CookieHandler
+
+    def test_get_adapter(self):
+        registry = ConnectionPoolRegistry()
+        adapter = registry.get_adapter("https://Postman-Echo.com/get")
+        self.assertIs(registry.get_adapter("https://postman-echo.com/post"), adapter)
+        self.assertIsNot(registry.get_adapter("https://postman-echo.com/get", False), adapter)
+        self.assertIsNot(registry.get_adapter("http://postman-echo.com/get"), adapter)
+        self.assertEqual(registry.get_stats(), {"hits": 1, "misses": 3, "pools": 3})
+
+    def test_share_connections_between_sessions(self):
+        registry = ConnectionPoolRegistry(pool_maxsize=2, max_retries=1)
+        session1 = HttpSession(registry)
+        session2 = HttpSession(registry)
+
+        session1.request("GET", f"{self.base_url}/login/1")
+        client_port = session1.data.address.client_port
+        session1.close()
+        session2.request("GET", f"{self.base_url}/login/2")
+
+        # connection is reused by another session, even if the first one is closed
+        self.assertEqual(session2.data.address.client_port, client_port)
+        self.assertEqual(registry.get_stats(), {"hits": 1, "misses": 1, "pools": 1})
+
+        # cookies are kept in each session
+        self.assertEqual(session1.request("GET", f"{self.base_url}/").text, "sid=1")
+        self.assertEqual(session2.request("GET", f"{self.base_url}/").text, "sid=2")
+        registry.close()
+
+    def test_keep_alive_disabled(self):
+        registry = ConnectionPoolRegistry(keep_alive=False)
+        session = HttpSession(registry)
+        session.request("GET", f"{self.base_url}/")
+        self.assertEqual(session.data.req_resps[0].request.headers["Connection"], "close")
+
+    def test_forked_sessions_concurrently(self):
+        registry = ConnectionPoolRegistry(pool_maxsize=8)
+        session = HttpSession(registry)
+        session.request("GET", f"{self.base_url}/login/1")
+        forked = [session.fork() for _ in range(8)]
+        self.assertIsNot(forked[0].adapters, session.adapters)
+
+        def send(forked_session):
+            return [
+                forked_session.request("GET", f"{self.base_url}/").status_code
+                for _ in range(20)
+            ]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(send, forked))
+
+        self.assertEqual(results, [[200] * 20] * 8)
+        # shared adapter is mounted once on parent session, kept by forked ones
+        self.assertEqual(registry.get_stats()["pools"], 1)
+        self.assertIs(
+            forked[0].get_adapter(f"{self.base_url}/"),
+            session.get_adapter(f"{self.base_url}/"),
+        )
+        registry.close()
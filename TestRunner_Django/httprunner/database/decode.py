@@ -0,0 +1,135 @@
+import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Text
+
+from sqlalchemy.engine import CursorResult, Row
+
+from httprunner import json_codec
+
+Converter = Callable[[Any], Any]
+
+# type codes of cursor.description by dialect
+JSON_TYPE_CODES = {
+    "mysql": {245},  # pymysql FIELD_TYPE.JSON
+    "postgresql": {114, 3802},  # json, jsonb
+}
+DATETIME_TYPE_CODES = {
+    "mysql": {7, 12},  # TIMESTAMP, DATETIME
+    "postgresql": {1114, 1184},  # timestamp, timestamptz
+}
+DATE_TYPE_CODES = {
+    "mysql": {10, 14},  # DATE, NEWDATE
+    "postgresql": {1082},  # date
+}
+# type codes of other columns are known, whose values are kept as is
+KNOWN_TYPE_CODES_DIALECTS = {"mysql", "postgresql"}
+
+
+def format_datetime(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    # e.g. zero date of MySQL is returned as str
+    return value
+
+
+def format_date(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, datetime.date):
+        return value.strftime("%Y-%m-%d")
+    return value
+
+
+def decode_json(value: Any) -> Any:
+    try:
+        return json_codec.loads(value)
+    except (ValueError, TypeError):
+        return value
+
+
+def probe_converter(value: Any) -> Optional[Converter]:
+    """converter of column without type metadata, e.g. sqlite, by its first value"""
+    if isinstance(value, datetime.datetime):
+        return format_datetime
+    if isinstance(value, datetime.date):
+        return format_date
+    return None
+
+
+class RowDecoder(object):
+    """decode rows of one result set with converters computed once per column.
+
+    Columns are converted by type metadata of cursor description:
+    datetime --> "%Y-%m-%d %H:%M:%S", date --> "%Y-%m-%d", and json --> dict/list,
+    json decoding only applies to declared JSON columns or json_columns opted in.
+    Columns without type metadata are probed by their first non-null value.
+
+    Examples:
+        >>> result = connection.execute(text("select id, info from t"))
+        >>> decoder = RowDecoder.from_result(result, "mysql", json_columns=["info"])
+        >>> [decoder.decode(row) for row in result]
+            [{"id": 1, "info": {"age": 18}}]
+
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[Text],
+        type_codes: Sequence[Any] = (),
+        dialect_name: Text = "",
+        json_columns: Iterable[Text] = (),
+    ):
+        self.keys = list(keys)
+        json_columns = set(json_columns or ())
+        type_codes = list(type_codes) + [None] * (len(self.keys) - len(type_codes))
+        self.converters: List[Optional[Converter]] = []
+        self.unresolved = set()
+        for index, (key, type_code) in enumerate(zip(self.keys, type_codes)):
+            if key in json_columns or type_code in JSON_TYPE_CODES.get(dialect_name, ()):
+                converter = decode_json
+            elif type_code in DATETIME_TYPE_CODES.get(dialect_name, ()):
+                converter = format_datetime
+            elif type_code in DATE_TYPE_CODES.get(dialect_name, ()):
+                converter = format_date
+            else:
+                converter = None
+                if type_code is None or dialect_name not in KNOWN_TYPE_CODES_DIALECTS:
+                    self.unresolved.add(index)
+            self.converters.append(converter)
+        self.__update_active()
+
+    @classmethod
+    def from_result(
+        cls, result: CursorResult, dialect_name: Text = "", json_columns=()
+    ) -> "RowDecoder":
+        description = getattr(result.cursor, "description", None) or ()
+        type_codes = [column[1] for column in description]
+        return cls(list(result.keys()), type_codes, dialect_name, json_columns)
+
+    def __update_active(self) -> None:
+        self.active = [
+            (index, converter)
+            for index, converter in enumerate(self.converters)
+            if converter is not None
+        ]
+
+    def __resolve(self, values: Sequence[Any]) -> None:
+        for index in list(self.unresolved):
+            value = values[index]
+            if value is None:
+                continue
+            self.converters[index] = probe_converter(value)
+            self.unresolved.discard(index)
+        self.__update_active()
+
+    def decode(self, row: Row) -> Dict:
+        values = list(row)
+        if self.unresolved:
+            self.__resolve(values)
+        for index, converter in self.active:
+            value = values[index]
+            if value is not None:
+                values[index] = converter(value)
+        return dict(zip(self.keys, values))
+
+    def decode_all(self, rows: Iterable[Row]) -> List[Dict]:
+        return [self.decode(row) for row in rows]
@@ -0,0 +1,33 @@
+import datetime
+import unittest
+
+from httprunner.database.decode import RowDecoder
+
+
+class TestRowDecoder(unittest.TestCase):
+    def test_type_codes(self):
+        decoder = RowDecoder(
+            ["id", "info", "created", "day", "name"], [3, 245, 12, 10, 253], "mysql"
+        )
+        row = (1, '{"a": 1}', datetime.datetime(2024, 1, 2, 3, 4, 5), datetime.date(2024, 1, 2), "[1]")
+        self.assertEqual(
+            decoder.decode(row),
+            {"id": 1, "info": {"a": 1}, "created": "2024-01-02 03:04:05", "day": "2024-01-02", "name": "[1]"},
+        )
+        # only columns to convert are visited
+        self.assertEqual([index for index, _ in decoder.active], [1, 2, 3])
+        # zero date is kept as str
+        self.assertEqual(
+            decoder.decode((None, None, "0000-00-00 00:00:00", None, None))["created"],
+            "0000-00-00 00:00:00",
+        )
+
+    def test_probe_without_type_codes(self):
+        decoder = RowDecoder(["id", "created", "info"], json_columns=["info"])
+        self.assertEqual(
+            decoder.decode((1, None, "not json")), {"id": 1, "created": None, "info": "not json"}
+        )
+        self.assertEqual(decoder.unresolved, {1})
+        decoded = decoder.decode((2, datetime.datetime(2024, 1, 2), '{"a": 1}'))
+        self.assertEqual(decoded, {"id": 2, "created": "2024-01-02 00:00:00", "info": {"a": 1}})
+        self.assertEqual(decoder.unresolved, set())
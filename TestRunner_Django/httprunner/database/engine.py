@@ -1,24 +1,105 @@
 # -*- coding: utf-8 -*-
 import datetime
 import json
+import re
+import threading
+from typing import Dict, Optional, Text, Tuple
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from loguru import logger
+from sqlalchemy.engine import URL
+
+from httprunner.database.decode import RowDecoder
+from httprunner.database.pool import EngineRegistry, engine_registry, mask_uri
+from httprunner.database.statement import SqlParams, compile_sql
+from httprunner.database.stream import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_ROWS,
+    DEFAULT_PREVIEW_ROWS,
+    aggregate_rows,
+    fetch_limited,
+    iter_rows,
+    limit_query,
+    stream_result,
+)
+
+# statements changing state of db session, which should not leak to next user of
+# pooled connection, e.g. SET @var, SET SESSION, USE db, CREATE TEMPORARY TABLE
+SESSION_STATE_PATTERN = re.compile(
+    r"^\s*(SET|USE|LOCK|CREATE\s+TEMPORARY|DECLARE)\b", re.IGNORECASE
+)
+
+
+def build_db_uri(db_config: Dict) -> Text:
+    """build mysql uri of db config, with user and password escaped"""
+    url = URL.create(
+        "mysql+pymysql",
+        username=db_config.get("user"),
+        password=db_config.get("password"),
+        host=db_config.get("ip"),
+        port=int(db_config["port"]) if db_config.get("port") else None,
+        database=db_config.get("database"),
+        query={"charset": "utf8mb4"},
+    )
+    return url.render_as_string(hide_password=False)
 
 
 class DBEngine(object):
-    def __init__(self, db_uri):
+    def __init__(self, db_uri, registry: EngineRegistry = None):
         """
         db_uri = f'mysql+pymysql://{username}:{password}@{host}:{port}/{database}?charset=utf8mb4'
 
+        engine and its connection pool are shared by db_uri in registry, connection
+        is checked out per statement and returned to pool once executed, statements
+        are autocommitted. Connection whose session state is changed, e.g. SET @var,
+        is pinned to this engine until reset, thus later statements see the state
         """
-        engine = create_engine(db_uri)
-        self.session = sessionmaker(bind=engine, autocommit=True)()
+        self.db_uri = db_uri
+        self.registry = registry or engine_registry
+        self.connection = None
+        self.session_dirty = False
+        # engine of executor thread may be reset by runner in another thread
+        self.lock = threading.RLock()
+
+    def __get_connection(self):
+        if self.connection is None:
+            self.connection = self.registry.checkout(self.db_uri).execution_options(
+                isolation_level="AUTOCOMMIT"
+            )
+        return self.connection
+
+    def reset(self) -> None:
+        """return connection to pool, e.g. between testcases. connection whose session
+        state is changed is discarded instead, thus never reused by other testcases"""
+        with self.lock:
+            connection, self.connection = self.connection, None
+            if connection is None:
+                return
+
+            try:
+                if self.session_dirty:
+                    connection.invalidate()
+                connection.close()
+            except Exception as ex:
+                logger.warning(f"reset db connection failed: {ex}")
+            self.session_dirty = False
+
+    close = reset
+
+    def __release(self) -> None:
+        """return connection to pool after statement, unless session state is pinned"""
+        if not self.session_dirty:
+            self.reset()
+
+    def __decoder(self, result, json_columns=()) -> RowDecoder:
+        return RowDecoder.from_result(
+            result, self.__get_connection().dialect.name, json_columns
+        )
 
     @staticmethod
     def value_decode(row: dict):
         """
-        Try to decode value of table
+        Try to decode value of table, kept for compatibility, rows fetched are
+        decoded by RowDecoder with converters computed once per result set
         datetime.datetime-->string
         datetime.date-->string
         json str-->dict
@@ -36,46 +117,187 @@ class DBEngine(object):
                 except ValueError:
                     pass
 
-    def _fetch(self, query, size=-1, commit=True):
+    def _fetch(
+        self,
+        query,
+        size=-1,
+        commit=True,
+        params: SqlParams = None,
+        max_rows: int = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        json_columns=(),
+    ):
+        """params: values of named bind parameters like `:id` in query,
+        list of params is executed with executemany.
+        max_rows: fetch all rows with server-side cursor, at most max_rows rows, or
+        DEFAULT_MAX_ROWS rows if not set.
+        json_columns: decode json of these columns besides declared JSON columns"""
         query = query.strip()
-        result = self.session.execute(query)
-        if query.upper()[:6] == "SELECT":
-            if size < 0:
-                al = result.fetchall()
-                al = [dict(el) for el in al]
-                for el in al:
-                    self.value_decode(el)
-                return al or None
-            elif size == 1:
-                on = dict(result.fetchone())
-                self.value_decode(on)
-                return on or None
+        with self.lock:
+            if SESSION_STATE_PATTERN.match(query):
+                self.session_dirty = True
+            try:
+                return self.__execute(
+                    query, size, params, max_rows, chunk_size, json_columns
+                )
+            finally:
+                self.__release()
+
+    def __execute(self, query, size, params, max_rows, chunk_size, json_columns):
+        select = query.upper()[:6] == "SELECT"
+        if size < 0 and select and not isinstance(params, (list, tuple)):
+            max_rows = max_rows if max_rows and max_rows > 0 else DEFAULT_MAX_ROWS
+            statement = compile_sql(limit_query(query, max_rows)).statement
+            result = stream_result(self.__get_connection(), statement, params, chunk_size)
+            decoder = self.__decoder(result, json_columns)
+            return decoder.decode_all(fetch_limited(iter_rows(result), max_rows)) or None
+
+        statement = compile_sql(query).statement
+        result = self.__get_connection().execute(statement, params or None)
+        if isinstance(params, (list, tuple)):
+            return {"rowcount": result.rowcount}
+        if select:
+            decoder = self.__decoder(result, json_columns)
+            if size == 1:
+                on = result.fetchone()
+                if on is None:
+                    return None
+                return decoder.decode(on) or None
             else:
-                mny = result.fetchmany(size)
-                mny = [dict(el) for el in mny]
-                for el in mny:
-                    self.value_decode(el)
-                return mny or None
+                return decoder.decode_all(result.fetchmany(size)) or None
         elif query.upper()[:6] in ("UPDATE", "DELETE", "INSERT"):
             return {"rowcount": result.rowcount}
 
-    def fetchone(self, query, commit=True):
-        return self._fetch(query, size=1, commit=commit)
+    def fetchone(self, query, commit=True, params=None, json_columns=()):
+        return self._fetch(
+            query, size=1, commit=commit, params=params, json_columns=json_columns
+        )
+
+    def fetchmany(self, query, size, commit=True, params=None, json_columns=()):
+        return self._fetch(
+            query=query,
+            size=size,
+            commit=commit,
+            params=params,
+            json_columns=json_columns,
+        )
+
+    def fetchall(self, query, commit=True, params=None, max_rows=0, json_columns=()):
+        return self._fetch(
+            query=query,
+            size=-1,
+            commit=commit,
+            params=params,
+            max_rows=max_rows,
+            json_columns=json_columns,
+        )
+
+    def aggregate(
+        self,
+        query,
+        params=None,
+        max_rows=0,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        preview_rows=DEFAULT_PREVIEW_ROWS,
+        json_columns=(),
+    ):
+        """stream rows with server-side cursor, return count, checksum and first
+        preview_rows rows instead of all rows, see stream.aggregate_rows"""
+        statement = compile_sql(limit_query(query, max_rows)).statement
+        with self.lock:
+            try:
+                connection = self.__get_connection()
+                result = stream_result(connection, statement, params, chunk_size)
+                decoder = self.__decoder(result, json_columns)
+                return aggregate_rows(
+                    iter_rows(result), max_rows, preview_rows, decoder.decode
+                )
+            finally:
+                self.__release()
+
+    def insert(self, query, commit=True, params=None):
+        return self._fetch(query=query, commit=commit, params=params)
+
+    def delete(self, query, commit=True, params=None):
+        return self._fetch(query=query, commit=commit, params=params)
+
+    def update(self, query, commit=True, params=None):
+        return self._fetch(query=query, commit=commit, params=params)
+
+    def executemany(self, query, params_list, commit=True):
+        """execute statement once for each params in one round trip, e.g. seeding data"""
+        return self._fetch(query=query, commit=commit, params=list(params_list))
+
+
+class DBEngineRegistry(object):
+    """registry of DBEngine shared per (db uri, worker thread).
+
+    Runners of all testcases in process, e.g. testcases of one task execution, get
+    DBEngine of current thread from registry, thus pooled connection is reused by
+    SQL steps of later testcases, while threads never share one connection.
+    Connections are only held across statements by DBEngines with session state,
+    call release_worker after each testcase for each worker thread used by it.
+    """
+
+    def __init__(self, registry: EngineRegistry = None):
+        self.registry = registry or engine_registry
+        self.__db_engines: Dict[Tuple[Text, int], DBEngine] = {}
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_db_engine(self, db_uri: Text) -> DBEngine:
+        key = (db_uri, threading.get_ident())
+        with self.__lock:
+            db_engine = self.__db_engines.get(key)
+            if db_engine is not None:
+                self.hits += 1
+                return db_engine
+
+            self.misses += 1
+            db_engine = self.__db_engines[key] = DBEngine(db_uri, self.registry)
+
+        logger.debug(f"create db engine of worker {key[1]}: {mask_uri(db_uri)}")
+        return db_engine
+
+    def release_worker(self, thread_ident: Optional[int] = None) -> None:
+        """reset DBEngines of worker thread, current thread by default.
+        DBEngines of finished threads, e.g. concurrent step workers, are removed"""
+        thread_ident = thread_ident or threading.get_ident()
+        alive_idents = {thread.ident for thread in threading.enumerate()}
+        with self.__lock:
+            released = [
+                key
+                for key in self.__db_engines
+                if key[1] == thread_ident or key[1] not in alive_idents
+            ]
+            db_engines = [self.__db_engines[key] for key in released]
+            for key in released:
+                if key[1] not in alive_idents:
+                    self.__db_engines.pop(key)
+
+        for db_engine in db_engines:
+            db_engine.reset()
 
-    def fetchmany(self, query, size, commit=True):
-        return self._fetch(query=query, size=size, commit=commit)
+    def close(self) -> None:
+        with self.__lock:
+            db_engines = list(self.__db_engines.values())
+            self.__db_engines.clear()
 
-    def fetchall(self, query, commit=True):
-        return self._fetch(query=query, size=-1, commit=commit)
+        for db_engine in db_engines:
+            db_engine.reset()
 
-    def insert(self, query, commit=True):
-        return self._fetch(query=query, commit=commit)
+    def get_stats(self) -> Dict:
+        with self.__lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "db_engines": len(self.__db_engines),
+            }
 
-    def delete(self, query, commit=True):
-        return self._fetch(query=query, commit=commit)
 
-    def update(self, query, commit=True):
-        return self._fetch(query=query, commit=commit)
+# shared by runners of all testcases in process
+db_engine_registry = DBEngineRegistry()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,177 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Text
+
+from loguru import logger
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine, make_url
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 5
+DEFAULT_POOL_TIMEOUT = 30
+# recycle connections idle longer than server side timeout, e.g. MySQL wait_timeout
+DEFAULT_POOL_RECYCLE = 1800
+
+
+def mask_uri(db_uri: Text) -> Text:
+    """hide password of db uri for logs and stats"""
+    return re.sub(r"://([^:/@]+):[^/]*@", r"://\1:******@", db_uri)
+
+
+class EngineStat(object):
+    """checkout latency and usage of one engine pool"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkout_ms = 0.0
+        self.checkout_max_ms = 0.0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.lock = threading.Lock()
+
+    def record_checkout(self, elapsed_ms: float) -> None:
+        with self.lock:
+            self.checkouts += 1
+            self.checkout_ms += elapsed_ms
+            self.checkout_max_ms = max(self.checkout_max_ms, elapsed_ms)
+
+    def on_checkout(self, *args) -> None:
+        with self.lock:
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def on_checkin(self, *args) -> None:
+        with self.lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def dict(self) -> Dict:
+        with self.lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_avg_ms": round(self.checkout_ms / self.checkouts, 2)
+                if self.checkouts
+                else 0,
+                "checkout_max_ms": round(self.checkout_max_ms, 2),
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+            }
+
+
+class EngineRegistry(object):
+    """process-wide registry of SQLAlchemy engines keyed by db uri.
+
+    Each engine owns a bounded connection pool, connections are pre-pinged before
+    checkout and recycled after idle for pool_recycle seconds, thus SQL hooks and
+    SQL steps reuse established connections instead of connecting per statement.
+
+    Examples:
+        >>> with engine_registry.connect("sqlite:///demo.db") as conn:
+        ...     conn.execute(text("select 1"))
+        >>> engine_registry.get_stats()
+            {"hits": 0, "misses": 1, "engines": {"sqlite:///demo.db": {...}}}
+
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_overflow: int = DEFAULT_MAX_OVERFLOW,
+        pool_timeout: int = DEFAULT_POOL_TIMEOUT,
+        pool_recycle: int = DEFAULT_POOL_RECYCLE,
+    ) -> None:
+        self.pool_size = max(1, int(pool_size))
+        self.max_overflow = max(0, int(max_overflow))
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+        self.__engines: Dict[Text, Engine] = {}
+        self.__stats: Dict[Text, EngineStat] = {}
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __create_engine(self, db_uri: Text) -> Engine:
+        kwargs = {"pool_pre_ping": True, "pool_recycle": self.pool_recycle}
+        if make_url(db_uri).get_backend_name() != "sqlite":
+            # sqlite memory database uses SingletonThreadPool without overflow
+            kwargs.update(
+                pool_size=self.pool_size,
+                max_overflow=self.max_overflow,
+                pool_timeout=self.pool_timeout,
+            )
+        return create_engine(db_uri, **kwargs)
+
+    def get_engine(self, db_uri: Text) -> Engine:
+        """get engine for db uri, create one if not exists"""
+        with self.__lock:
+            engine = self.__engines.get(db_uri)
+            if engine is not None:
+                self.hits += 1
+                return engine
+
+            self.misses += 1
+            engine = self.__engines[db_uri] = self.__create_engine(db_uri)
+            stat = self.__stats[db_uri] = EngineStat()
+
+        event.listen(engine, "checkout", stat.on_checkout)
+        event.listen(engine, "checkin", stat.on_checkin)
+        logger.debug(f"create db engine: {mask_uri(db_uri)}")
+        return engine
+
+    def checkout(self, db_uri: Text) -> Connection:
+        """checkout connection from pool of db uri, checkout latency is recorded.
+        connection is returned to pool once closed"""
+        engine = self.get_engine(db_uri)
+        start = time.perf_counter()
+        conn = engine.connect()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stat = self.__stats.get(db_uri)
+        if stat is not None:
+            stat.record_checkout(elapsed_ms)
+        return conn
+
+    @contextmanager
+    def connect(self, db_uri: Text) -> Connection:
+        conn = self.checkout(db_uri)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def dispose(self, db_uri: Text) -> bool:
+        """dispose engine of db uri, e.g. database config changed"""
+        with self.__lock:
+            engine = self.__engines.pop(db_uri, None)
+            self.__stats.pop(db_uri, None)
+
+        if engine is None:
+            return False
+        engine.dispose()
+        logger.info(f"dispose db engine: {mask_uri(db_uri)}")
+        return True
+
+    def dispose_all(self) -> None:
+        with self.__lock:
+            engines = list(self.__engines.values())
+            self.__engines.clear()
+            self.__stats.clear()
+
+        for engine in engines:
+            engine.dispose()
+
+    def get_stats(self) -> Dict:
+        with self.__lock:
+            engines = dict(self.__engines)
+            stats = dict(self.__stats)
+            result = {"hits": self.hits, "misses": self.misses, "engines": {}}
+
+        for db_uri, engine in engines.items():
+            engine_stat = stats[db_uri].dict()
+            engine_stat["pool"] = engine.pool.status()
+            result["engines"][mask_uri(db_uri)] = engine_stat
+        return result
+
+
+# shared by SQL hooks and SQL steps of all testcases in process
+engine_registry = EngineRegistry()
@@ -0,0 +1,53 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Text, Tuple, Union
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+# named bind parameter like `:user_id`, the same as sqlalchemy.text
+BIND_PARAM_PATTERN = re.compile(r"(?<![:\w\x5c]):(\w+)(?!:)", re.UNICODE)
+
+SqlParams = Union[Dict[Text, Any], List[Dict[Text, Any]]]
+
+
+class CompiledSql(NamedTuple):
+    statement: TextClause
+    bind_names: Tuple[Text, ...]
+
+
+@lru_cache(maxsize=1024)
+def compile_sql(sql: Text) -> CompiledSql:
+    """text construct of sql template, created once per sql text. Values are bound
+    as parameters instead of being formatted into sql, thus the same statement is
+    reused from SQLAlchemy compiled cache for all values"""
+    bind_names = tuple(dict.fromkeys(BIND_PARAM_PATTERN.findall(sql)))
+    return CompiledSql(text(sql), bind_names)
+
+
+def bind_params(
+    compiled: CompiledSql, params: Optional[SqlParams] = None, variables: Dict = None
+) -> Optional[SqlParams]:
+    """values of bind parameters, missing ones are taken from variables, e.g. step
+    variables. List of params is executed in one round trip with executemany.
+
+    Examples:
+        >>> compiled = compile_sql("select * from user where id = :uid and age > :age")
+        >>> bind_params(compiled, {"age": 18}, {"uid": 1})
+            {"age": 18, "uid": 1}
+
+    """
+    variables = variables or {}
+
+    def fill(row: Optional[Dict]) -> Dict:
+        row = dict(row or {})
+        for name in compiled.bind_names:
+            if name not in row and name in variables:
+                row[name] = variables[name]
+        return row
+
+    if isinstance(params, (list, tuple)):
+        return [fill(row) for row in params]
+    if not params and not compiled.bind_names:
+        return None
+    return fill(params)
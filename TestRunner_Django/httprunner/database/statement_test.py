@@ -0,0 +1,24 @@
+import unittest
+
+from httprunner.database.statement import bind_params, compile_sql
+
+
+class TestStatement(unittest.TestCase):
+    def test_compile_sql(self):
+        compiled = compile_sql(
+            "select * from t where id = :id and ts > '10:30' and a::text = :a or b = :id"
+        )
+        self.assertEqual(compiled.bind_names, ("id", "a"))
+        self.assertIs(compile_sql(str(compiled.statement)), compiled)
+
+    def test_bind_params(self):
+        compiled = compile_sql("select * from t where id = :id and age > :age")
+        self.assertEqual(
+            bind_params(compiled, {"age": 18}, {"id": 1, "age": 20}),
+            {"id": 1, "age": 18},
+        )
+        self.assertEqual(
+            bind_params(compiled, [{"id": 1}, {"id": 2}], {"age": 20}),
+            [{"id": 1, "age": 20}, {"id": 2, "age": 20}],
+        )
+        self.assertIsNone(bind_params(compile_sql("select 1"), {}, {"id": 1}))
@@ -0,0 +1,131 @@
+import hashlib
+import re
+from typing import Callable, Dict, Iterable, Iterator, Optional, Text
+
+from loguru import logger
+from sqlalchemy.engine import Connection, CursorResult, Row
+
+from httprunner import json_codec
+from httprunner.database.statement import SqlParams
+
+# rows fetched from server-side cursor per round trip
+DEFAULT_CHUNK_SIZE = 1000
+# rows kept in aggregate result
+DEFAULT_PREVIEW_ROWS = 10
+# rows fetched by fetchall at most if max_rows is not set, thus memory is bounded
+DEFAULT_MAX_ROWS = 100000
+
+# clauses after which LIMIT can not simply be appended, and comments which may
+# swallow it, these queries are sent as they are
+UNLIMITABLE_PATTERN = re.compile(
+    r"\b(LIMIT|FETCH|OFFSET|INTO|PROCEDURE|FOR\s+UPDATE|FOR\s+SHARE|LOCK\s+IN)\b|--|#|/\*",
+    re.IGNORECASE,
+)
+
+
+def limit_query(query: Text, max_rows: int) -> Text:
+    """append LIMIT max_rows + 1 to select query, thus server stops sending rows
+    right after the cap, and exceeding rows can still be detected.
+
+    Rows of unbuffered cursor, e.g. SSCursor of pymysql, are drained when result is
+    closed, so without LIMIT max_rows only bounds memory, not transfer time. Queries
+    with LIMIT, locking clauses or comments are not changed.
+    """
+    query = query.strip().rstrip(";").rstrip()
+    if (
+        not max_rows
+        or max_rows < 0
+        or query.upper()[:6] != "SELECT"
+        or UNLIMITABLE_PATTERN.search(query)
+    ):
+        return query
+    return f"{query} LIMIT {int(max_rows) + 1}"
+
+
+def stream_result(
+    connection: Connection,
+    statement,
+    params: SqlParams = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> CursorResult:
+    """execute statement with server-side cursor, e.g. SSCursor of pymysql, thus
+    only chunk_size rows are buffered in memory"""
+    chunk_size = max(1, int(chunk_size or DEFAULT_CHUNK_SIZE))
+    return connection.execution_options(yield_per=chunk_size).execute(
+        statement, params or None
+    )
+
+
+def iter_rows(result: CursorResult) -> Iterator[Row]:
+    """iterate rows of streamed result, cursor is closed once iteration stops"""
+    try:
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        result.close()
+
+
+def stream_rows(
+    connection: Connection,
+    statement,
+    params: SqlParams = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Row]:
+    return iter_rows(stream_result(connection, statement, params, chunk_size))
+
+
+def aggregate_rows(
+    rows: Iterable[Row],
+    max_rows: int = 0,
+    preview_rows: int = DEFAULT_PREVIEW_ROWS,
+    decode: Optional[Callable[[Row], Dict]] = None,
+) -> Dict:
+    """aggregate rows without materializing them, for validators asserting on large
+    results, e.g. count, checksum or first rows. Rows beyond max_rows are not read.
+
+    checksum is sha256 of rows dumped as json lines, which is stable for the same
+    data and column order. Preview rows are converted to dict by decode.
+
+    Examples:
+        >>> aggregate_rows(stream_rows(conn, compile_sql("select * from t").statement))
+            {"count": 500000, "checksum": "...", "columns": ["id"], "rows": [...], "truncated": False}
+
+    """
+    digest = hashlib.sha256()
+    count = 0
+    columns = []
+    preview = []
+    truncated = False
+    for row in rows:
+        if max_rows and count >= max_rows:
+            truncated = True
+            break
+
+        if not columns:
+            columns = list(row._fields)
+        digest.update(json_codec.dumps_bytes(list(row), default=json_codec.safe_default))
+        digest.update(b"\n")
+        if count < preview_rows:
+            preview.append(decode(row) if decode is not None else dict(row._mapping))
+        count += 1
+
+    if truncated:
+        logger.warning(f"sql result exceeds max rows {max_rows}, rest rows are skipped")
+    return {
+        "count": count,
+        "checksum": digest.hexdigest(),
+        "columns": columns,
+        "rows": preview,
+        "truncated": truncated,
+    }
+
+
+def fetch_limited(rows: Iterable[Row], max_rows: int) -> list:
+    """fetch at most max_rows rows, rest rows are skipped with warning"""
+    fetched = []
+    for row in rows:
+        if len(fetched) >= max_rows:
+            logger.warning(f"sql result exceeds max rows {max_rows}, rest rows are skipped")
+            break
+        fetched.append(row)
+    return fetched
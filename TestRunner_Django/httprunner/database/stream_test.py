@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from httprunner.database.engine import DBEngine
+from httprunner.database.pool import EngineRegistry
+from httprunner.database.stream import limit_query
+
+
+class TestStream(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine_registry = EngineRegistry()
+        self.db_engine = DBEngine(
+            f"sqlite:///{os.path.join(self.tmp_dir.name, 'stream.db')}",
+            self.engine_registry,
+        )
+        self.db_engine.fetchall("create table t (id int, info text)")
+        self.db_engine.executemany(
+            "insert into t values (:id, :info)",
+            [{"id": i, "info": '{"i": %d}' % i} for i in range(2000)],
+        )
+
+    def tearDown(self):
+        self.db_engine.reset()
+        self.engine_registry.dispose_all()
+        self.tmp_dir.cleanup()
+
+    def test_aggregate(self):
+        result = self.db_engine.aggregate(
+            "select * from t order by id",
+            chunk_size=100,
+            preview_rows=2,
+            json_columns=["info"],
+        )
+        digest = hashlib.sha256()
+        for i in range(2000):
+            digest.update(json.dumps([i, '{"i": %d}' % i], separators=(",", ":")).encode() + b"\n")
+        self.assertEqual(result["count"], 2000)
+        self.assertEqual(result["checksum"], digest.hexdigest())
+        self.assertEqual(result["columns"], ["id", "info"])
+        self.assertEqual(result["rows"], [{"id": 0, "info": {"i": 0}}, {"id": 1, "info": {"i": 1}}])
+        self.assertFalse(result["truncated"])
+
+    def test_max_rows(self):
+        result = self.db_engine.aggregate("select id from t", max_rows=10)
+        self.assertEqual((result["count"], result["truncated"]), (10, True))
+        self.assertEqual(len(self.db_engine.fetchall("select id from t", max_rows=3)), 3)
+        # connection is usable after server-side cursor is closed early
+        self.assertEqual(self.db_engine.fetchone("select count(*) as c from t"), {"c": 2000})
+
+    def test_default_max_rows(self):
+        with mock.patch("httprunner.database.engine.DEFAULT_MAX_ROWS", 5):
+            self.assertEqual(len(self.db_engine.fetchall("select id from t")), 5)
+            self.assertEqual(len(self.db_engine.fetchall("select id from t", max_rows=10)), 10)
+
+    def test_limit_query(self):
+        self.assertEqual(limit_query("select id from t;", 3), "select id from t LIMIT 4")
+        self.assertEqual(limit_query("select id from t", 0), "select id from t")
+        # queries LIMIT can not be appended to are not changed
+        for query in (
+            "select id from t limit 10",
+            "select id from t for update",
+            "select id from t -- all rows",
+            "update t set id = 1",
+        ):
+            self.assertEqual(limit_query(query, 3), query)
@@ -113,7 +113,9 @@ def prepare_upload_step(
         params_list.append(f"{key}=${key}")
 
     params_str = ", ".join(params_list)
-    step_variables["m_encoder"] = "${multipart_encoder(" + params_str + ")}"
+    step_variables["m_encoder"] = parse_data(
+        "${multipart_encoder(" + params_str + ")}", step_variables, functions
+    )
 
     step.request.headers["Content-Type"] = "${multipart_content_type($m_encoder)}"
 
@@ -0,0 +1,303 @@
+import sys
+import time
+from datetime import timedelta
+from http.cookiejar import CookieJar
+from typing import Dict, Optional, Text, Tuple
+
+import requests
+from loguru import logger
+from requests import PreparedRequest, Request, Response
+from requests.cookies import RequestsCookieJar
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from httprunner.client import (
+    RECORD_TRUNCATED,
+    ApiResponse,
+    HttpSession,
+    log_spilled_body,
+)
+from httprunner.models import SessionData
+from httprunner.spill import BODY_SPILL_THRESHOLD, SPILL_CHUNK_SIZE, BodySpool
+from httprunner.timing import to_ms
+
+try:
+    import httpx
+
+    HTTPX_READY = True
+except ModuleNotFoundError:
+    HTTPX_READY = False
+
+# connection-specific headers are not allowed in HTTP/2
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-connection",
+    "transfer-encoding",
+    "upgrade",
+}
+
+
+def ensure_httpx_ready():
+    if HTTPX_READY:
+        return
+
+    msg = """
+    http2 transport dependencies uninstalled, install first and try again.
+    install with pip:
+    $ pip install "httpx[http2]"
+    """
+    logger.error(msg)
+    sys.exit(1)
+
+
+class SessionCookieJar(CookieJar):
+    """cookie jar of client shared by sessions, which never keeps cookies,
+    cookies are kept in each Http2Session instead"""
+
+    def extract_cookies(self, response, request):
+        pass
+
+    def set_cookie(self, cookie):
+        pass
+
+
+def create_http2_client(
+    verify=True, max_connections: int = 10, prior_knowledge: bool = False
+) -> "httpx.Client":
+    """create HTTP/2 client shared by sessions, concurrent requests to the same
+    origin are multiplexed as streams on one connection.
+    prior_knowledge: use HTTP/2 without TLS negotiation, e.g. h2c servers"""
+    ensure_httpx_ready()
+    return httpx.Client(
+        http1=not prior_knowledge,
+        http2=True,
+        verify=verify,
+        cookies=SessionCookieJar(),
+        limits=httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections
+        ),
+    )
+
+
+def to_httpx_timeout(timeout) -> "httpx.Timeout":
+    if isinstance(timeout, (tuple, list)):
+        # (connect timeout, read timeout) like requests
+        connect_timeout, read_timeout = timeout
+        return httpx.Timeout(read_timeout, connect=connect_timeout)
+    return httpx.Timeout(timeout)
+
+
+def to_prepared_request(request: "httpx.Request") -> PreparedRequest:
+    """convert request built by httpx, e.g. redirect requests, which are sent with
+    cookies of session and recorded as requests.PreparedRequest"""
+    prepared = Request(request.method, str(request.url), headers=dict(request.headers)).prepare()
+    try:
+        prepared.body = request.content or None
+    except httpx.RequestNotRead:
+        pass
+    return prepared
+
+
+def build_response(
+    resp: "httpx.Response",
+    content: bytes,
+    request: PreparedRequest,
+    elapsed: float,
+    history=None,
+) -> Response:
+    """convert httpx response into requests.Response, thus response object,
+    extractors, validators and recorders work the same with all transports"""
+    response = Response()
+    response.status_code = resp.status_code
+    response.reason = resp.reason_phrase
+    response.headers = CaseInsensitiveDict(resp.headers)
+    response.url = str(resp.url)
+    response._content = content
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.elapsed = timedelta(seconds=elapsed)
+    response.cookies = RequestsCookieJar()
+    response.cookies.update(resp.cookies.jar)
+    response.history = history or []
+    response.request = request
+    return response
+
+
+class Http2Session(HttpSession):
+    """HttpSession sending requests with HTTP/2 transport based on httpx.
+
+    Requests are prepared by requests (headers, cookies, auth, params and body
+    encoding), then sent by httpx.Client, which may be shared with forked sessions,
+    e.g. parallel steps or parameter rows, multiplexing streams on one connection
+    instead of opening one connection per concurrent request.
+    Response is converted into requests.Response and recorded into SessionData the
+    same way as HttpSession, while cookies are kept per session.
+    """
+
+    def __init__(
+        self,
+        client: "httpx.Client" = None,
+        record_level: str = RECORD_TRUNCATED,
+        spill_threshold: Optional[int] = BODY_SPILL_THRESHOLD,
+    ):
+        super(Http2Session, self).__init__(None, record_level, spill_threshold)
+        self.client = client
+        self.__client_owner = client is None
+
+    def fork(self) -> "Http2Session":
+        session = Http2Session(
+            self.__get_client(self.verify), self.record_level, self.spill_threshold
+        )
+        for attr in self.__attrs__:
+            setattr(session, attr, getattr(self, attr))
+        return session
+
+    def __get_client(self, verify) -> "httpx.Client":
+        if self.client is None:
+            self.client = create_http2_client(verify)
+            self.__client_owner = True
+        return self.client
+
+    def request(self, method, url, name=None, **kwargs):
+        """send a HTTP request, arguments are the same as HttpSession.request"""
+        self.data = SessionData()
+
+        timeout = kwargs.pop("timeout", 120)
+        allow_redirects = kwargs.pop("allow_redirects", True)
+        verify = kwargs.pop("verify", None)
+        kwargs.pop("stream", None)
+        for unsupported in ("proxies", "cert"):
+            if kwargs.pop(unsupported, None):
+                logger.warning(f"argument {unsupported} is not supported by http2 session")
+
+        prepared = self.prepare_request(Request(method=method.upper(), url=url, **kwargs))
+        client = self.__get_client(self.verify if verify is None else verify)
+
+        timing = {}
+        start_timestamp = time.time()
+        try:
+            response = self.__send(
+                client, prepared, to_httpx_timeout(timeout), allow_redirects, timing
+            )
+        except httpx.HTTPError as ex:
+            response = ApiResponse()
+            response.error = requests.exceptions.ConnectionError(str(ex) or repr(ex))
+            response.status_code = 0  # with this status_code, content returns None
+            response.request = prepared
+            response.elapsed = timedelta(seconds=time.time() - start_timestamp)
+
+        response_time_ms = round((time.time() - start_timestamp) * 1000, 2)
+        log_spilled_body(response)
+        self._record_response(
+            response, response_time_ms, timing, timing.get("download_ms", 0)
+        )
+        return response
+
+    def __send(
+        self,
+        client: "httpx.Client",
+        prepared: PreparedRequest,
+        timeout: "httpx.Timeout",
+        allow_redirects: bool,
+        timing: Dict,
+    ) -> Response:
+        """send request and follow redirects, cookies of redirected requests are taken
+        from session, since httpx rebuilds Cookie header from empty client cookie jar"""
+        history = []
+        while True:
+            resp, spool, elapsed = self.__send_once(client, prepared, timeout, timing)
+            content = spool.getvalue()
+            self.cookies.update(resp.cookies.jar)
+            next_request = resp.next_request if allow_redirects else None
+            if next_request is None:
+                break
+
+            if len(history) >= client.max_redirects:
+                raise httpx.TooManyRedirects(
+                    "Exceeded maximum allowed redirects.", request=resp.request
+                )
+            history.append(build_response(resp, content, prepared, elapsed))
+            prepared = to_prepared_request(next_request)
+            prepared.headers.pop("Cookie", None)
+            prepared.prepare_cookies(self.cookies)
+
+        self.__record_connection_timing(timing)
+        logger.debug(f"http version: {resp.http_version}")
+
+        response = build_response(resp, content, prepared, elapsed, history)
+        response._spilled_body = spool.spilled
+        return response
+
+    def __send_once(
+        self,
+        client: "httpx.Client",
+        prepared: PreparedRequest,
+        timeout: "httpx.Timeout",
+        timing: Dict,
+    ) -> Tuple["httpx.Response", BodySpool, float]:
+        def trace(event_name: Text, info: Dict):
+            # connection events are only triggered if new connection is established
+            if event_name.startswith("connection."):
+                timing[event_name] = time.perf_counter()
+
+        headers = {
+            key: value
+            for key, value in prepared.headers.items()
+            if key.lower() not in HOP_BY_HOP_HEADERS
+        }
+        body = prepared.body
+        if hasattr(body, "read"):
+            # e.g. MultipartEncoder of upload step
+            body = body.read()
+
+        request = client.build_request(
+            prepared.method,
+            prepared.url,
+            headers=headers,
+            content=body,
+            timeout=timeout,
+            extensions={"trace": trace},
+        )
+        start_timestamp = time.time()
+        resp = client.send(request, stream=True, follow_redirects=False)
+        try:
+            # time to response headers, same as requests.Response.elapsed
+            elapsed = time.time() - start_timestamp
+            self.__record_address(resp)
+            download_start = time.perf_counter()
+            spool = BodySpool(self.spill_threshold)
+            for chunk in resp.iter_bytes(SPILL_CHUNK_SIZE):
+                spool.write(chunk)
+            timing["download_ms"] = to_ms(time.perf_counter() - download_start)
+        finally:
+            resp.close()
+        return resp, spool, elapsed
+
+    @staticmethod
+    def __record_connection_timing(timing: Dict) -> None:
+        """convert trace events into connection phases, DNS is included in tcp_ms"""
+        for phase, event in (("tcp_ms", "connect_tcp"), ("tls_ms", "start_tls")):
+            started = timing.pop(f"connection.{event}.started", None)
+            completed = timing.pop(f"connection.{event}.complete", None)
+            if started is not None and completed is not None:
+                timing[phase] = to_ms(completed - started)
+
+    def __record_address(self, resp: "httpx.Response") -> None:
+        try:
+            network_stream = resp.extensions["network_stream"]
+            client_ip, client_port = network_stream.get_extra_info("client_addr")[:2]
+            server_ip, server_port = network_stream.get_extra_info("server_addr")[:2]
+        except Exception:
+            return
+
+        self.data.address.client_ip = client_ip
+        self.data.address.client_port = client_port
+        self.data.address.server_ip = server_ip
+        self.data.address.server_port = server_port
+        logger.debug(f"client IP: {client_ip}, Port: {client_port}")
+        logger.debug(f"server IP: {server_ip}, Port: {server_port}")
+
+    def close(self) -> None:
+        super(Http2Session, self).close()
+        if self.__client_owner and self.client is not None:
+            self.client.close()
@@ -0,0 +1,147 @@
+import json
+import socket
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from httprunner.http2_client import HTTPX_READY, Http2Session, create_http2_client
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+
+    H2_READY = True
+except ModuleNotFoundError:
+    H2_READY = False
+
+
+class H2Server(object):
+    """minimal h2c server with prior knowledge, echoes path, cookie and stream id"""
+
+    def __init__(self):
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen()
+        self.port = self.sock.getsockname()[1]
+        self.connections = 0
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def serve_forever(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+
+    def handle(self, conn):
+        h2_conn = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False)
+        )
+        h2_conn.initiate_connection()
+        conn.sendall(h2_conn.data_to_send())
+        requests = {}
+        while True:
+            data = conn.recv(65535)
+            if not data:
+                conn.close()
+                return
+            for event in h2_conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    requests[event.stream_id] = dict(event.headers)
+                elif isinstance(event, h2.events.StreamEnded):
+                    self.reply(h2_conn, event.stream_id, requests.pop(event.stream_id))
+            conn.sendall(h2_conn.data_to_send())
+
+    @staticmethod
+    def reply(h2_conn, stream_id, headers):
+        path = headers[b":path"].decode("utf-8")
+        content = json.dumps(
+            {
+                "path": path,
+                "cookie": headers.get(b"cookie", b"").decode("utf-8"),
+                "stream_id": stream_id,
+            }
+        ).encode("utf-8")
+        response_headers = [
+            (":status", "302" if path.startswith("/redirect") else "200"),
+            ("content-type", "application/json"),
+            ("content-length", str(len(content))),
+        ]
+        if path.startswith("/login"):
+            response_headers.append(("set-cookie", f"sid={path[-1]}; Path=/"))
+        elif path.startswith("/redirect"):
+            response_headers.append(("set-cookie", "rid=2; Path=/"))
+            response_headers.append(("location", "/echo"))
+        h2_conn.send_headers(stream_id, response_headers)
+        h2_conn.send_data(stream_id, content, end_stream=True)
+
+    def close(self):
+        self.sock.close()
+
+
+@unittest.skipUnless(HTTPX_READY and H2_READY, "httpx[http2] uninstalled")
+class TestHttp2Session(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = H2Server()
+        cls.base_url = f"http://127.0.0.1:{cls.server.port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.close()
+
+    def test_request(self):
+        client = create_http2_client(prior_knowledge=True)
+        session = Http2Session(client)
+        resp = session.request("GET", f"{self.base_url}/login/1", params={"a": 1})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["path"], "/login/1?a=1")
+        self.assertEqual(session.data.address.server_port, self.server.port)
+        self.assertEqual(session.data.req_resps[0].response.body["path"], "/login/1?a=1")
+        self.assertGreater(session.data.stat.tcp_ms, 0)
+
+        # cookies are kept per session, not in shared client
+        self.assertEqual(session.request("GET", f"{self.base_url}/").json()["cookie"], "sid=1")
+        other_session = Http2Session(client)
+        self.assertEqual(other_session.request("GET", f"{self.base_url}/").json()["cookie"], "")
+        client.close()
+
+    def test_redirect_with_cookies(self):
+        client = create_http2_client(prior_knowledge=True)
+        session = Http2Session(client)
+        session.request("GET", f"{self.base_url}/login/1")
+        resp = session.request("GET", f"{self.base_url}/redirect")
+
+        # cookies of session and redirect response are sent to redirect target
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["path"], "/echo")
+        self.assertEqual(resp.json()["cookie"], "sid=1; rid=2")
+        self.assertEqual([r.status_code for r in resp.history], [302])
+        self.assertEqual(resp.request.url, f"{self.base_url}/echo")
+
+        resp = session.request("GET", f"{self.base_url}/redirect", allow_redirects=False)
+        self.assertEqual(resp.status_code, 302)
+        self.assertEqual(resp.history, [])
+        client.close()
+
+    def test_multiplexing(self):
+        connections = self.server.connections
+        session = Http2Session(create_http2_client(prior_knowledge=True))
+        session.request("GET", f"{self.base_url}/")
+
+        def request(index):
+            forked = session.fork()
+            resp = forked.request("POST", f"{self.base_url}/post/{index}", json={"i": index})
+            return forked.data.address.client_port, resp.json()["stream_id"]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(request, range(16)))
+
+        # all requests are sent as streams of one connection
+        self.assertEqual(self.server.connections - connections, 1)
+        self.assertEqual(len({port for port, _ in results}), 1)
+        self.assertEqual(len({stream_id for _, stream_id in results}), 16)
+        session.close()
@@ -0,0 +1,142 @@
+"""json codec used by runner, recorder and report storage.
+
+orjson is used if installed, otherwise stdlib json. Both paths produce the same
+data, pretty output is indented with 2 spaces, non-ascii characters are kept.
+"""
+import datetime
+import json
+import mmap
+from collections.abc import Mapping
+from typing import Any, Callable, Optional, Text, Union
+
+try:
+    import orjson
+
+    ORJSON_READY = True
+except ModuleNotFoundError:
+    ORJSON_READY = False
+
+
+def default(obj: Any) -> Any:
+    """convert objects not supported by json natively, raise TypeError otherwise"""
+    if isinstance(obj, Mapping):
+        # e.g. requests.structures.CaseInsensitiveDict
+        return dict(obj)
+
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+
+    if isinstance(obj, (bytes, bytearray)):
+        # bytes bodies, e.g. protobuf or image, are kept as repr if not utf-8 text
+        try:
+            return obj.decode("utf-8")
+        except UnicodeDecodeError:
+            return repr(obj)
+
+    if hasattr(obj, "thrift_spec"):
+        # thrift objects
+        return obj.__dict__
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def safe_default(obj: Any) -> Any:
+    """same as default, but dump any other object as repr, e.g. MultipartEncoder"""
+    try:
+        return default(obj)
+    except (UnicodeDecodeError, TypeError):
+        return repr(obj)
+
+
+def dumps_bytes(
+    obj: Any,
+    indent: bool = False,
+    sort_keys: bool = False,
+    default: Optional[Callable] = default,
+) -> bytes:
+    if ORJSON_READY:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except orjson.JSONEncodeError:
+            # e.g. integers exceeding 64 bits, retry with stdlib
+            pass
+
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        sort_keys=sort_keys,
+        ensure_ascii=False,
+        default=default,
+    ).encode("utf-8")
+
+
+def dumps(
+    obj: Any,
+    indent: bool = False,
+    sort_keys: bool = False,
+    default: Optional[Callable] = default,
+) -> Text:
+    return dumps_bytes(obj, indent, sort_keys, default).decode("utf-8")
+
+
+def loads(data: Union[Text, bytes, bytearray, mmap.mmap], strict: bool = True) -> Any:
+    """decode json, raise ValueError (json.JSONDecodeError) if data is not json,
+    TypeError if data is neither str nor bytes"""
+    if not isinstance(data, (str, bytes, bytearray, memoryview, mmap.mmap)):
+        raise TypeError(
+            f"the JSON object must be str or bytes, not {type(data).__name__}"
+        )
+
+    if isinstance(data, mmap.mmap):
+        # body spilled to file, see httprunner.spill
+        data = memoryview(data)
+
+    if ORJSON_READY:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # retry with stdlib, e.g. NaN, big integers, control characters
+            # or encodings other than utf-8
+            pass
+
+    if not isinstance(data, (str, bytes, bytearray)):
+        # e.g. memoryview of body spilled to file
+        data = bytes(data)
+    return json.loads(data, strict=strict)
+
+
+class CodecJSONEncoder(json.JSONEncoder):
+    """JSONEncoder routed through codec, for APIs accepting encoder class only,
+    e.g. json.dumps(cls=...) or Django JSONField(encoder=...).
+
+    Output is compact and keeps non-ascii characters whatever ensure_ascii and
+    separators are, only indent other than 2 falls back to stdlib encoding.
+    """
+
+    def default(self, obj):
+        return safe_default(obj)
+
+    def encode(self, o):
+        if self.indent not in (None, 2):
+            return super(CodecJSONEncoder, self).encode(o)
+        return dumps(
+            o, indent=self.indent is not None, sort_keys=self.sort_keys, default=self.default
+        )
+
+    def iterencode(self, o, _one_shot=False):
+        if self.indent not in (None, 2):
+            return super(CodecJSONEncoder, self).iterencode(o, _one_shot)
+        return iter([self.encode(o)])
+
+
+class CodecJSONDecoder(json.JSONDecoder):
+    """JSONDecoder routed through codec, e.g. Django JSONField(decoder=...)"""
+
+    def decode(self, s, *args, **kwargs):
+        return loads(s, strict=self.strict)
+
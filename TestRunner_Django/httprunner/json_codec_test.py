@@ -0,0 +1,92 @@
+import datetime
+import decimal
+import json
+import unittest
+from unittest import mock
+
+from requests.structures import CaseInsensitiveDict
+
+from httprunner import json_codec
+
+
+class TestJsonCodec(unittest.TestCase):
+    data = {
+        "name": "测试",
+        "items": [1, 2.5, None, True, {"nested": ["a", "b"]}],
+        "empty": {},
+    }
+
+    def test_consistent_with_stdlib(self):
+        for indent in (False, True):
+            for sort_keys in (False, True):
+                expected = json.dumps(
+                    self.data,
+                    indent=2 if indent else None,
+                    sort_keys=sort_keys,
+                    ensure_ascii=False,
+                )
+                dumped = json_codec.dumps(self.data, indent=indent, sort_keys=sort_keys)
+                self.assertEqual(json.loads(dumped), json.loads(expected))
+                if indent:
+                    self.assertEqual(dumped, expected)
+
+                with mock.patch.object(json_codec, "ORJSON_READY", False):
+                    self.assertEqual(
+                        json_codec.dumps(self.data, indent=indent, sort_keys=sort_keys),
+                        expected,
+                    )
+
+        content = json.dumps(self.data).encode("utf-8")
+        self.assertEqual(json_codec.loads(content), self.data)
+        with mock.patch.object(json_codec, "ORJSON_READY", False):
+            self.assertEqual(json_codec.loads(content), self.data)
+
+    def test_dumps_special_types(self):
+        data = {
+            "headers": CaseInsensitiveDict({"Content-Type": "application/json"}),
+            "date": datetime.date(2021, 1, 2),
+            "text": b"\xe4\xb8\xad\xe6\x96\x87",
+            "binary": b"\xff\x00",
+            1: "int key",
+            "big": 2 ** 70,
+        }
+        self.assertEqual(
+            json.loads(json_codec.dumps(data)),
+            {
+                "headers": {"Content-Type": "application/json"},
+                "date": "2021-01-02",
+                "text": "中文",
+                "binary": repr(b"\xff\x00"),
+                "1": "int key",
+                "big": 2 ** 70,
+            },
+        )
+
+        with self.assertRaises(TypeError):
+            json_codec.dumps({"a": decimal.Decimal("1.45")})
+        self.assertEqual(
+            json_codec.dumps({"a": decimal.Decimal("1.45")}, default=json_codec.safe_default),
+            '{"a":"Decimal(\'1.45\')"}',
+        )
+
+    def test_loads(self):
+        self.assertEqual(json_codec.loads('{"a": NaN}')["a"].__class__, float)
+        self.assertEqual(json_codec.loads('"a\tb"', strict=False), "a\tb")
+        self.assertEqual(json_codec.loads("null"), None)
+        with self.assertRaises(ValueError):
+            json_codec.loads("a=1&b=2")
+        with self.assertRaises(ValueError):
+            json_codec.loads(b"\xff\xfe")
+        with self.assertRaises(TypeError):
+            json_codec.loads(None)
+
+    def test_encoder_decoder_class(self):
+        dumped = json.dumps(self.data, cls=json_codec.CodecJSONEncoder)
+        self.assertEqual(dumped, json_codec.dumps(self.data))
+        self.assertEqual(json.loads(dumped, cls=json_codec.CodecJSONDecoder), self.data)
+
+        # unsupported indent falls back to stdlib
+        self.assertEqual(
+            json.dumps(self.data, cls=json_codec.CodecJSONEncoder, indent=4, ensure_ascii=False),
+            json.dumps(self.data, indent=4, ensure_ascii=False),
+        )
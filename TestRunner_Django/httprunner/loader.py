@@ -4,7 +4,7 @@ import json
 import os
 import sys
 import types
-from typing import Callable, Dict, List, Text, Tuple, Union
+from typing import Callable, Dict, Iterator, List, Text, Tuple, Union
 
 import yaml
 from loguru import logger
@@ -125,6 +125,37 @@ def load_dot_env_file(dot_env_path: Text) -> Dict:
     return env_variables_mapping
 
 
+def iter_csv_file(csv_file: Text) -> Iterator[Dict]:
+    """stream csv file rows from disk, each row is in dict format.
+
+    Args:
+        csv_file (str): csv file path, relative path is based on project root dir
+
+    Returns:
+        iterator of parameters, rows are read one by one when consumed
+
+    """
+    if not os.path.isabs(csv_file):
+        global project_meta
+        if project_meta is None:
+            raise exceptions.MyBaseFailure("load_project_meta() has not been called!")
+
+        # make compatible with Windows/Linux
+        csv_file = os.path.join(project_meta.RootDir, *csv_file.split("/"))
+
+    if not os.path.isfile(csv_file):
+        # file path not exist
+        raise exceptions.CSVNotFound(csv_file)
+
+    def _iter_rows():
+        with open(csv_file, encoding="utf-8") as csvfile:
+            reader = csv.DictReader(csvfile)
+            for row in reader:
+                yield row
+
+    return _iter_rows()
+
+
 def load_csv_file(csv_file: Text) -> List[Dict]:
     """load csv file and check file content format
 
@@ -149,26 +180,7 @@ def load_csv_file(csv_file: Text) -> List[Dict]:
         ]
 
     """
-    if not os.path.isabs(csv_file):
-        global project_meta
-        if project_meta is None:
-            raise exceptions.MyBaseFailure("load_project_meta() has not been called!")
-
-        # make compatible with Windows/Linux
-        csv_file = os.path.join(project_meta.RootDir, *csv_file.split("/"))
-
-    if not os.path.isfile(csv_file):
-        # file path not exist
-        raise exceptions.CSVNotFound(csv_file)
-
-    csv_content_list = []
-
-    with open(csv_file, encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            csv_content_list.append(row)
-
-    return csv_content_list
+    return list(iter_csv_file(csv_file))
 
 
 def load_folder_files(folder_path: Text, recursive: bool = True) -> List:
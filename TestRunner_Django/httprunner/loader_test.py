@@ -69,6 +69,23 @@ class TestLoader(unittest.TestCase):
             ],
         )
 
+    def test_iter_csv_file(self):
+        csv_file_path = os.path.join(os.getcwd(), "tmp_iter_csv_file.csv")
+        with open(csv_file_path, "w", encoding="utf-8") as f:
+            f.write("username,password\ntest1,111111\ntest2,222222\n")
+
+        try:
+            rows = loader.iter_csv_file(csv_file_path)
+            self.assertEqual(next(rows), {"username": "test1", "password": "111111"})
+            self.assertEqual(
+                list(rows), [{"username": "test2", "password": "222222"}]
+            )
+        finally:
+            os.remove(csv_file_path)
+
+        with self.assertRaises(exceptions.CSVNotFound):
+            loader.iter_csv_file(csv_file_path)
+
     def test_load_folder_files(self):
         folder = os.path.join(os.getcwd(), "examples")
         file1 = os.path.join(os.getcwd(), "examples", "test_utils.py")
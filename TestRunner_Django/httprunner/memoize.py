@@ -0,0 +1,163 @@
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Optional, Text
+
+from loguru import logger
+
+# cached results are dropped before each step
+CACHE_SCOPE_STEP = "step"
+# cached results are dropped before each testcase run
+CACHE_SCOPE_TESTCASE = "testcase"
+# cached results are kept during the whole task execution
+CACHE_SCOPE_TASK = "task"
+
+CACHE_SCOPES = (CACHE_SCOPE_STEP, CACHE_SCOPE_TESTCASE, CACHE_SCOPE_TASK)
+
+# cache activated by runner of current testcase or step, see FunctionCache.activate
+_active_cache: ContextVar[Optional["FunctionCache"]] = ContextVar(
+    "active_function_cache", default=None
+)
+
+
+def make_cache_key(func_name: Text, args: tuple, kwargs: Dict) -> Any:
+    """make hashable cache key from parsed function arguments,
+    return None if arguments can not be serialized, e.g. arbitrary objects.
+
+    Argument types are part of the key, since equal values of different types,
+    e.g. 1, True and 1.0, may get different results.
+    """
+    kwargs_items = tuple(sorted(kwargs.items()))
+    arg_types = (
+        tuple(type(arg) for arg in args),
+        tuple(type(value) for _, value in kwargs_items),
+    )
+    try:
+        key = (func_name, args, kwargs_items, arg_types)
+        hash(key)
+        return key
+    except TypeError:
+        pass
+
+    try:
+        # unhashable arguments, e.g. dict or list
+        return (
+            func_name,
+            json.dumps([args, kwargs], sort_keys=True, ensure_ascii=False),
+            arg_types,
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+class FunctionCache(object):
+    """memoized results of pure functions, grouped by scope.
+
+    Results are keyed by function namespace and typed arguments, entries expire after
+    ttl seconds if ttl > 0. The owner of each scope is responsible for clearing it,
+    e.g. runner clears step scope before each step and testcase scope before each
+    testcase, task scope lives as long as the cache instance.
+
+    Runs of one testcase in parallel, e.g. parameter rows or concurrent steps, use
+    forked caches, which share stores of outer scopes only. Memoized functions look
+    up results in the forked cache activated in current context.
+
+    Examples:
+        >>> cache = FunctionCache()
+        >>> sign = cache.memoize(gen_sign, scope=CACHE_SCOPE_TESTCASE, ttl=60)
+        >>> sign("a", "b")  # gen_sign is called
+        >>> sign("a", "b")  # cached result
+
+    """
+
+    def __init__(self) -> None:
+        self.__stores: Dict[Text, Dict] = {scope: {} for scope in CACHE_SCOPES}
+        self.__lock = threading.Lock()
+        self.__root = self
+        self.hits = 0
+        self.misses = 0
+
+    def fork(self, shared_scopes: Iterable[Text] = (CACHE_SCOPE_TASK,)) -> "FunctionCache":
+        """create cache sharing stores of shared_scopes with this one, stores of other
+        scopes are isolated, e.g. testcase scope of each parameter row"""
+        cache = FunctionCache()
+        cache.__root = self.__root
+        cache.__lock = self.__lock
+        for scope in shared_scopes:
+            cache.__stores[scope] = self.__stores[scope]
+        return cache
+
+    @contextmanager
+    def activate(self):
+        """use stores of this cache for functions memoized by it or the cache it is
+        forked from, in current context, e.g. thread of one parameter row"""
+        token = _active_cache.set(self)
+        try:
+            yield self
+        finally:
+            _active_cache.reset(token)
+
+    def __get_stores(self) -> Dict[Text, Dict]:
+        active = _active_cache.get()
+        if active is not None and active.__root is self.__root:
+            return active.__stores
+        return self.__stores
+
+    def memoize(
+        self,
+        func: Callable,
+        scope: Text = CACHE_SCOPE_TESTCASE,
+        ttl: float = 0,
+        namespace: Text = None,
+    ) -> Callable:
+        """wrap function to memoize results in given scope.
+
+        Results are keyed by namespace, which defaults to module and qualified name
+        of the function. Functions loaded from different sources may have the same
+        name, pass namespace to tell them apart, e.g. source id and code hash.
+        """
+        if scope not in CACHE_SCOPES:
+            logger.warning(
+                f"invalid cache scope {scope} for function {func.__name__}, "
+                f"use {CACHE_SCOPE_TESTCASE} instead"
+            )
+            scope = CACHE_SCOPE_TESTCASE
+
+        if namespace is None:
+            namespace = (
+                f"{getattr(func, '__module__', '')}."
+                f"{getattr(func, '__qualname__', repr(func))}"
+            )
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_cache_key(namespace, args, kwargs)
+            if key is None:
+                return func(*args, **kwargs)
+
+            store = self.__get_stores()[scope]
+            now = time.monotonic()
+            with self.__lock:
+                entry = store.get(key)
+                if entry is not None and (entry[1] is None or entry[1] > now):
+                    self.hits += 1
+                    return entry[0]
+
+            result = func(*args, **kwargs)
+            expire_at = now + ttl if ttl and ttl > 0 else None
+            with self.__lock:
+                self.misses += 1
+                store[key] = (result, expire_at)
+            return result
+
+        return wrapper
+
+    def clear(self, scope: Text = None) -> None:
+        """clear cached results of given scope, or all scopes if scope is None"""
+        with self.__lock:
+            for store_scope, store in self.__stores.items():
+                if scope is None or store_scope == scope:
+                    store.clear()
@@ -0,0 +1,108 @@
+import time
+import unittest
+
+from httprunner import parser
+from httprunner.memoize import (
+    CACHE_SCOPE_STEP,
+    CACHE_SCOPE_TASK,
+    CACHE_SCOPE_TESTCASE,
+    FunctionCache,
+)
+
+
+class TestFunctionCache(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def gen_sign(self, *args, **kwargs):
+        self.calls.append(args)
+        return f"sign-{'-'.join(str(arg) for arg in args)}"
+
+    def test_memoize(self):
+        cache = FunctionCache()
+        sign = cache.memoize(self.gen_sign)
+        self.assertEqual(sign("a", 1), "sign-a-1")
+        self.assertEqual(sign("a", 1), "sign-a-1")
+        self.assertEqual(sign("b", 1), "sign-b-1")
+        self.assertEqual(self.calls, [("a", 1), ("b", 1)])
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        # unhashable arguments
+        sign({"a": [1]})
+        sign({"a": [1]})
+        self.assertEqual(len(self.calls), 3)
+
+    def test_memoize_typed_arguments(self):
+        cache = FunctionCache()
+        sign = cache.memoize(self.gen_sign)
+        self.assertEqual(sign(1), "sign-1")
+        self.assertEqual(sign(True), "sign-True")
+        self.assertEqual(sign(1.0), "sign-1.0")
+        self.assertEqual(sign(x=[1]), sign(x=[1]))
+        sign(x=[True])
+        self.assertEqual(len(self.calls), 5)
+
+    def test_memoize_namespace(self):
+        cache = FunctionCache()
+        # functions of the same name loaded from different sources
+        sign_a = cache.memoize(lambda arg: f"a-{arg}", namespace="1:sign")
+        sign_b = cache.memoize(lambda arg: f"b-{arg}", namespace="2:sign")
+        self.assertEqual(sign_a("x"), "a-x")
+        self.assertEqual(sign_b("x"), "b-x")
+
+    def test_memoize_in_parse_string(self):
+        cache = FunctionCache()
+        functions_mapping = {"gen_sign": cache.memoize(self.gen_sign)}
+        for _ in range(3):
+            self.assertEqual(
+                parser.parse_data("${gen_sign($a)}", {"a": 1}, functions_mapping),
+                "sign-1",
+            )
+        self.assertEqual(self.calls, [(1,)])
+
+    def test_clear_scope(self):
+        cache = FunctionCache()
+        step_sign = cache.memoize(self.gen_sign, scope=CACHE_SCOPE_STEP)
+        case_sign = cache.memoize(self.gen_sign, scope=CACHE_SCOPE_TESTCASE)
+        task_sign = cache.memoize(self.gen_sign, scope=CACHE_SCOPE_TASK)
+        for func in (step_sign, case_sign, task_sign):
+            func("x")
+        self.assertEqual(len(self.calls), 3)
+
+        cache.clear(CACHE_SCOPE_STEP)
+        for func in (step_sign, case_sign, task_sign):
+            func("x")
+        self.assertEqual(len(self.calls), 4)
+
+        cache.clear()
+        task_sign("x")
+        self.assertEqual(len(self.calls), 5)
+
+    def test_ttl(self):
+        cache = FunctionCache()
+        sign = cache.memoize(self.gen_sign, ttl=0.05)
+        sign("x")
+        sign("x")
+        self.assertEqual(len(self.calls), 1)
+        time.sleep(0.06)
+        sign("x")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_fork(self):
+        cache = FunctionCache()
+        case_sign = cache.memoize(self.gen_sign, scope=CACHE_SCOPE_TESTCASE)
+        task_sign = cache.memoize(self.gen_sign, scope=CACHE_SCOPE_TASK)
+        case_sign("x")
+        task_sign("y")
+
+        forked = cache.fork()
+        with forked.activate():
+            # testcase scope is isolated, task scope is shared
+            case_sign("x")
+            task_sign("y")
+            self.assertEqual(len(self.calls), 3)
+            forked.clear(CACHE_SCOPE_TESTCASE)
+
+        # parent stores are used again once forked cache is deactivated
+        case_sign("x")
+        self.assertEqual(len(self.calls), 3)
@@ -1,8 +1,10 @@
+import asyncio
+import contextvars
 import os
 from enum import Enum
 from typing import Any, Callable, Dict, List, Text, Union
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, PrivateAttr
 
 Name = Text
 Url = Text
@@ -103,6 +105,7 @@ class SqlMethodEnum(Text, Enum):
     INSERT = "INSERT"
     UPDATE = "UPDATE"
     DELETE = "DELETE"
+    AGGREGATE = "AGGREGATE"
 
 
 class TSqlRequest(BaseModel):
@@ -111,7 +114,16 @@ class TSqlRequest(BaseModel):
     db_config: TConfigDB = TConfigDB()
     method: SqlMethodEnum = None
     sql: Text = None
-    size: int = 0  # limit nums of sql result
+    size: int = 0  # limit nums of sql result, or preview rows of aggregate result
+    # max rows of fetchall and aggregate, fetched with server-side cursor,
+    # 0 means DEFAULT_MAX_ROWS of database.stream for fetchall, unlimited for aggregate
+    max_rows: int = 0
+    chunk_size: int = 1000  # rows per round trip of server-side cursor
+    # columns decoded as json besides columns declared as JSON type
+    json_columns: List[Text] = []
+    # named bind parameters of sql, e.g. `:user_id`, list of dicts to executemany,
+    # or variable reference like "$rows"
+    params: Union[Dict[Text, Any], List[Dict[Text, Any]], Text] = {}
 
 
 class TConfig(BaseModel):
@@ -125,6 +137,8 @@ class TConfig(BaseModel):
     # teardown_hooks: Hooks = []
     export: Export = []
     path: Text = None
+    # max number of independent steps running concurrently, 0 or 1 to run in order
+    step_concurrency: int = 0
     # configs for other protocols
     thrift: TConfigThrift = None
     db: TConfigDB = TConfigDB()
@@ -163,6 +177,8 @@ class TStep(BaseModel):
     retry_interval: int = 0  # sec
     thrift_request: Union[TThriftRequest, None] = None
     sql_request: Union[TSqlRequest, None] = None
+    # compiled request templates, built once on first run
+    _templates: Dict[Text, Any] = PrivateAttr(default_factory=dict)
 
 
 class TestCase(BaseModel):
@@ -198,9 +214,23 @@ class TestCaseInOut(BaseModel):
 
 
 class RequestStat(BaseModel):
+    # status code of final response, recorded even if req_resps are not
+    status_code: int = 0
     content_size: float = 0
     response_time_ms: float = 0
     elapsed_ms: float = 0
+    # connection phases, zero if connection is reused
+    dns_ms: float = 0
+    tcp_ms: float = 0
+    tls_ms: float = 0
+    # request sent to response headers received, excluding connection phases
+    ttfb_ms: float = 0
+    download_ms: float = 0
+    # time spent by runner
+    parse_ms: float = 0
+    hooks_ms: float = 0
+    extract_ms: float = 0
+    validate_ms: float = 0
 
 
 class AddressData(BaseModel):
@@ -274,6 +304,13 @@ class IStep(object):
         # runner: HttpRunner
         raise NotImplementedError
 
+    async def async_run(self, runner) -> StepResult:
+        # blocking steps run in default executor, request steps send requests with asyncio
+        # context is copied, thus logs are kept in run log of testcase by case_id
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(None, context.run, self.run, runner)
+
 
 class TestCaseSummary(BaseModel):
     name: Text
@@ -1,8 +1,10 @@
 import ast
 import builtins
+import functools
 import os
 import re
-from typing import Any, Callable, Dict, List, Set, Text
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Text
 from urllib.parse import urlparse
 
 from loguru import logger
@@ -164,7 +166,9 @@ def extract_variables(content: Any) -> Set:
         return variables
 
     elif isinstance(content, str):
-        return set(regex_findall_variables(content))
+        if "$" not in content:
+            return set()
+        return set(compile_template(content).variables)
 
     return set()
 
@@ -261,10 +265,28 @@ def get_mapping_function(
         exceptions.FunctionNotFound: function is neither defined in debugtalk.py nor builtin.
 
     """
-    if function_name in functions_mapping:
+    if functions_mapping and function_name in functions_mapping:
         return functions_mapping[function_name]
 
-    elif function_name in ["parameterize", "P"]:
+    func = get_builtin_function(function_name)
+    if func is None:
+        raise exceptions.FunctionNotFound(f"{function_name} is not found.")
+
+    return func
+
+
+@functools.lru_cache(maxsize=None)
+def get_builtin_function(function_name: Text) -> Callable:
+    """get function which is not defined in project functions mapping, including
+        uploader extensions, HttpRunner builtin comparators/functions and Python builtins.
+
+    These functions never change at runtime, thus the result is cached once resolved.
+
+    Returns:
+        mapping function object, or None if function is not found.
+
+    """
+    if function_name in ["parameterize", "P"]:
         return loader.load_csv_file
 
     elif function_name in ["environ", "ENV"]:
@@ -276,62 +298,82 @@ def get_mapping_function(
 
         return getattr(uploader, function_name)
 
-    try:
-        # check if HttpRunner builtin functions
-        built_in_functions = loader.load_builtin_functions()
+    # check if HttpRunner builtin functions
+    built_in_functions = loader.load_builtin_functions()
+    if function_name in built_in_functions:
         return built_in_functions[function_name]
-    except KeyError:
-        pass
 
-    try:
-        # check if Python builtin functions
-        return getattr(builtins, function_name)
-    except AttributeError:
-        pass
+    # check if Python builtin functions
+    return getattr(builtins, function_name, None)
 
-    raise exceptions.FunctionNotFound(f"{function_name} is not found.")
 
+# literal text, e.g. "abc" in "abc$var"
+SEGMENT_LITERAL = "literal"
+# variable reference, e.g. $var or ${var}
+SEGMENT_VARIABLE = "variable"
+# function call, e.g. ${func($a, b=1)}
+SEGMENT_FUNCTION = "function"
 
-def parse_string(
-    raw_string: Text,
-    variables_mapping: VariablesMapping,
-    functions_mapping: FunctionsMapping,
-) -> Any:
-    """parse string content with variables and functions mapping.
+# max number of distinct raw strings kept in compiled template cache
+TEMPLATE_CACHE_SIZE = 4096
 
-    Args:
-        raw_string: raw string content to be parsed.
-        variables_mapping: variables mapping.
-        functions_mapping: functions mapping.
 
-    Returns:
-        str: parsed string content.
+class CompiledTemplate(object):
+    """raw string tokenized once into literal/variable/function segments.
+
+    segments are tuples in the following formats:
+        (SEGMENT_LITERAL, text)
+        (SEGMENT_VARIABLE, var_name)
+        (SEGMENT_FUNCTION, func_name, func_params_str, function_meta)
+
+    function_meta is the pre-parsed result of parse_function_params,
+    it is None if params can not be parsed and will be parsed again when rendering.
+    """
+
+    __slots__ = ("raw_string", "segments", "variables", "functions", "is_single_ref")
+
+    def __init__(self, raw_string: Text, segments: List[tuple], variables: Set):
+        self.raw_string = raw_string
+        self.segments = tuple(segments)
+        self.variables = frozenset(variables)
+        self.functions = frozenset(
+            segment[1] for segment in self.segments if segment[0] == SEGMENT_FUNCTION
+        )
+        # raw string is exactly one variable or one function call, e.g. "$var" or "${func()}"
+        self.is_single_ref = (
+            len(self.segments) == 1 and self.segments[0][0] != SEGMENT_LITERAL
+        )
+
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(raw_string: Text) -> CompiledTemplate:
+    """tokenize raw string into CompiledTemplate, the result is cached with LRU eviction.
 
     Examples:
-        >>> raw_string = "abc${add_one($num)}def"
-        >>> variables_mapping = {"num": 3}
-        >>> functions_mapping = {"add_one": lambda x: x + 1}
-        >>> parse_string(raw_string, variables_mapping, functions_mapping)
-            "abc4def"
+        >>> compile_template("abc${add_one($num)}def$$").segments
+        (
+            ("literal", "abc"),
+            ("function", "add_one", "$num", {"args": ["$num"], "kwargs": {}}),
+            ("literal", "def$"),
+        )
 
     """
-    # 当原始字符串为None时，直接返回None
-    if raw_string is None:
-        return None
-        
-    # 确保我们处理的是字符串
-    if not isinstance(raw_string, str):
-        try:
-            raw_string = str(raw_string)
-        except Exception:
-            return raw_string
+    segments = []
+    variables = set()
+    literal_parts = []
+
+    def flush_literal():
+        literal = "".join(literal_parts)
+        if literal:
+            segments.append((SEGMENT_LITERAL, literal))
+        literal_parts.clear()
 
     try:
         match_start_position = raw_string.index("$", 0)
-        parsed_string = raw_string[0:match_start_position]
+        literal_parts.append(raw_string[0:match_start_position])
     except ValueError:
-        parsed_string = raw_string
-        return parsed_string
+        match_start_position = len(raw_string)
+        literal_parts.append(raw_string)
 
     while match_start_position < len(raw_string):
 
@@ -342,76 +384,33 @@ def parse_string(
         dollar_match = dolloar_regex_compile.match(raw_string, match_start_position)
         if dollar_match:
             match_start_position = dollar_match.end()
-            parsed_string += "$"
+            literal_parts.append("$")
             continue
 
         # search function like ${func($a, $b)}
         func_match = function_regex_compile.match(raw_string, match_start_position)
         if func_match:
-            func_name = func_match.group(1)
+            func_name, func_params_str = func_match.group(1), func_match.group(2)
             try:
-                func = get_mapping_function(func_name, functions_mapping)
-
-                func_params_str = func_match.group(2)
                 function_meta = parse_function_params(func_params_str)
-                args = function_meta["args"]
-                kwargs = function_meta["kwargs"]
-                parsed_args = parse_data(args, variables_mapping, functions_mapping)
-                parsed_kwargs = parse_data(kwargs, variables_mapping, functions_mapping)
-
-                try:
-                    func_eval_value = func(*parsed_args, **parsed_kwargs)
-                except Exception as ex:
-                    logger.error(
-                        f"call function error:\n"
-                        f"func_name: {func_name}\n"
-                        f"args: {parsed_args}\n"
-                        f"kwargs: {parsed_kwargs}\n"
-                        f"{type(ex).__name__}: {ex}"
-                    )
-                    # 增强健壮性：函数调用失败时返回原始函数调用字符串
-                    func_raw_str = "${" + func_name + f"({func_params_str})" + "}"
-                    parsed_string += func_raw_str
-                    match_start_position = func_match.end()
-                    continue
-
-                func_raw_str = "${" + func_name + f"({func_params_str})" + "}"
-                if func_raw_str == raw_string:
-                    # raw_string is a function, e.g. "${add_one(3)}", return its eval value directly
-                    return func_eval_value
-
-                # raw_string contains one or many functions, e.g. "abc${add_one(3)}def"
-                parsed_string += str(func_eval_value)
-                match_start_position = func_match.end()
-            except exceptions.FunctionNotFound:
-                # 增强健壮性：函数不存在时，保留原始函数调用字符串
-                logger.warning(f"函数 '{func_name}' 不存在，将保留原始函数调用")
-                func_raw_str = "${" + func_name + f"({func_match.group(2)})" + "}"
-                parsed_string += func_raw_str
-                match_start_position = func_match.end()
+            except ValueError:
+                # e.g. ${func(a=b=c)}, raise when the function is actually called
+                function_meta = None
+            flush_literal()
+            segments.append(
+                (SEGMENT_FUNCTION, func_name, func_params_str, function_meta)
+            )
+            variables.update(regex_findall_variables(func_params_str))
+            match_start_position = func_match.end()
             continue
 
         # search variable like ${var} or $var
         var_match = variable_regex_compile.match(raw_string, match_start_position)
         if var_match:
             var_name = var_match.group(1) or var_match.group(2)
-            try:
-                var_value = get_mapping_variable(var_name, variables_mapping)
-
-                if f"${var_name}" == raw_string or "${" + var_name + "}" == raw_string:
-                    # raw_string is a variable, $var or ${var}, return its value directly
-                    return var_value
-
-                # raw_string contains one or many variables, e.g. "abc${var}def"
-                parsed_string += str(var_value)
-            except exceptions.VariableNotFound:
-                # 增强健壮性：变量不存在时，保留原始变量引用字符串
-                logger.warning(f"变量 '{var_name}' 不存在，将保留原始变量引用")
-                if var_match.group(1):  # ${var} 格式
-                    parsed_string += "${" + var_name + "}"
-                else:  # $var 格式
-                    parsed_string += "$" + var_name
-            
+            flush_literal()
+            segments.append((SEGMENT_VARIABLE, var_name))
+            variables.add(var_name)
             match_start_position = var_match.end()
             continue
 
@@ -419,15 +418,129 @@ def parse_string(
         try:
             # find next $ location
             match_start_position = raw_string.index("$", curr_position + 1)
-            remain_string = raw_string[curr_position:match_start_position]
+            literal_parts.append(raw_string[curr_position:match_start_position])
         except ValueError:
-            remain_string = raw_string[curr_position:]
+            literal_parts.append(raw_string[curr_position:])
             # break while loop
             match_start_position = len(raw_string)
 
-        parsed_string += remain_string
+    flush_literal()
+    return CompiledTemplate(raw_string, segments, variables)
+
 
-    return parsed_string
+def _render_function_segment(
+    segment: tuple,
+    variables_mapping: VariablesMapping,
+    functions_mapping: FunctionsMapping,
+) -> Any:
+    """call function segment, return raw function string if it fails."""
+    _, func_name, func_params_str, function_meta = segment
+    func_raw_str = "${" + func_name + f"({func_params_str})" + "}"
+    try:
+        func = get_mapping_function(func_name, functions_mapping)
+    except exceptions.FunctionNotFound:
+        # 增强健壮性：函数不存在时，保留原始函数调用字符串
+        logger.warning(f"函数 '{func_name}' 不存在，将保留原始函数调用")
+        return func_raw_str
+
+    if function_meta is None:
+        function_meta = parse_function_params(func_params_str)
+
+    parsed_args = parse_data(
+        function_meta["args"], variables_mapping, functions_mapping
+    )
+    parsed_kwargs = parse_data(
+        function_meta["kwargs"], variables_mapping, functions_mapping
+    )
+
+    try:
+        return func(*parsed_args, **parsed_kwargs)
+    except Exception as ex:
+        logger.error(
+            f"call function error:\n"
+            f"func_name: {func_name}\n"
+            f"args: {parsed_args}\n"
+            f"kwargs: {parsed_kwargs}\n"
+            f"{type(ex).__name__}: {ex}"
+        )
+        # 增强健壮性：函数调用失败时返回原始函数调用字符串
+        return func_raw_str
+
+
+def render_template(
+    template: CompiledTemplate,
+    variables_mapping: VariablesMapping,
+    functions_mapping: FunctionsMapping,
+) -> Any:
+    """render compiled template with variables and functions mapping."""
+    if template.is_single_ref:
+        # raw_string is a variable or a function, e.g. "$var" or "${add_one(3)}"
+        # return its value directly
+        segment = template.segments[0]
+        if segment[0] == SEGMENT_VARIABLE:
+            return get_mapping_variable(segment[1], variables_mapping)
+        return _render_function_segment(segment, variables_mapping, functions_mapping)
+
+    # raw_string contains literals and one or many variables/functions,
+    # e.g. "abc${add_one(3)}def$var"
+    parts = []
+    for segment in template.segments:
+        segment_type = segment[0]
+        if segment_type == SEGMENT_LITERAL:
+            parts.append(segment[1])
+        elif segment_type == SEGMENT_VARIABLE:
+            parts.append(str(get_mapping_variable(segment[1], variables_mapping)))
+        else:
+            parts.append(
+                str(
+                    _render_function_segment(
+                        segment, variables_mapping, functions_mapping
+                    )
+                )
+            )
+
+    return "".join(parts)
+
+
+def parse_string(
+    raw_string: Text,
+    variables_mapping: VariablesMapping,
+    functions_mapping: FunctionsMapping,
+) -> Any:
+    """parse string content with variables and functions mapping.
+
+    Args:
+        raw_string: raw string content to be parsed.
+        variables_mapping: variables mapping.
+        functions_mapping: functions mapping.
+
+    Returns:
+        str: parsed string content.
+
+    Examples:
+        >>> raw_string = "abc${add_one($num)}def"
+        >>> variables_mapping = {"num": 3}
+        >>> functions_mapping = {"add_one": lambda x: x + 1}
+        >>> parse_string(raw_string, variables_mapping, functions_mapping)
+            "abc4def"
+
+    """
+    # 当原始字符串为None时，直接返回None
+    if raw_string is None:
+        return None
+        
+    # 确保我们处理的是字符串
+    if not isinstance(raw_string, str):
+        try:
+            raw_string = str(raw_string)
+        except Exception:
+            return raw_string
+
+    if "$" not in raw_string:
+        return raw_string
+
+    template = compile_template(raw_string)
+    return render_template(template, variables_mapping, functions_mapping)
 
 
 def parse_data(
@@ -465,21 +578,232 @@ def parse_data(
         return raw_data
 
 
-def parse_variables_mapping(
-    variables_mapping: VariablesMapping, functions_mapping: FunctionsMapping = None
-) -> VariablesMapping:
+# compiled data node, static subtree without any variable or function
+NODE_STATIC = "static"
+# compiled data node, string with variables or functions
+NODE_STRING = "string"
+# compiled data node, list containing dynamic items
+NODE_LIST = "list"
+# compiled data node, dict containing dynamic keys or values
+NODE_DICT = "dict"
+
+
+class DataTemplate(object):
+    """raw data compiled once into static and dynamic nodes, e.g. request dict of a step.
+
+    Subtrees without `$` are converted once the same way parse_data does (strings
+    stripped, tuples and sets to lists), then reused by reference on each render.
+    Only dynamic paths are walked and rendered again. The root container is always
+    a new object, thus callers can add or pop top-level keys safely, but nested
+    static subtrees are shared and should not be modified.
+
+    Examples:
+        >>> template = DataTemplate({"url": "/api/$uid", "json": big_fixture})
+        >>> template.render({"uid": 1}, {})
+            {"url": "/api/1", "json": big_fixture}  # big_fixture is not walked
+
+    """
+
+    __slots__ = ("raw_data", "node")
+
+    def __init__(self, raw_data: Any) -> None:
+        self.raw_data = raw_data
+        self.node = self.__compile(raw_data)
+
+    @property
+    def is_static(self) -> bool:
+        return self.node[0] == NODE_STATIC
+
+    def __compile(self, raw_data: Any) -> tuple:
+        if isinstance(raw_data, str):
+            # keep consistent with parse_data
+            raw_data = raw_data.strip(" \t")
+            if "$" in raw_data:
+                return (NODE_STRING, raw_data)
+            return (NODE_STATIC, raw_data)
+
+        elif isinstance(raw_data, (list, set, tuple)):
+            nodes = [self.__compile(item) for item in raw_data]
+            if all(node[0] == NODE_STATIC for node in nodes):
+                return (NODE_STATIC, [node[1] for node in nodes])
+            return (NODE_LIST, nodes)
+
+        elif isinstance(raw_data, dict):
+            nodes = [
+                (self.__compile(key), self.__compile(value))
+                for key, value in raw_data.items()
+            ]
+            if all(
+                key_node[0] == NODE_STATIC and value_node[0] == NODE_STATIC
+                for key_node, value_node in nodes
+            ):
+                return (NODE_STATIC, {key[1]: value[1] for key, value in nodes})
+            return (NODE_DICT, nodes)
+
+        else:
+            return (NODE_STATIC, raw_data)
+
+    def __render(
+        self,
+        node: tuple,
+        variables_mapping: VariablesMapping,
+        functions_mapping: FunctionsMapping,
+    ) -> Any:
+        node_type, content = node
+        if node_type == NODE_STATIC:
+            return content
+
+        elif node_type == NODE_STRING:
+            return parse_string(content, variables_mapping, functions_mapping)
+
+        elif node_type == NODE_LIST:
+            return [
+                self.__render(item, variables_mapping, functions_mapping)
+                for item in content
+            ]
+
+        else:
+            return {
+                self.__render(key, variables_mapping, functions_mapping): self.__render(
+                    value, variables_mapping, functions_mapping
+                )
+                for key, value in content
+            }
+
+    def render(
+        self,
+        variables_mapping: VariablesMapping = None,
+        functions_mapping: FunctionsMapping = None,
+    ) -> Any:
+        variables_mapping = variables_mapping or {}
+        functions_mapping = functions_mapping or {}
+        node_type, content = self.node
+        if node_type == NODE_STATIC:
+            # root container is always a new object
+            if isinstance(content, dict):
+                return dict(content)
+            elif isinstance(content, list):
+                return list(content)
+            return content
+
+        return self.__render(self.node, variables_mapping, functions_mapping)
+
+
+def extract_functions(content: Any) -> Set:
+    """extract all function names called in content recursively."""
+    if isinstance(content, (list, set, tuple)):
+        functions = set()
+        for item in content:
+            functions = functions | extract_functions(item)
+        return functions
+
+    elif isinstance(content, dict):
+        functions = set()
+        for value in content.values():
+            functions = functions | extract_functions(value)
+        return functions
+
+    elif isinstance(content, str):
+        if "$" not in content:
+            return set()
+        return set(compile_template(content).functions)
+
+    return set()
 
-    parsed_variables: VariablesMapping = {}
 
-    while len(parsed_variables) != len(variables_mapping):
-        for var_name in variables_mapping:
+def sort_variables_graph(graph: Dict[Text, Set]) -> List[Text]:
+    """sort variables in topological order, referenced variables come first.
 
-            if var_name in parsed_variables:
+    Args:
+        graph: variable name => names of variables referenced by it
+
+    Returns:
+        list: variable names in evaluation order
+
+    Raises:
+        exceptions.VariableNotFound: circular reference detected.
+
+    Examples:
+        >>> sort_variables_graph({"varA": {"varB"}, "varB": {"varC"}, "varC": set()})
+        ["varC", "varB", "varA"]
+
+    """
+    order = []
+    # 1: visiting, 2: visited
+    state = {}
+    for root in graph:
+        if root in state:
+            continue
+
+        state[root] = 1
+        path = [root]
+        stack = [iter(sorted(graph[root]))]
+        while stack:
+            dep = next(stack[-1], None)
+            if dep is None:
+                stack.pop()
+                var_name = path.pop()
+                state[var_name] = 2
+                order.append(var_name)
+            elif dep not in graph or state.get(dep) == 2:
                 continue
+            elif state.get(dep) == 1:
+                cycle = path[path.index(dep) :] + [dep]
+                raise exceptions.VariableNotFound(
+                    f"circular reference in variables: {' -> '.join(cycle)}"
+                )
+            else:
+                state[dep] = 1
+                path.append(dep)
+                stack.append(iter(sorted(graph[dep])))
+
+    return order
 
-            var_value = variables_mapping[var_name]
-            variables = extract_variables(var_value)
 
+def _is_same_raw_value(value: Any, other: Any) -> bool:
+    if value is other:
+        return True
+    return (
+        type(value) is type(other)
+        and isinstance(value, (str, int, float, bool))
+        and value == other
+    )
+
+
+class VariablesResolver(object):
+    """resolve variables mapping in topological order.
+
+    The dependency graph, evaluation order and evaluated values are kept between calls,
+    so resolving a mapping again only re-evaluates variables whose raw value changed,
+    variables calling functions (e.g. ${gen_random_string(5)}) or evaluated to mutable
+    values, and all variables referencing them.
+    """
+
+    def __init__(self) -> None:
+        self.__raw_variables: VariablesMapping = {}
+        self.__graph: Dict[Text, Set] = {}
+        self.__order: List[Text] = []
+        self.__parsed_variables: VariablesMapping = {}
+        # variables should be evaluated on every call
+        self.__volatile: Set = set()
+
+    def resolve(
+        self,
+        variables_mapping: VariablesMapping,
+        functions_mapping: FunctionsMapping = None,
+    ) -> VariablesMapping:
+        changed = set()
+        graph = {}
+        for var_name, var_value in variables_mapping.items():
+            if var_name in self.__raw_variables and _is_same_raw_value(
+                var_value, self.__raw_variables[var_name]
+            ):
+                graph[var_name] = self.__graph[var_name]
+            else:
+                graph[var_name] = extract_variables(var_value)
+                changed.add(var_name)
+
+        for var_name, variables in graph.items():
             # check if reference variable itself
             if var_name in variables:
                 # e.g.
@@ -496,16 +820,158 @@ def parse_variables_mapping(
                 # e.g. {"varC": "${sum_two($a, $b)}"}
                 raise exceptions.VariableNotFound(not_defined_variables)
 
-            try:
-                parsed_value = parse_data(
-                    var_value, parsed_variables, functions_mapping
-                )
-            except exceptions.VariableNotFound:
+        if changed or len(graph) != len(self.__graph):
+            order = sort_variables_graph(graph)
+        else:
+            order = self.__order
+
+        dirty = changed | self.__volatile
+        parsed_variables: VariablesMapping = {}
+        volatile = set()
+        for var_name in order:
+            if (
+                var_name not in dirty
+                and var_name in self.__parsed_variables
+                and not graph[var_name] & dirty
+            ):
+                parsed_variables[var_name] = self.__parsed_variables[var_name]
                 continue
 
+            var_value = variables_mapping[var_name]
+            parsed_value = parse_data(var_value, parsed_variables, functions_mapping)
             parsed_variables[var_name] = parsed_value
 
-    return parsed_variables
+            dirty.add(var_name)
+            if extract_functions(var_value) or not isinstance(
+                parsed_value, (str, int, float, bool, type(None))
+            ):
+                volatile.add(var_name)
+
+        self.__raw_variables = dict(variables_mapping)
+        self.__graph = graph
+        self.__order = order
+        self.__parsed_variables = parsed_variables
+        self.__volatile = volatile
+
+        return {var_name: parsed_variables[var_name] for var_name in variables_mapping}
+
+
+def parse_variables_mapping(
+    variables_mapping: VariablesMapping, functions_mapping: FunctionsMapping = None
+) -> VariablesMapping:
+    """parse variables mapping in topological order of variable references.
+
+    Raises:
+        exceptions.VariableNotFound: variable references itself, references undefined
+            variable, or variables reference each other circularly.
+
+    """
+    return VariablesResolver().resolve(variables_mapping, functions_mapping)
+
+
+class LazyVariablesMapping(MutableMapping):
+    """variables mapping evaluated on demand.
+
+    Raw variables are parsed only when they are referenced for the first time,
+    and the evaluated value is memoized for the lifetime of the mapping (one step).
+    Values assigned with `mapping[key] = value` are treated as evaluated values,
+    e.g. request, response and variables assigned by hooks.
+
+    The raw variables mapping is never copied nor modified, evaluated and assigned
+    values are kept in the top layer of the mapping, so it can wrap a layered
+    utils.VariablesScope shared with the runner.
+
+    Examples:
+        >>> variables = LazyVariablesMapping(
+                {"a": "$b", "b": "${gen_random_string(5)}", "c": "${sleep(10)}"},
+                functions_mapping,
+            )
+        >>> parse_data("/api/$a", variables)  # gen_random_string is called once, sleep never
+
+    """
+
+    def __init__(
+        self,
+        variables_mapping: VariablesMapping,
+        functions_mapping: FunctionsMapping = None,
+    ) -> None:
+        self.__raw_variables: VariablesMapping = variables_mapping
+        self.__parsed_variables: VariablesMapping = {}
+        self.__deleted: Set = set()
+        self.__evaluating: List[Text] = []
+        self.__functions_mapping = functions_mapping
+
+    def __getitem__(self, var_name: Text) -> Any:
+        if var_name in self.__parsed_variables:
+            return self.__parsed_variables[var_name]
+
+        if var_name in self.__deleted:
+            raise KeyError(var_name)
+
+        var_value = self.__raw_variables[var_name]
+        if var_name in self.__evaluating:
+            cycle = self.__evaluating[self.__evaluating.index(var_name) :] + [var_name]
+            raise exceptions.VariableNotFound(
+                f"circular reference in variables: {' -> '.join(cycle)}"
+            )
+
+        variables = extract_variables(var_value)
+        # check if reference variable itself
+        if var_name in variables:
+            raise exceptions.VariableNotFound(var_name)
+
+        # check if reference variable not in variables mapping
+        not_defined_variables = [v_name for v_name in variables if v_name not in self]
+        if not_defined_variables:
+            raise exceptions.VariableNotFound(not_defined_variables)
+
+        self.__evaluating.append(var_name)
+        try:
+            parsed_value = parse_data(var_value, self, self.__functions_mapping)
+        finally:
+            self.__evaluating.pop()
+
+        self.__parsed_variables[var_name] = parsed_value
+        return parsed_value
+
+    def __setitem__(self, var_name: Text, value: Any) -> None:
+        self.__deleted.discard(var_name)
+        self.__parsed_variables[var_name] = value
+
+    def __delitem__(self, var_name: Text) -> None:
+        if var_name not in self:
+            raise KeyError(var_name)
+        self.__parsed_variables.pop(var_name, None)
+        if var_name in self.__raw_variables:
+            self.__deleted.add(var_name)
+
+    def __contains__(self, var_name: Any) -> bool:
+        if var_name in self.__parsed_variables:
+            return True
+        return var_name in self.__raw_variables and var_name not in self.__deleted
+
+    def __iter__(self):
+        for var_name in self.__raw_variables:
+            if var_name not in self.__deleted:
+                yield var_name
+        for var_name in self.__parsed_variables:
+            if var_name not in self.__raw_variables:
+                yield var_name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> Text:
+        pending = [v for v in self if v not in self.__parsed_variables]
+        return (
+            f"{type(self).__name__}"
+            f"(evaluated={self.__parsed_variables}, pending={pending})"
+        )
+
+    @property
+    def evaluated(self) -> VariablesMapping:
+        """variables which have already been evaluated"""
+        return dict(self.__parsed_variables)
 
 
 def parse_parameters(
@@ -532,94 +998,169 @@ def parse_parameters(
         >>> parse_parameters(parameters)
 
     """
-    parsed_parameters_list: List[List[Dict]] = []
-
-    # load project_meta functions
-    project_meta = loader.load_project_meta(os.getcwd())
-    functions_mapping = project_meta.functions
-
-    for parameter_name, parameter_content in parameters.items():
-        parameter_name_list = parameter_name.split("-")
-
-        if isinstance(parameter_content, List):
-            # (1) data list
-            # e.g. {"app_version": ["2.8.5", "2.8.6"]}
-            #       => [{"app_version": "2.8.5", "app_version": "2.8.6"}]
-            # e.g. {"username-password": [["user1", "111111"], ["test2", "222222"]}
-            #       => [{"username": "user1", "password": "111111"}, {"username": "user2", "password": "222222"}]
-            parameter_content_list: List[Dict] = []
-            for parameter_item in parameter_content:
-                if not isinstance(parameter_item, (list, tuple)):
-                    # "2.8.5" => ["2.8.5"]
-                    parameter_item = [parameter_item]
-
-                # ["app_version"], ["2.8.5"] => {"app_version": "2.8.5"}
-                # ["username", "password"], ["user1", "111111"] => {"username": "user1", "password": "111111"}
-                parameter_content_dict = dict(zip(parameter_name_list, parameter_item))
-                parameter_content_list.append(parameter_content_dict)
-
-        elif isinstance(parameter_content, Text):
-            # (2) & (3)
-            parsed_parameter_content: List = parse_data(
-                parameter_content, {}, functions_mapping
+    return list(iter_parameters(parameters))
+
+
+def iter_parameters(
+    parameters: Dict,
+    shard_index: int = 0,
+    shard_count: int = 1,
+    functions_mapping: FunctionsMapping = None,
+) -> Iterator[Dict]:
+    """parse parameters and generate cartesian product lazily.
+
+    Same as parse_parameters, but csv files referenced by parameterize are streamed
+    from disk, and product items are generated one by one when consumed.
+    The first parameter is streamed, others are loaded into memory, so the largest
+    parameter (e.g. csv file with thousands of rows) should be put first.
+
+    Args:
+        parameters (Dict): parameter name and value mapping, see parse_parameters
+        shard_index (int): index of current shard, starts from 0
+        shard_count (int): total number of shards, e.g. number of workers
+        functions_mapping (dict): functions used in parameters,
+            default to functions in debugtalk.py of current project
+
+    Returns:
+        iterator of parameters in current shard
+
+    Examples:
+        >>> for param in iter_parameters(parameters, shard_index=1, shard_count=4):
+        ...     run_testcase(param)  # run 1/4 of parameters in worker 1
+
+    """
+    if not parameters:
+        return iter([])
+
+    if functions_mapping is None:
+        # load project_meta functions
+        project_meta = loader.load_project_meta(os.getcwd())
+        functions_mapping = project_meta.functions
+
+    parsed_parameters_list = [
+        _iter_parameter_content(parameter_name, parameter_content, functions_mapping)
+        for parameter_name, parameter_content in parameters.items()
+    ]
+    return utils.iter_cartesian_product(
+        *parsed_parameters_list, shard_index=shard_index, shard_count=shard_count
+    )
+
+
+def _load_parameter_content(
+    parameter_content: Text, functions_mapping: FunctionsMapping
+) -> Iterable:
+    """load parameter content by calling function, csv file is streamed"""
+    template = compile_template(parameter_content.strip(" \t"))
+    if template.is_single_ref and template.segments[0][0] == SEGMENT_FUNCTION:
+        _, func_name, _, function_meta = template.segments[0]
+        if (
+            func_name in ["parameterize", "P"]
+            and func_name not in functions_mapping
+            and function_meta is not None
+        ):
+            args = parse_data(function_meta["args"], {}, functions_mapping)
+            kwargs = parse_data(function_meta["kwargs"], {}, functions_mapping)
+            return loader.iter_csv_file(*args, **kwargs)
+
+    return parse_data(parameter_content, {}, functions_mapping)
+
+
+def _iter_parameter_content(
+    parameter_name: Text, parameter_content: Any, functions_mapping: FunctionsMapping
+) -> Iterator[Dict]:
+    """generate parameter dicts for one parameter,
+    e.g. "username-password" => {"username": "user1", "password": "111111"}"""
+    parameter_name_list = parameter_name.split("-")
+
+    if isinstance(parameter_content, List):
+        # (1) data list
+        # e.g. {"app_version": ["2.8.5", "2.8.6"]}
+        #       => [{"app_version": "2.8.5", "app_version": "2.8.6"}]
+        # e.g. {"username-password": [["user1", "111111"], ["test2", "222222"]}
+        #       => [{"username": "user1", "password": "111111"}, {"username": "user2", "password": "222222"}]
+        for parameter_item in parameter_content:
+            if not isinstance(parameter_item, (list, tuple)):
+                # "2.8.5" => ["2.8.5"]
+                parameter_item = [parameter_item]
+
+            # ["app_version"], ["2.8.5"] => {"app_version": "2.8.5"}
+            # ["username", "password"], ["user1", "111111"] => {"username": "user1", "password": "111111"}
+            yield dict(zip(parameter_name_list, parameter_item))
+
+    elif isinstance(parameter_content, Text):
+        # (2) & (3)
+        parsed_parameter_content = _load_parameter_content(
+            parameter_content, functions_mapping
+        )
+        if not isinstance(parsed_parameter_content, (List, Iterator)):
+            raise exceptions.ParamsError(
+                f"parameters content should be in List type, got {parsed_parameter_content} for {parameter_content}"
             )
-            if not isinstance(parsed_parameter_content, List):
-                raise exceptions.ParamsError(
-                    f"parameters content should be in List type, got {parsed_parameter_content} for {parameter_content}"
-                )
 
-            parameter_content_list: List[Dict] = []
-            for parameter_item in parsed_parameter_content:
-                if isinstance(parameter_item, Dict):
-                    # get subset by parameter name
-                    # {"app_version": "${gen_app_version()}"}
-                    # gen_app_version() => [{'app_version': '2.8.5'}, {'app_version': '2.8.6'}]
+        for parameter_item in parsed_parameter_content:
+            if isinstance(parameter_item, Dict):
+                # get subset by parameter name
+                # {"app_version": "${gen_app_version()}"}
+                # gen_app_version() => [{'app_version': '2.8.5'}, {'app_version': '2.8.6'}]
+                # {"username-password": "${get_account()}"}
+                # get_account() => [
+                #       {"username": "user1", "password": "111111"},
+                #       {"username": "user2", "password": "222222"}
+                # ]
+                parameter_dict: Dict = {
+                    key: parameter_item[key] for key in parameter_name_list
+                }
+            elif isinstance(parameter_item, (List, tuple)):
+                if len(parameter_name_list) == len(parameter_item):
                     # {"username-password": "${get_account()}"}
-                    # get_account() => [
-                    #       {"username": "user1", "password": "111111"},
-                    #       {"username": "user2", "password": "222222"}
-                    # ]
-                    parameter_dict: Dict = {
-                        key: parameter_item[key] for key in parameter_name_list
-                    }
-                elif isinstance(parameter_item, (List, tuple)):
-                    if len(parameter_name_list) == len(parameter_item):
-                        # {"username-password": "${get_account()}"}
-                        # get_account() => [("user1", "111111"), ("user2", "222222")]
-                        parameter_dict = dict(zip(parameter_name_list, parameter_item))
-                    else:
-                        raise exceptions.ParamsError(
-                            f"parameter names length are not equal to value length.\n"
-                            f"parameter names: {parameter_name_list}\n"
-                            f"parameter values: {parameter_item}"
-                        )
-                elif len(parameter_name_list) == 1:
-                    # {"user_agent": "${get_user_agent()}"}
-                    # get_user_agent() => ["iOS/10.1", "iOS/10.2"]
-                    # parameter_dict will get: {"user_agent": "iOS/10.1", "user_agent": "iOS/10.2"}
-                    parameter_dict = {parameter_name_list[0]: parameter_item}
+                    # get_account() => [("user1", "111111"), ("user2", "222222")]
+                    parameter_dict = dict(zip(parameter_name_list, parameter_item))
                 else:
                     raise exceptions.ParamsError(
-                        f"Invalid parameter names and values:\n"
+                        f"parameter names length are not equal to value length.\n"
                         f"parameter names: {parameter_name_list}\n"
                         f"parameter values: {parameter_item}"
                     )
+            elif len(parameter_name_list) == 1:
+                # {"user_agent": "${get_user_agent()}"}
+                # get_user_agent() => ["iOS/10.1", "iOS/10.2"]
+                # parameter_dict will get: {"user_agent": "iOS/10.1", "user_agent": "iOS/10.2"}
+                parameter_dict = {parameter_name_list[0]: parameter_item}
+            else:
+                raise exceptions.ParamsError(
+                    f"Invalid parameter names and values:\n"
+                    f"parameter names: {parameter_name_list}\n"
+                    f"parameter values: {parameter_item}"
+                )
 
-                parameter_content_list.append(parameter_dict)
-
-        else:
-            raise exceptions.ParamsError(
-                f"parameter content should be List or Text(variables or functions call), got {parameter_content}"
-            )
-
-        parsed_parameters_list.append(parameter_content_list)
+            yield parameter_dict
 
-    return utils.gen_cartesian_product(*parsed_parameters_list)
+    else:
+        raise exceptions.ParamsError(
+            f"parameter content should be List or Text(variables or functions call), got {parameter_content}"
+        )
 
 
 class Parser(object):
     def __init__(self, functions_mapping: FunctionsMapping = None) -> None:
+        # functions resolved outside functions mapping, e.g. builtin comparators
+        self.__functions_cache: Dict[Text, Callable] = {}
         self.functions_mapping = functions_mapping
+        self.variables_resolver = VariablesResolver()
+
+    @property
+    def functions_mapping(self) -> FunctionsMapping:
+        return self.__functions_mapping
+
+    @functions_mapping.setter
+    def functions_mapping(self, functions_mapping: FunctionsMapping) -> None:
+        self.__functions_mapping = functions_mapping
+        self.invalidate_functions_cache()
+
+    def invalidate_functions_cache(self) -> None:
+        """clear resolved functions, changes of functions mapping in place are seen
+        without calling it, since functions mapping is looked up first"""
+        self.__functions_cache.clear()
 
     def parse_string(
         self, raw_string: Text, variables_mapping: VariablesMapping
@@ -627,12 +1168,35 @@ class Parser(object):
         return parse_string(raw_string, variables_mapping, self.functions_mapping)
 
     def parse_variables(self, variables_mapping: VariablesMapping) -> VariablesMapping:
-        return parse_variables_mapping(variables_mapping, self.functions_mapping)
+        return self.variables_resolver.resolve(
+            variables_mapping, self.functions_mapping
+        )
+
+    def lazy_variables(self, variables_mapping: VariablesMapping) -> LazyVariablesMapping:
+        return LazyVariablesMapping(variables_mapping, self.functions_mapping)
 
     def parse_data(
         self, raw_data: Any, variables_mapping: VariablesMapping = None
     ) -> Any:
         return parse_data(raw_data, variables_mapping, self.functions_mapping)
 
+    def parse_template(
+        self, template: DataTemplate, variables_mapping: VariablesMapping = None
+    ) -> Any:
+        return template.render(variables_mapping, self.functions_mapping)
+
     def get_mapping_function(self, func_name: Text) -> Callable:
-        return get_mapping_function(func_name, self.functions_mapping)
+        # functions mapping may be modified in place, e.g. replacing a function,
+        # thus it is looked up each time and only other functions are cached
+        functions_mapping = self.__functions_mapping
+        if functions_mapping and func_name in functions_mapping:
+            return functions_mapping[func_name]
+
+        try:
+            return self.__functions_cache[func_name]
+        except KeyError:
+            pass
+
+        func = get_mapping_function(func_name, functions_mapping)
+        self.__functions_cache[func_name] = func
+        return func
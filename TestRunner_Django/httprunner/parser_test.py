@@ -44,6 +44,144 @@ class TestParserBasic(unittest.TestCase):
         with self.assertRaises(VariableNotFound):
             parser.parse_variables_mapping(variables)
 
+    def test_parse_variables_mapping_circular_reference(self):
+        variables = {"varA": "$varB", "varB": "abc${varC}", "varC": "$varA"}
+        with self.assertRaises(VariableNotFound) as cm:
+            parser.parse_variables_mapping(variables)
+        self.assertIn("varA -> varB -> varC -> varA", str(cm.exception))
+
+    def test_sort_variables_graph(self):
+        graph = {"varA": {"varB"}, "varB": {"varC"}, "varC": set(), "a": set()}
+        self.assertEqual(
+            parser.sort_variables_graph(graph), ["varC", "varB", "varA", "a"]
+        )
+
+    def test_variables_resolver_incremental(self):
+        calls = []
+
+        def get_num():
+            calls.append(1)
+            return len(calls)
+
+        functions_mapping = {"get_num": get_num}
+        resolver = parser.VariablesResolver()
+        variables = {"a": "$b", "b": "x$c", "c": "1", "num": "${get_num()}"}
+        parsed = resolver.resolve(variables, functions_mapping)
+        self.assertEqual(parsed, {"a": "x1", "b": "x1", "c": "1", "num": 1})
+
+        # function calls are evaluated again, other values are reused
+        variables = {"a": "$b", "b": "x$c", "c": "1", "num": "${get_num()}"}
+        parsed = resolver.resolve(variables, functions_mapping)
+        self.assertEqual(parsed, {"a": "x1", "b": "x1", "c": "1", "num": 2})
+
+        # changed variable is re-evaluated with its dependents
+        variables = {"a": "$b", "b": "x$c", "c": "2", "num": "${get_num()}"}
+        parsed = resolver.resolve(variables, functions_mapping)
+        self.assertEqual(parsed, {"a": "x2", "b": "x2", "c": "2", "num": 3})
+
+        with self.assertRaises(VariableNotFound):
+            resolver.resolve({"a": "$b"}, functions_mapping)
+
+    def test_lazy_variables_mapping(self):
+        calls = []
+
+        def gen_value(name):
+            calls.append(name)
+            return name.upper()
+
+        variables = parser.LazyVariablesMapping(
+            {
+                "a": "$b",
+                "b": "${gen_value(b)}",
+                "c": "${gen_value(c)}",
+                "broken": "$undefined",
+            },
+            {"gen_value": gen_value},
+        )
+        self.assertEqual(parser.parse_data("/api/$a/$b", variables), "/api/B/B")
+        self.assertEqual(calls, ["b"])
+        self.assertEqual(variables.evaluated, {"a": "B", "b": "B"})
+
+        variables["response"] = "$not_parsed"
+        self.assertEqual(variables["response"], "$not_parsed")
+        self.assertEqual(len(variables), 5)
+        self.assertIn("c", variables)
+        self.assertEqual(calls, ["b"])
+
+        with self.assertRaises(VariableNotFound):
+            variables["broken"]
+
+        variables = parser.LazyVariablesMapping({"a": "$b", "b": "x$a"})
+        with self.assertRaises(VariableNotFound) as cm:
+            parser.parse_data("$a", variables)
+        self.assertIn("a -> b -> a", str(cm.exception))
+
+    def test_lazy_variables_mapping_not_modify_raw(self):
+        raw_variables = {"a": 1, "b": "$a"}
+        variables = parser.LazyVariablesMapping(raw_variables)
+        variables["a"] = 2
+        del variables["b"]
+        self.assertEqual(variables["a"], 2)
+        self.assertNotIn("b", variables)
+        self.assertEqual(list(variables), ["a"])
+        self.assertEqual(raw_variables, {"a": 1, "b": "$a"})
+
+    def test_parser_get_mapping_function(self):
+        functions_mapping = {"add_one": lambda x: x + 1}
+        p = parser.Parser(functions_mapping)
+        self.assertEqual(p.get_mapping_function("add_one")(1), 2)
+        self.assertIs(
+            p.get_mapping_function("equal"), p.get_mapping_function("equal")
+        )
+        self.assertIs(p.get_mapping_function("len"), len)
+        with self.assertRaises(FunctionNotFound):
+            p.get_mapping_function("not_exist_function")
+
+        # functions added in place
+        functions_mapping["equal"] = lambda a, b: True
+        self.assertTrue(p.get_mapping_function("equal")(1, 2))
+
+        # functions replaced in place, size of mapping unchanged
+        self.assertEqual(p.get_mapping_function("add_one")(1), 2)
+        functions_mapping["add_one"] = lambda x: x + 100
+        self.assertEqual(p.get_mapping_function("add_one")(1), 101)
+
+        # functions mapping reassigned
+        p.functions_mapping = {"add_one": lambda x: x + 10}
+        self.assertEqual(p.get_mapping_function("add_one")(1), 11)
+
+    def test_data_template(self):
+        fixture = {"items": [{"id": i, "tags": ("a", " b ")} for i in range(3)]}
+        raw_data = {
+            "url": "/api/$uid",
+            "headers": {"Content-Type": "application/json"},
+            "json": fixture,
+            "data": ["${sum_two($a, 2)}", "static"],
+        }
+        template = parser.DataTemplate(raw_data)
+        self.assertFalse(template.is_static)
+
+        variables_mapping = {"uid": 1, "a": 1}
+        functions_mapping = {"sum_two": lambda a, b: a + b}
+        parsed = template.render(variables_mapping, functions_mapping)
+        self.assertEqual(
+            parsed, parser.parse_data(raw_data, variables_mapping, functions_mapping)
+        )
+        self.assertEqual(parsed["url"], "/api/1")
+        self.assertEqual(parsed["data"], [3, "static"])
+
+        # static subtrees are reused by reference
+        parsed_again = template.render(variables_mapping, functions_mapping)
+        self.assertIs(parsed["json"], parsed_again["json"])
+        self.assertIs(parsed["headers"], parsed_again["headers"])
+        self.assertIsNot(parsed, parsed_again)
+
+        # root container is always a new object
+        template = parser.DataTemplate({"method": "GET"})
+        self.assertTrue(template.is_static)
+        template.render().pop("method")
+        self.assertEqual(template.render(), {"method": "GET"})
+
     def test_parse_string_value(self):
         self.assertEqual(parser.parse_string_value("123"), 123)
         self.assertEqual(parser.parse_string_value("12.3"), 12.3)
@@ -144,6 +282,37 @@ class TestParserBasic(unittest.TestCase):
             [("func", "1, 2, a=3, b=4")],
         )
 
+    def test_compile_template(self):
+        template = parser.compile_template("abc${add_one($num)}def$$x$var")
+        self.assertEqual(
+            template.segments,
+            (
+                (parser.SEGMENT_LITERAL, "abc"),
+                (
+                    parser.SEGMENT_FUNCTION,
+                    "add_one",
+                    "$num",
+                    {"args": ["$num"], "kwargs": {}},
+                ),
+                (parser.SEGMENT_LITERAL, "def$x"),
+                (parser.SEGMENT_VARIABLE, "var"),
+            ),
+        )
+        self.assertEqual(template.variables, {"num", "var"})
+        self.assertFalse(template.is_single_ref)
+
+        self.assertTrue(parser.compile_template("$var").is_single_ref)
+        self.assertTrue(parser.compile_template("${func(1)}").is_single_ref)
+        self.assertIs(
+            parser.compile_template("/api/$uid"), parser.compile_template("/api/$uid")
+        )
+
+        template = parser.compile_template("abc${add_one($num)}def")
+        self.assertEqual(
+            parser.render_template(template, {"num": 3}, {"add_one": lambda x: x + 1}),
+            "abc4def",
+        )
+
     def test_parse_data_string_with_variables(self):
         variables_mapping = {
             "var_1": "abc",
@@ -1,13 +1,41 @@
-from typing import Dict, Text, Any
+import functools
+from typing import Any, Dict, List, NamedTuple, Text
 
 import jmespath
 from jmespath.exceptions import JMESPathError
+from jmespath.parser import ParsedResult
 from loguru import logger
 
 from httprunner import exceptions
 from httprunner.exceptions import ValidationFailure, ParamsError
-from httprunner.models import VariablesMapping, Validators
-from httprunner.parser import parse_string_value, Parser
+from httprunner.models import TStep, VariablesMapping, Validators
+from httprunner.parser import DataTemplate, Parser, parse_string_value
+from httprunner.response_view import ResponseView
+
+
+# jmespath only caches 128 parsed expressions, which is too few for large suites
+JMESPATH_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=JMESPATH_CACHE_SIZE)
+def compile_jmespath(expr: Text) -> ParsedResult:
+    """compile jmespath expression, compiled expressions are cached process-wide"""
+    return jmespath.compile(expr)
+
+
+def search_jmespath(expr: Text, data: Any) -> Any:
+    return compile_jmespath(expr).search(data)
+
+
+def get_jmespath_cache_info() -> Dict:
+    """get process-wide hit/miss stats of compiled jmespath expressions"""
+    cache_info = compile_jmespath.cache_info()
+    return {
+        "hits": cache_info.hits,
+        "misses": cache_info.misses,
+        "size": cache_info.currsize,
+        "maxsize": cache_info.maxsize,
+    }
 
 
 def get_uniform_comparator(comparator: Text):
@@ -120,6 +148,47 @@ def uniform_validator(validator):
     }
 
 
+class ValidatorPlan(NamedTuple):
+    """validator compiled once per step definition, reused across retries,
+    parameter rows and executions"""
+
+    check: Any
+    # check item contains variable or function, parsed on each validation
+    check_dynamic: bool
+    assert_method: Text
+    expect: Any
+    expect_template: DataTemplate
+    message_template: DataTemplate
+
+
+def compile_validator(validator) -> ValidatorPlan:
+    u_validator = uniform_validator(validator)
+    check_item = u_validator["check"]
+    return ValidatorPlan(
+        check=check_item,
+        check_dynamic=isinstance(check_item, Text) and "$" in check_item,
+        assert_method=u_validator["assert"],
+        expect=u_validator["expect"],
+        expect_template=DataTemplate(u_validator["expect"]),
+        message_template=DataTemplate(u_validator["message"]),
+    )
+
+
+def compile_validators(validators: Validators) -> List[ValidatorPlan]:
+    return [
+        v if isinstance(v, ValidatorPlan) else compile_validator(v)
+        for v in validators
+    ]
+
+
+def get_step_validators_plan(step: TStep) -> List[ValidatorPlan]:
+    """compile validators of step once, cached in step templates"""
+    plan = step._templates.get("validators")
+    if plan is None:
+        plan = step._templates["validators"] = compile_validators(step.validators)
+    return plan
+
+
 class ResponseObjectBase(object):
     functions_mapping = None
     
@@ -157,7 +226,7 @@ class ResponseObjectBase(object):
 
     def _search_jmespath(self, expr: Text) -> Any:
         try:
-            check_value = jmespath.search(expr, self.resp_obj)
+            check_value = search_jmespath(expr, self.resp_obj)
         except JMESPathError as ex:
             logger.error(
                 f"failed to search with jmespath\n"
@@ -183,16 +252,15 @@ class ResponseObjectBase(object):
         validate_pass = True
         failures = []
 
-        for v in validators:
+        # validators may be precompiled, e.g. by get_step_validators_plan
+        for plan in compile_validators(validators):
 
             if "validate_extractor" not in self.validation_results:
                 self.validation_results["validate_extractor"] = []
 
-            u_validator = uniform_validator(v)
-
             # check item
-            check_item = u_validator["check"]
-            if "$" in check_item:
+            check_item = plan.check
+            if plan.check_dynamic:
                 # check_item is variable or function
                 check_item = self.parser.parse_data(check_item, variables_mapping)
                 check_item = parse_string_value(check_item)
@@ -203,33 +271,37 @@ class ResponseObjectBase(object):
                 # variable or function evaluation result is "" or not text
                 check_value = check_item
 
-            # comparator
-            assert_method = u_validator["assert"]
+            # comparator, resolved functions are memoized by parser
+            assert_method = plan.assert_method
             try:
                 assert_func = self.parser.get_mapping_function(assert_method)
             except exceptions.FunctionNotFound:
                 # 如果断言方法不存在，使用相等比较
-                assert_func = get_uniform_comparator("equal")
+                assert_func = self.parser.get_mapping_function("equal")
                 logger.warning(f"断言方法 '{assert_method}' 不存在，将使用'equal'替代")
 
             # expect item
-            expect_item = u_validator["expect"]
+            expect_item = plan.expect
             # parse expected value with config/teststep/extracted variables
+            # static expected values are parsed only once when compiling
             try:
-                expect_value = self.parser.parse_data(expect_item, variables_mapping)
+                expect_value = self.parser.parse_template(
+                    plan.expect_template, variables_mapping
+                )
             except exceptions.FunctionNotFound as e:
                 # 如果函数不存在，记录警告并保留原始表达式
                 logger.warning(f"期望值中的函数调用失败: {str(e)}")
                 expect_value = expect_item
 
             # message
-            message = u_validator["message"]
             # parse message with config/teststep/extracted variables
             try:
-                message = self.parser.parse_data(message, variables_mapping)
+                message = self.parser.parse_template(
+                    plan.message_template, variables_mapping
+                )
             except exceptions.FunctionNotFound:
                 # 如果函数不存在，保留原始消息
-                pass
+                message = plan.message_template.raw_data
 
             validate_msg = f"assert {check_item} {assert_method} {expect_value}({type(expect_value).__name__})"
 
@@ -275,14 +347,16 @@ class ResponseObjectBase(object):
 
 
 class ResponseObject(ResponseObjectBase):
+    def __init__(self, resp_obj, parser: Parser):
+        super(ResponseObject, self).__init__(resp_obj, parser)
+        # decoded once, shared with session recorder
+        self.view = ResponseView.of(resp_obj)
+
     def __getattr__(self, key):
         if key in ["json", "content", "body"]:
-            try:
-                value = self.resp_obj.json()
-            except ValueError:
-                value = self.resp_obj.content
+            value = self.view.body
         elif key == "cookies":
-            value = self.resp_obj.cookies.get_dict()
+            value = self.view.cookies
         else:
             try:
                 value = getattr(self.resp_obj, key)
@@ -295,6 +369,7 @@ class ResponseObject(ResponseObjectBase):
         return value
 
     def _search_jmespath(self, expr: Text) -> Any:
+        # attributes may be altered by teardown hooks, values are cached in __dict__
         resp_obj_meta = {
             "status_code": self.status_code,
             "headers": self.headers,
@@ -308,7 +383,7 @@ class ResponseObject(ResponseObjectBase):
                 return expr
 
         try:
-            check_value = jmespath.search(expr, resp_obj_meta)
+            check_value = search_jmespath(expr, resp_obj_meta)
         except JMESPathError as ex:
             logger.error(
                 f"failed to search with jmespath\n"
@@ -3,7 +3,14 @@ import unittest
 import requests
 
 from httprunner.parser import Parser
-from httprunner.response import ResponseObject, uniform_validator
+from httprunner.response import (
+    ResponseObject,
+    compile_jmespath,
+    compile_validators,
+    get_jmespath_cache_info,
+    search_jmespath,
+    uniform_validator,
+)
 from httprunner.utils import HTTP_BIN_URL
 
 
@@ -88,3 +95,46 @@ class TestResponse(unittest.TestCase):
         }
         for validator in validators:
             self.assertEqual(uniform_validator(validator), expected)
+
+
+class TestJmespathCache(unittest.TestCase):
+    def test_compile_jmespath(self):
+        expr = "body.locations[?state=='WA'].name | [0]"
+        data = {"body": {"locations": [{"name": "Seattle", "state": "WA"}]}}
+        before = get_jmespath_cache_info()
+        self.assertEqual(search_jmespath(expr, data), "Seattle")
+        self.assertEqual(search_jmespath(expr, data), "Seattle")
+        self.assertIs(compile_jmespath(expr), compile_jmespath(expr))
+
+        after = get_jmespath_cache_info()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 3)
+
+
+class TestValidatorsPlan(unittest.TestCase):
+    def test_validate_with_plan(self):
+        resp_obj = ResponseObject(requests.Response(), Parser())
+        resp_obj.status_code = 200
+        resp_obj.body = {"token": "abc", "items": [1, 2]}
+        validators = [
+            {"eq": ["status_code", 200]},
+            {"check": "body.token", "assert": "str_eq", "expect": "$token", "msg": "m"},
+            {"len_eq": ["body.items", 2, "${get_msg()}"]},
+            {"eq": ["body.items", (1, 2)]},
+        ]
+        variables_mapping = {"token": "abc"}
+        resp_obj.parser.functions_mapping = {"get_msg": lambda: "msg"}
+
+        resp_obj.validate(validators, variables_mapping)
+        raw_results = resp_obj.validation_results
+
+        plan = compile_validators(validators)
+        self.assertEqual(plan[0].assert_method, "equal")
+        self.assertFalse(plan[0].check_dynamic)
+        for _ in range(2):
+            resp_obj.validate(plan, variables_mapping)
+            self.assertEqual(resp_obj.validation_results, raw_results)
+
+        self.assertTrue(raw_results["success"])
+        self.assertEqual(raw_results["validate_extractor"][1]["expect_value"], "abc")
+        self.assertEqual(raw_results["validate_extractor"][2]["message"], "msg")
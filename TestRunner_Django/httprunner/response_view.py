@@ -0,0 +1,109 @@
+from typing import Any, Dict, Optional, Text
+
+from requests import Response
+
+from httprunner import json_codec
+from httprunner.spill import SpilledBody
+
+_UNDECODED = object()
+
+
+class ResponseView(object):
+    """decoded view of requests.Response, shared by session recorder, logging,
+    ResponseObject (extraction, validation, hooks) and report persistence.
+
+    Body is decoded at most once, cached values must be treated as read-only,
+    since they are shared by all consumers of the same response.
+
+    Examples:
+        >>> view = ResponseView.of(resp)
+        >>> view.body  # json decoded, or bytes content if not json
+        >>> ResponseView.of(resp) is view
+            True
+
+    """
+
+    def __init__(self, resp: Response):
+        self.resp = resp
+        self.__json = _UNDECODED
+        self.__text = None
+        self.__cookies = None
+
+    @classmethod
+    def of(cls, resp: Response) -> "ResponseView":
+        """get view attached to response, create one if not exists"""
+        view = getattr(resp, "_response_view", None)
+        if view is None:
+            view = cls(resp)
+            resp._response_view = view
+        return view
+
+    @property
+    def status_code(self) -> int:
+        return self.resp.status_code
+
+    @property
+    def headers(self):
+        return self.resp.headers
+
+    @property
+    def content(self) -> bytes:
+        """bytes, or read-only memory map if body is spilled to file"""
+        return self.resp.content
+
+    @property
+    def spilled(self) -> Optional[SpilledBody]:
+        """summary of body spilled to file, None if body is kept in memory"""
+        return getattr(self.resp, "_spilled_body", None)
+
+    @property
+    def text(self) -> Text:
+        if self.__text is None:
+            self.__text = self.resp.text
+        return self.__text
+
+    @property
+    def cookies(self) -> Dict:
+        if self.__cookies is None:
+            self.__cookies = self.resp.cookies.get_dict()
+        return self.__cookies
+
+    @property
+    def is_json(self) -> bool:
+        self.__decode()
+        return self.__json is not None
+
+    def json(self) -> Any:
+        """decoded json body, raise ValueError if body is not json"""
+        if not self.is_json:
+            raise ValueError("response body is not json")
+        return self.__json[0]
+
+    @property
+    def body(self) -> Any:
+        """json body if decodable, otherwise bytes content"""
+        return self.__json[0] if self.is_json else self.resp.content
+
+    def __decode(self) -> None:
+        if self.__json is not _UNDECODED:
+            return
+
+        try:
+            # wrapped in tuple, json body may be null
+            self.__json = (self.__loads(),)
+        except ValueError:
+            # requests.JSONDecodeError is subclass of ValueError
+            self.__json = None
+
+    def __loads(self) -> Any:
+        if self.spilled and "json" not in self.resp.headers.get("Content-Type", ""):
+            # large body of file downloads, not worth decoding
+            raise ValueError("spilled response body is not json")
+
+        encoding = self.resp.encoding
+        if encoding is None or encoding.lower() in ("utf-8", "utf8"):
+            # decode bytes content directly, skip building text
+            # content is None if request failed, e.g. connection error
+            return json_codec.loads(self.resp.content or b"")
+
+        return self.resp.json()
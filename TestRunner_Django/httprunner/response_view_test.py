@@ -0,0 +1,68 @@
+import unittest
+from unittest import mock
+
+from requests import Request, Response
+from requests.structures import CaseInsensitiveDict
+
+from httprunner import json_codec
+from httprunner.client import get_req_resp_record
+from httprunner.parser import Parser
+from httprunner.response import ResponseObject
+from httprunner.response_view import ResponseView
+
+
+class CountingResponse(Response):
+    def __init__(self, content: bytes, encoding="utf-8"):
+        super(CountingResponse, self).__init__()
+        self.status_code = 200
+        self.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        self._content = content
+        self.encoding = encoding
+        self.request = Request("GET", "https://postman-echo.com/get").prepare()
+        self.decode_count = 0
+
+    def json(self, **kwargs):
+        self.decode_count += 1
+        return super(CountingResponse, self).json(**kwargs)
+
+
+class TestResponseView(unittest.TestCase):
+    @mock.patch.object(json_codec, "loads", wraps=json_codec.loads)
+    def test_decode_once(self, mock_loads):
+        resp = CountingResponse(b'{"token": "abc", "items": [1, 2]}')
+        record = get_req_resp_record(resp)
+        self.assertEqual(record.response.body["token"], "abc")
+
+        resp_obj = ResponseObject(resp, Parser())
+        self.assertEqual(
+            resp_obj.extract({"token": "body.token", "second": "body.items[1]"}),
+            {"token": "abc", "second": 2},
+        )
+        resp_obj.validate([{"eq": ["body.token", "abc"]}, {"eq": ["status_code", 200]}])
+        self.assertEqual(mock_loads.call_count, 1)
+        self.assertEqual(resp.decode_count, 0)
+        self.assertIs(ResponseView.of(resp), resp_obj.view)
+
+    def test_decode_other_encoding(self):
+        resp = CountingResponse('{"name": "测试"}'.encode("gbk"), encoding="gbk")
+        view = ResponseView.of(resp)
+        self.assertEqual(view.json(), {"name": "测试"})
+        self.assertEqual(view.body, {"name": "测试"})
+        self.assertEqual(resp.decode_count, 1)
+
+    def test_not_json(self):
+        view = ResponseView.of(CountingResponse(b"null"))
+        self.assertTrue(view.is_json)
+        self.assertIsNone(view.body)
+
+        view = ResponseView.of(CountingResponse(b"<html></html>"))
+        self.assertFalse(view.is_json)
+        self.assertEqual(view.body, b"<html></html>")
+        with self.assertRaises(ValueError):
+            view.json()
+
+    def test_altered_by_hooks(self):
+        resp_obj = ResponseObject(CountingResponse(b'{"a": 1}'), Parser())
+        resp_obj.extract({"a": "body.a"})
+        resp_obj.status_code = 500
+        self.assertEqual(resp_obj.extract({"code": "status_code"}), {"code": 500})
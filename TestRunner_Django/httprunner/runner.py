@@ -1,8 +1,14 @@
+import asyncio
+import contextlib
+import contextvars
+import copy
 import os
+import threading
 import time
 import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, List, Text
+from typing import Dict, List, Optional, Text
 
 try:
     import allure
@@ -13,10 +19,19 @@ except ModuleNotFoundError:
 
 from loguru import logger
 
-from httprunner.client import HttpSession
+from httprunner.async_client import AsyncHttpSession
+from httprunner.client import RECORD_FULL, RECORD_LEVELS, RECORD_TRUNCATED, HttpSession
 from httprunner.config import Config
+from httprunner.connection_pool import ConnectionPoolRegistry
+from httprunner.http2_client import Http2Session
 from httprunner.exceptions import ParamsError, ValidationFailure
 from httprunner.loader import load_project_meta
+from httprunner.memoize import (
+    CACHE_SCOPE_STEP,
+    CACHE_SCOPE_TASK,
+    CACHE_SCOPE_TESTCASE,
+    FunctionCache,
+)
 from httprunner.models import (
     ProjectMeta,
     StepResult,
@@ -27,7 +42,9 @@ from httprunner.models import (
     VariablesMapping,
 )
 from httprunner.parser import Parser
-from httprunner.utils import LOGGER_FORMAT, merge_variables, ga4_client
+from httprunner.spill import BODY_SPILL_THRESHOLD
+from httprunner.step_graph import build_steps_graph
+from httprunner.utils import LOGGER_FORMAT, VariablesScope, ga4_client
 
 
 class SessionRunner(object):
@@ -36,10 +53,17 @@ class SessionRunner(object):
 
     parser: Parser = None
     session: HttpSession = None
+    async_session: AsyncHttpSession = None
     case_id: Text = ""
     root_dir: Text = ""
     thrift_client = None
     db_engine = None
+    db_registry = None
+    function_cache: FunctionCache = None
+    pool_registry: ConnectionPoolRegistry = None
+    record_level: Text = RECORD_TRUNCATED
+    spill_threshold: Optional[int] = BODY_SPILL_THRESHOLD
+    http2_client = None
 
     __config: TConfig
     __project_meta: ProjectMeta = None
@@ -53,6 +77,8 @@ class SessionRunner(object):
     # log
     __log_path: Text = ""
     __log_handler_id = None  # 存储日志处理器的ID，便于后续移除
+    # 执行过SQL步骤的工作线程, 异步模式下SQL步骤在线程池中执行
+    _db_worker_idents = None
 
     def __init(self):
         self.__config = self.config.struct()
@@ -74,7 +100,13 @@ class SessionRunner(object):
         self.__log_path = os.path.join(log_dir, f"{self.case_id}.run.log")
 
         self.__step_results = self.__step_results or []
-        self.session = self.session or HttpSession()
+        if self.session is None and self.http2_client is not None:
+            self.session = Http2Session(
+                self.http2_client, self.record_level, self.spill_threshold
+            )
+        self.session = self.session or HttpSession(
+            self.pool_registry, self.record_level, self.spill_threshold
+        )
         self.parser = self.parser or Parser(self.__project_meta.functions)
 
     def with_session(self, session: HttpSession) -> "SessionRunner":
@@ -108,6 +140,69 @@ class SessionRunner(object):
         self.db_engine = db_engine
         return self
 
+    def with_db_registry(self, db_registry) -> "SessionRunner":
+        """set registry of DBEngines shared per (db uri, worker thread) with other
+        runners, see httprunner.database.engine.DBEngineRegistry"""
+        self.db_registry = db_registry
+        return self
+
+    def with_async_session(self, async_session: AsyncHttpSession) -> "SessionRunner":
+        """set session used by async_test_start, e.g. sessions sharing a connector"""
+        self.async_session = async_session
+        return self
+
+    def with_pool_registry(self, pool_registry: ConnectionPoolRegistry) -> "SessionRunner":
+        """set registry of connection pools shared with other runners"""
+        self.pool_registry = pool_registry
+        return self
+
+    def with_record_level(self, record_level: Text) -> "SessionRunner":
+        """set recording level of request and response data, e.g. none, metadata,
+        truncated or full. request and response details are logged into run log
+        only in full level"""
+        if record_level not in RECORD_LEVELS:
+            logger.warning(
+                f"invalid record level {record_level}, use {RECORD_TRUNCATED} instead"
+            )
+            record_level = RECORD_TRUNCATED
+        self.record_level = record_level
+        return self
+
+    def with_http2_client(self, http2_client) -> "SessionRunner":
+        """send requests with HTTP/2 transport, client is shared by forked runners
+        and sessions, see httprunner.http2_client.create_http2_client"""
+        self.http2_client = http2_client
+        return self
+
+    def with_spill_threshold(self, spill_threshold: Optional[int]) -> "SessionRunner":
+        """set body size in bytes, above which response body is spilled to temp file
+        and recorded as hash, size and preview, None or 0 to disable"""
+        self.spill_threshold = spill_threshold
+        return self
+
+    def with_function_cache(self, function_cache: FunctionCache) -> "SessionRunner":
+        """set cache used by memoized pure functions, scopes are cleared by runner"""
+        self.function_cache = function_cache
+        return self
+
+    def fork(self) -> "SessionRunner":
+        """create an isolated runner for another run of the same testcase, e.g. one
+        parameter row in data-driven mode. Teststeps, functions and task scope of
+        function cache are shared, while config, session, parser, variables, results
+        and step/testcase scopes of function cache are not."""
+        runner = copy.copy(self)
+        if self.function_cache is not None:
+            runner.function_cache = self.function_cache.fork()
+        runner.config = copy.deepcopy(self.config)
+        runner.session = None
+        runner.async_session = None
+        runner.parser = Parser(self.parser.functions_mapping) if self.parser else None
+        runner.case_id = ""
+        runner.__session_variables = {}
+        runner.__step_results = []
+        runner.__log_handler_id = None
+        return runner
+
     def __parse_config(self, param: Dict = None) -> None:
         # parse config variables
         self.__config.variables.update(self.__session_variables)
@@ -167,24 +262,27 @@ class SessionRunner(object):
             step_results=self.__step_results,
         )
 
-    def merge_step_variables(self, variables: VariablesMapping) -> VariablesMapping:
-        # override variables
-        # step variables > extracted variables from previous steps
-        variables = merge_variables(variables, self.__session_variables)
-        # step variables > testcase config variables
-        variables = merge_variables(variables, self.__config.variables)
+    def __activate_function_cache(self):
+        """memoized functions use stores of function cache of this runner"""
+        if self.function_cache is None:
+            return contextlib.nullcontext()
+        return self.function_cache.activate()
 
-        # parse variables
-        return self.parser.parse_variables(variables)
+    def merge_step_variables(self, variables: VariablesMapping) -> VariablesMapping:
+        # override variables without copying
+        # step variables > extracted variables from previous steps > testcase config variables
+        scope = VariablesScope(self.__session_variables, self.__config.variables)
+        scope = scope.new_step(variables)
 
-    def __run_step(self, step):
-        """run teststep, step maybe any kind that implements IStep interface
+        # parse variables lazily, only variables referenced by the step are evaluated
+        # values assigned in the step (request, response, hooks, extracted) stay in the step
+        return self.parser.lazy_variables(scope)
 
-        Args:
-            step (Step): teststep
-
-        """
+    def __execute_step(self, step) -> StepResult:
+        """execute teststep with retry, without updating session variables and results"""
         logger.info(f"run step begin: {step.name()} >>>>>>")
+        if self.function_cache is not None:
+            self.function_cache.clear(CACHE_SCOPE_STEP)
 
         # run step
         for i in range(step.retry_times + 1):
@@ -207,6 +305,37 @@ class SessionRunner(object):
                         f"run step retry ({i + 1}/{step.retry_times} time): {step.name()} >>>>>>"
                     )
 
+        return step_result
+
+    async def __async_execute_step(self, step) -> StepResult:
+        """asyncio version of __execute_step"""
+        logger.info(f"run step begin: {step.name()} >>>>>>")
+        if self.function_cache is not None:
+            self.function_cache.clear(CACHE_SCOPE_STEP)
+
+        for i in range(step.retry_times + 1):
+            try:
+                if ALLURE is not None:
+                    with ALLURE.step(f"step: {step.name()}"):
+                        step_result: StepResult = await step.async_run(self)
+                else:
+                    step_result: StepResult = await step.async_run(self)
+                break
+            except ValidationFailure:
+                if i == step.retry_times:
+                    raise
+                else:
+                    logger.warning(
+                        f"run step {step.name()} validation failed,wait {step.retry_interval} sec and try again"
+                    )
+                    await asyncio.sleep(step.retry_interval)
+                    logger.info(
+                        f"run step retry ({i + 1}/{step.retry_times} time): {step.name()} >>>>>>"
+                    )
+
+        return step_result
+
+    def __save_step_result(self, step, step_result: StepResult) -> None:
         # save extracted variables to session variables
         self.__session_variables.update(step_result.export_vars)
         # update testcase summary
@@ -214,11 +343,93 @@ class SessionRunner(object):
 
         logger.info(f"run step end: {step.name()} <<<<<<\n")
 
-    def test_start(self, param: Dict = None) -> "SessionRunner":
-        """main entrance, discovered by pytest"""
+    def __run_step(self, step):
+        """run teststep, step maybe any kind that implements IStep interface
+
+        Args:
+            step (Step): teststep
+
+        """
+        step_result = self.__execute_step(step)
+        self.__save_step_result(step, step_result)
+
+    def __fork_step_runner(self, index: int, step_results: Dict[int, StepResult]):
+        """create runner for step running concurrently, session variables are
+        merged from finished earlier steps in order, as if steps run in order"""
+        runner = copy.copy(self)
+        session_variables = dict(self.__session_variables)
+        for finished_index in sorted(step_results):
+            if finished_index < index:
+                session_variables.update(step_results[finished_index].export_vars)
+        runner.__session_variables = session_variables
+        runner.session = self.session.fork()
+        if self.function_cache is not None:
+            # step scope is cleared by each step, thus never shared by running steps
+            runner.function_cache = self.function_cache.fork(
+                shared_scopes=(CACHE_SCOPE_TESTCASE, CACHE_SCOPE_TASK)
+            )
+        return runner
+
+    def __execute_forked_step(self, step) -> StepResult:
+        with self.__activate_function_cache():
+            return self.__execute_step(step)
+
+    def __run_steps_concurrently(self, max_workers: int) -> None:
+        """run steps by dependency graph, steps which do not depend on each other's
+        extracted variables run concurrently, results are saved in step order.
+        cookies are shared by forked sessions, but not tracked by dependency graph"""
+        steps_graph = build_steps_graph(
+            [step.struct() if hasattr(step, "struct") else None for step in self.teststeps]
+        )
+        step_results: Dict[int, StepResult] = {}
+        step_errors: Dict[int, Exception] = {}
+        pending = list(range(len(self.teststeps)))
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending or running:
+                # stop scheduling new steps once any step failed
+                ready = [] if step_errors else [
+                    index for index in pending if steps_graph[index] <= step_results.keys()
+                ]
+                for index in ready:
+                    pending.remove(index)
+                    runner = self.__fork_step_runner(index, step_results)
+                    # context is copied, thus step logs are kept in run log by case_id
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        runner.__execute_forked_step,
+                        self.teststeps[index],
+                    )
+                    running[future] = index
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    try:
+                        step_results[index] = future.result()
+                    except Exception as ex:
+                        step_errors[index] = ex
+
+        # results of steps after the first failed one are dropped, as if steps run
+        # in order, in which case they would not have been run
+        first_error = min(step_errors) if step_errors else len(self.teststeps)
+        for index in sorted(step_results):
+            if index < first_error:
+                self.__save_step_result(self.teststeps[index], step_results[index])
+
+        if step_errors:
+            raise step_errors[first_error]
+
+    def __start_testcase(self, param: Dict = None) -> None:
         ga4_client.send_event("test_start")
         print("\n")
         self.__init()
+        if self.function_cache is not None:
+            self.function_cache.clear(CACHE_SCOPE_TESTCASE)
         self.__parse_config(param)
 
         if ALLURE is not None and not self.__is_referenced:
@@ -241,11 +452,15 @@ class SessionRunner(object):
                 logger.warning(f"移除旧的日志处理器时出错: {str(e)}")
         
         # 添加新的日志处理器，并保存它的ID
+        # 只记录本用例的日志(按case_id过滤), 并发执行的参数行各自写入自己的日志文件
+        # 请求和响应详情为DEBUG日志, 仅在full记录级别下格式化并写入日志文件
+        case_id = self.case_id
         try:
             self.__log_handler_id = logger.add(
                 sink=self.__log_path, 
                 format=LOGGER_FORMAT, 
-                level="DEBUG", 
+                level="DEBUG" if self.record_level == RECORD_FULL else "INFO", 
+                filter=lambda record: record["extra"].get("case_id") == case_id,
                 encoding="utf-8",
                 enqueue=True,  # 使用队列，避免多线程问题
                 rotation="20 MB",  # 添加日志轮转功能
@@ -256,34 +471,84 @@ class SessionRunner(object):
             )
         except Exception as e:
             logger.error(f"添加日志处理器时出错: {str(e)}")
-        
+
         self.__start_at = time.time()
-        try:
-            # run step in sequential order
-            for step in self.teststeps:
-                self.__run_step(step)
-        finally:
-            # 在测试完成后记录日志并添加到Allure报告中
-            logger.info(f"generate testcase log: {self.__log_path}")
-            if ALLURE is not None:
-                try:
-                    ALLURE.attach.file(
-                        self.__log_path,
-                        name="all log",
-                        attachment_type=ALLURE.attachment_type.TEXT,
-                    )
-                except Exception as e:
-                    logger.error(f"添加日志到Allure报告时出错: {str(e)}")
-            
-            # 移除日志处理器，确保文件被正确关闭
-            if self.__log_handler_id is not None:
+
+    def __finish_testcase(self) -> None:
+        # 归还各工作线程的数据库连接并重置会话状态, 引擎和连接池由后续用例复用
+        if self.db_registry is not None:
+            self.db_registry.release_worker()
+            for thread_ident in self._db_worker_idents or ():
+                if thread_ident != threading.get_ident():
+                    self.db_registry.release_worker(thread_ident)
+            self._db_worker_idents = set()
+
+        # 在测试完成后记录日志并添加到Allure报告中
+        logger.info(f"generate testcase log: {self.__log_path}")
+        if ALLURE is not None:
+            try:
+                ALLURE.attach.file(
+                    self.__log_path,
+                    name="all log",
+                    attachment_type=ALLURE.attachment_type.TEXT,
+                )
+            except Exception as e:
+                logger.error(f"添加日志到Allure报告时出错: {str(e)}")
+
+        # 移除日志处理器，确保文件被正确关闭
+        if self.__log_handler_id is not None:
+            try:
+                # 检查处理器ID是否存在于logger的处理器列表中
+                if self.__log_handler_id in [handler_id for handler_id in logger._core.handlers]:
+                    logger.remove(self.__log_handler_id)
+                self.__log_handler_id = None
+            except Exception as e:
+                logger.warning(f"移除日志处理器时出错: {str(e)}")
+
+    def test_start(self, param: Dict = None) -> "SessionRunner":
+        """main entrance, discovered by pytest"""
+        with self.__activate_function_cache():
+            self.__start_testcase(param)
+            with logger.contextualize(case_id=self.case_id):
                 try:
-                    # 检查处理器ID是否存在于logger的处理器列表中
-                    if self.__log_handler_id in [handler_id for handler_id in logger._core.handlers]:
-                        logger.remove(self.__log_handler_id)
-                    self.__log_handler_id = None
-                except Exception as e:
-                    logger.warning(f"移除日志处理器时出错: {str(e)}")
+                    if self.__config.step_concurrency > 1:
+                        # run independent steps concurrently
+                        self.__run_steps_concurrently(self.__config.step_concurrency)
+                    else:
+                        # run step in sequential order
+                        for step in self.teststeps:
+                            self.__run_step(step)
+                finally:
+                    self.__finish_testcase()
+
+        self.__duration = time.time() - self.__start_at
+        return self
+
+    async def async_test_start(self, param: Dict = None) -> "SessionRunner":
+        """asyncio entrance, requests are sent by AsyncHttpSession in running event
+        loop, thus many testcases can be multiplexed in one thread"""
+        with self.__activate_function_cache():
+            return await self.__async_run_testcase(param)
+
+    async def __async_run_testcase(self, param: Dict = None) -> "SessionRunner":
+        self.__start_testcase(param)
+        own_async_session = self.async_session is None
+        if own_async_session:
+            self.async_session = AsyncHttpSession(
+                record_level=self.record_level, spill_threshold=self.spill_threshold
+            )
+
+        with logger.contextualize(case_id=self.case_id):
+            try:
+                # run step in sequential order
+                for step in self.teststeps:
+                    step_result = await self.__async_execute_step(step)
+                    self.__save_step_result(step, step_result)
+            finally:
+                if own_async_session:
+                    await self.async_session.close()
+                    self.async_session = None
+                self.__finish_testcase()
 
         self.__duration = time.time() - self.__start_at
         return self
@@ -316,17 +581,23 @@ class HttpRunner(SessionRunner):
         """
         if self.db_engine:
             return self.db_engine
-            
+
+        from httprunner.database.engine import build_db_uri, db_engine_registry
+
         if not db_uri:
             # 使用配置中的数据库连接信息
             config = self.get_config()
             if hasattr(config, 'db') and config.db:
-                db_uri = f'mysql+pymysql://{config.db.user}:{config.db.password}@{config.db.ip}:{config.db.port}/{config.db.database}?charset=utf8mb4'
+                db_uri = build_db_uri(config.db.dict())
             else:
                 from loguru import logger
                 logger.error("无法获取数据库配置信息")
                 return None
-        
-        from httprunner.database.engine import DBEngine
-        self.db_engine = DBEngine(db_uri)
-        return self.db_engine
+
+        # 按(连接串, 工作线程)共享数据库引擎, 连接池由进程内所有用例复用
+        if self.db_registry is None:
+            self.db_registry = db_engine_registry
+        if self._db_worker_idents is None:
+            self._db_worker_idents = set()
+        self._db_worker_idents.add(threading.get_ident())
+        return self.db_registry.get_db_engine(db_uri)
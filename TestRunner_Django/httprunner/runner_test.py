@@ -0,0 +1,183 @@
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler
+from unittest import mock
+
+from loguru import logger
+
+from httprunner import Config, HttpRunner, RunRequest, Step
+from httprunner.client import RECORD_FULL, RECORD_TRUNCATED
+from httprunner.memoize import CACHE_SCOPE_TESTCASE, FunctionCache
+from httprunner.parser import Parser
+from httprunner.testing import LocalServerTestCase
+
+
+class BarrierHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # set to handle requests of concurrent rows at the same time
+    barrier = None
+
+    def do_GET(self):
+        if self.barrier is not None:
+            self.barrier.wait()
+        content = self.path.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_runner(name: str, base_url: str) -> HttpRunner:
+    runner = HttpRunner()
+    runner.config = Config(name).base_url(base_url)
+    runner.teststeps = [
+        Step(
+            RunRequest("get row")
+            .get("/rows/$row")
+            .validate()
+            .assert_equal("status_code", 200)
+        )
+    ]
+    return runner
+
+
+class TestRunnerLog(LocalServerTestCase):
+    handler_class = BarrierHandler
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        BarrierHandler.barrier = threading.Barrier(2, timeout=5)
+
+    @classmethod
+    def tearDownClass(cls):
+        BarrierHandler.barrier = None
+        super().tearDownClass()
+
+    def test_log_of_concurrent_rows(self):
+        runner = make_runner("concurrent rows", self.base_url)
+        runner.with_record_level(RECORD_FULL)
+
+        with tempfile.TemporaryDirectory() as root_dir:
+            runner.root_dir = root_dir
+            rows = [runner.fork(), runner.fork()]
+            threads = [
+                threading.Thread(target=row.test_start, args=({"row": f"row{index}"},))
+                for index, row in enumerate(rows)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            for index, row in enumerate(rows):
+                self.assertTrue(row.get_summary().success)
+                log_path = os.path.join(root_dir, "logs", f"{row.case_id}.run.log")
+                with open(log_path, encoding="utf-8") as f:
+                    content = f.read()
+                # each run log only contains lines of its own row
+                self.assertIn(f"/rows/row{index}", content)
+                self.assertNotIn(f"/rows/row{1 - index}", content)
+                self.assertNotIn(rows[1 - index].case_id, content)
+
+
+class TestRunnerConcurrency(LocalServerTestCase):
+    handler_class = BarrierHandler
+
+    def test_testcase_scope_of_concurrent_rows(self):
+        tokens = iter(range(100))
+        # both rows login at the same time
+        barrier = threading.Barrier(2, timeout=5)
+
+        def login():
+            barrier.wait()
+            return f"token{next(tokens)}"
+
+        cache = FunctionCache()
+        runner = HttpRunner().with_function_cache(cache)
+        runner.config = Config("rows with cache").base_url(self.base_url)
+        runner.parser = Parser(
+            {"login": cache.memoize(login, scope=CACHE_SCOPE_TESTCASE)}
+        )
+        runner.teststeps = [
+            Step(RunRequest("login").get("/rows/$row/${login()}")),
+            Step(RunRequest("reuse login").get("/rows/$row/${login()}")),
+        ]
+
+        with tempfile.TemporaryDirectory() as root_dir:
+            runner.root_dir = root_dir
+            rows = [runner.fork(), runner.fork()]
+            threads = [
+                threading.Thread(target=row.test_start, args=({"row": f"row{index}"},))
+                for index, row in enumerate(rows)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        urls = [
+            [step.data.req_resps[0].request.url for step in row.get_summary().step_results]
+            for row in rows
+        ]
+        # login is memoized per row, never reused by the other row
+        for row_urls in urls:
+            self.assertEqual(row_urls[0], row_urls[1])
+        self.assertNotEqual(urls[0][0].rsplit("/", 1)[1], urls[1][0].rsplit("/", 1)[1])
+
+    def test_drop_results_after_failed_step(self):
+        runner = HttpRunner()
+        runner.config = (
+            Config("concurrent steps").base_url(self.base_url).concurrent_steps(2)
+        )
+        runner.teststeps = [
+            # invalid jmespath expression fails the step
+            Step(RunRequest("failed").get("/rows/a").extract().with_jmespath("body.[", "x")),
+            Step(RunRequest("independent").get("/rows/b")),
+        ]
+        with tempfile.TemporaryDirectory() as root_dir:
+            runner.root_dir = root_dir
+            with self.assertRaises(Exception):
+                runner.test_start()
+
+        # independent step would not have been run in order
+        self.assertEqual(runner.get_summary().step_results, [])
+
+
+class TestRunnerLogLevel(LocalServerTestCase):
+    handler_class = BarrierHandler
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # no sink consumes DEBUG messages except run log
+        logger.remove()
+        cls.handler_id = logger.add(sys.stderr, level="INFO")
+
+    @classmethod
+    def tearDownClass(cls):
+        logger.remove(cls.handler_id)
+        logger.add(sys.stderr)
+        super().tearDownClass()
+
+    def run_with_record_level(self, record_level: str) -> bool:
+        """whether request and response details are formatted"""
+        runner = make_runner("log level", self.base_url).with_record_level(record_level)
+        with tempfile.TemporaryDirectory() as root_dir, mock.patch(
+            "httprunner.step_request.pretty_format", return_value=""
+        ) as step_formatter, mock.patch(
+            "httprunner.client.format_req_resp", return_value=""
+        ) as client_formatter:
+            runner.root_dir = root_dir
+            runner.test_start({"row": "row0"})
+        self.assertTrue(runner.get_summary().success)
+        return step_formatter.called or client_formatter.called
+
+    def test_details_not_formatted_below_full(self):
+        self.assertFalse(self.run_with_record_level(RECORD_TRUNCATED))
+        self.assertTrue(self.run_with_record_level(RECORD_FULL))
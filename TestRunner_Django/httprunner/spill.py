@@ -0,0 +1,108 @@
+import hashlib
+import mmap
+import tempfile
+from typing import Dict, List, NamedTuple, Optional, Text, Union
+
+# bodies larger than threshold are spilled to temp file, None to disable
+BODY_SPILL_THRESHOLD = 10 * 1024 * 1024
+SPILL_CHUNK_SIZE = 64 * 1024
+SPILL_PREVIEW_SIZE = 512
+
+
+class SpilledBody(NamedTuple):
+    """summary of body spilled to file, recorded instead of raw payload"""
+
+    size: int
+    sha256: Text
+    preview: Text
+
+    def summary(self) -> Dict:
+        return {
+            "spilled": True,
+            "size": self.size,
+            "sha256": self.sha256,
+            "preview": self.preview,
+        }
+
+
+class BodySpool(object):
+    """collect body chunks in memory until size exceeds threshold, then spill all
+    to anonymous temp file, which is removed once content is garbage collected.
+
+    Spilled content is a read-only memory map, pages are loaded from file lazily
+    while it is consumed as bytes-like object, e.g. slicing, hashing or json decoding.
+
+    Examples:
+        >>> spool = BodySpool(threshold=1024)
+        >>> for chunk in response.iter_content(SPILL_CHUNK_SIZE):
+        ...     spool.write(chunk)
+        >>> content = spool.getvalue()
+        >>> spool.spilled
+            SpilledBody(size=..., sha256=..., preview=...)
+
+    """
+
+    def __init__(self, threshold: Optional[int] = BODY_SPILL_THRESHOLD):
+        self.threshold = threshold
+        self.size = 0
+        self.spilled: Optional[SpilledBody] = None
+        self.__chunks: List[bytes] = []
+        self.__file = None
+        self.__hash = None
+        self.__preview = b""
+
+    def write(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+
+        self.size += len(chunk)
+        if self.__file is not None:
+            self.__write_file(chunk)
+            return
+
+        self.__chunks.append(chunk)
+        if self.threshold and self.size > self.threshold:
+            self.__spill()
+
+    def __spill(self) -> None:
+        self.__file = tempfile.TemporaryFile(prefix="hrun-body-")
+        self.__hash = hashlib.sha256()
+        chunks, self.__chunks = self.__chunks, []
+        for chunk in chunks:
+            self.__write_file(chunk)
+
+    def __write_file(self, chunk: bytes) -> None:
+        if len(self.__preview) < SPILL_PREVIEW_SIZE:
+            self.__preview += chunk[: SPILL_PREVIEW_SIZE - len(self.__preview)]
+        self.__hash.update(chunk)
+        self.__file.write(chunk)
+
+    def getvalue(self) -> Union[bytes, mmap.mmap]:
+        """bytes content, or memory map of spill file if spilled"""
+        if self.__file is None:
+            return b"".join(self.__chunks)
+
+        self.__file.flush()
+        content = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        # memory map keeps file data after file is closed
+        self.__file.close()
+        self.spilled = SpilledBody(
+            self.size,
+            self.__hash.hexdigest(),
+            self.__preview.decode("utf-8", errors="replace"),
+        )
+        return content
+
+
+def read_response_body(response, threshold: Optional[int] = BODY_SPILL_THRESHOLD) -> None:
+    """download body of streamed requests.Response, spilled to file if too large.
+    spill summary is kept in response._spilled_body, see ResponseView.spilled"""
+    if response.raw is None or response._content is not False:
+        # failed request, or content consumed already
+        return
+
+    spool = BodySpool(threshold)
+    for chunk in response.iter_content(SPILL_CHUNK_SIZE):
+        spool.write(chunk)
+    response._content = spool.getvalue()
+    response._spilled_body = spool.spilled
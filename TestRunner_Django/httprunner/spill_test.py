@@ -0,0 +1,107 @@
+import asyncio
+import hashlib
+import json
+import mmap
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+from httprunner.async_client import AsyncHttpSession
+from httprunner.client import RECORD_FULL, HttpSession
+from httprunner.parser import Parser
+from httprunner.response import ResponseObject
+from httprunner.spill import BodySpool
+from httprunner.testing import LocalServerTestCase
+
+IMAGE_CONTENT = bytes(range(256)) * 1024
+JSON_CONTENT = json.dumps({"items": list(range(50000))}).encode("utf-8")
+
+
+class DownloadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/image":
+            content_type, content = "image/png", IMAGE_CONTENT
+        else:
+            content_type, content = "application/json", JSON_CONTENT
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestBodySpool(unittest.TestCase):
+    def test_in_memory(self):
+        spool = BodySpool(threshold=10)
+        spool.write(b"hello")
+        spool.write(b"")
+        self.assertEqual(spool.getvalue(), b"hello")
+        self.assertIsNone(spool.spilled)
+
+    def test_spill(self):
+        spool = BodySpool(threshold=10)
+        for chunk in (b"0123456", b"789abc", b"def"):
+            spool.write(chunk)
+        content = spool.getvalue()
+        self.assertIsInstance(content, mmap.mmap)
+        self.assertEqual(content[:], b"0123456789abcdef")
+        self.assertEqual(spool.spilled.size, 16)
+        self.assertEqual(
+            spool.spilled.sha256, hashlib.sha256(b"0123456789abcdef").hexdigest()
+        )
+        self.assertEqual(spool.spilled.preview, "0123456789abcdef")
+
+    def test_disabled(self):
+        spool = BodySpool(threshold=None)
+        spool.write(b"0" * 100)
+        self.assertEqual(spool.getvalue(), b"0" * 100)
+
+
+class TestSpillResponseBody(LocalServerTestCase):
+    handler_class = DownloadHandler
+
+    def test_spill_image(self):
+        session = HttpSession(record_level=RECORD_FULL, spill_threshold=64 * 1024)
+        resp = session.request("GET", f"{self.base_url}/image")
+        self.assertIsInstance(resp.content, mmap.mmap)
+        self.assertEqual(resp.content[:256], bytes(range(256)))
+        self.assertEqual(session.data.stat.content_size, len(IMAGE_CONTENT))
+
+        # raw payload is not recorded even in full level
+        body = session.data.req_resps[0].response.body
+        self.assertEqual(body["size"], len(IMAGE_CONTENT))
+        self.assertEqual(body["sha256"], hashlib.sha256(IMAGE_CONTENT).hexdigest())
+
+        resp_obj = ResponseObject(resp, Parser())
+        resp_obj.validate([{"eq": ["status_code", 200]}])
+        session.close()
+
+    def test_spill_json(self):
+        session = HttpSession(spill_threshold=64 * 1024)
+        resp = session.request("GET", f"{self.base_url}/json")
+        self.assertIsInstance(resp.content, mmap.mmap)
+        self.assertTrue(session.data.req_resps[0].response.body["spilled"])
+
+        resp_obj = ResponseObject(resp, Parser())
+        self.assertEqual(resp_obj.extract({"last": "body.items[-1]"}), {"last": 49999})
+        session.close()
+
+    def test_spill_async(self):
+        async def request():
+            session = AsyncHttpSession(spill_threshold=64 * 1024)
+            try:
+                resp = await session.request("GET", f"{self.base_url}/image")
+            finally:
+                await session.close()
+            return session, resp
+
+        session, resp = asyncio.run(request())
+        self.assertIsInstance(resp.content, mmap.mmap)
+        self.assertEqual(
+            session.data.req_resps[0].response.body["sha256"],
+            hashlib.sha256(IMAGE_CONTENT).hexdigest(),
+        )
@@ -65,3 +65,6 @@ class Step(object):
 
     def run(self, runner: HttpRunner) -> StepResult:
         return self.__step.run(runner)
+
+    async def async_run(self, runner: HttpRunner) -> StepResult:
+        return await self.__step.async_run(runner)
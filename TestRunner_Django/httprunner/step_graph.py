@@ -0,0 +1,76 @@
+from typing import List, Optional, Set
+
+from httprunner.models import TStep
+from httprunner.parser import extract_variables
+
+# variables assigned by runner in each step, never extracted from previous steps
+STEP_BUILTIN_VARIABLES = {"request", "response"}
+
+
+def get_step_references(step: TStep) -> Optional[Set]:
+    """get variables referenced by step which may come from previous steps,
+    return None if the dependencies can not be determined, e.g. referenced testcase"""
+    if step.testcase is not None:
+        return None
+
+    # step variables shadow session variables, except for themselves,
+    # e.g. {"uid": "$uid"} references uid extracted in previous steps
+    variables_references = extract_variables(list(step.variables.values()))
+
+    content = [
+        step.setup_hooks,
+        step.teardown_hooks,
+        step.extract,
+        step.validators,
+    ]
+    for request in (step.request, step.sql_request, step.thrift_request):
+        if request is not None:
+            content.append(request.dict())
+
+    references = extract_variables(content) - set(step.variables.keys())
+    return (references | variables_references) - STEP_BUILTIN_VARIABLES
+
+
+def get_step_outputs(step: TStep) -> Set:
+    """get variables saved into session variables by step"""
+    return set(step.extract.keys()) | set(step.export)
+
+
+def build_steps_graph(steps: List[Optional[TStep]]) -> List[Set[int]]:
+    """build dependency graph of steps, each item is the indexes of earlier steps
+    which must be finished before the step starts.
+
+    step depends on an earlier step if it references any variable extracted or
+    exported by that step. Steps whose dependencies can not be determined (None or
+    referenced testcase) are barriers, which depend on all earlier steps and all
+    later steps depend on. Cookies set by responses are not tracked, see
+    Config.concurrent_steps.
+
+    Examples:
+        >>> build_steps_graph([login, get_profile, get_config, logout])
+            [set(), {0}, set(), {0}]  # login extracts token used by get_profile and logout
+
+    """
+    graph: List[Set[int]] = []
+    last_barrier = None
+    outputs_list = [
+        get_step_outputs(step) if step is not None else set() for step in steps
+    ]
+
+    for index, step in enumerate(steps):
+        references = get_step_references(step) if step is not None else None
+        if references is None:
+            dependencies = set(range(index))
+            last_barrier = index
+        else:
+            dependencies = {
+                earlier_index
+                for earlier_index in range(index)
+                if outputs_list[earlier_index] & references
+            }
+            if last_barrier is not None:
+                dependencies.add(last_barrier)
+
+        graph.append(dependencies)
+
+    return graph
@@ -0,0 +1,37 @@
+import unittest
+
+from httprunner import Config, HttpRunner, RunRequest, RunTestCase, Step
+from httprunner.step_graph import build_steps_graph, get_step_references
+
+
+class ReferencedCase(HttpRunner):
+    config = Config("referenced testcase")
+    teststeps = []
+
+
+class TestStepGraph(unittest.TestCase):
+    def test_get_step_references(self):
+        step = (
+            RunRequest("get profile")
+            .with_variables(uid="$uid", page=1)
+            .get("/users/$uid")
+            .with_headers(**{"Authorization": "Bearer $token"})
+            .with_params(page="$page")
+            .validate()
+            .assert_equal("body.name", "$name")
+        )
+        self.assertEqual(get_step_references(step.struct()), {"uid", "token", "name"})
+
+    def test_build_steps_graph(self):
+        steps = [
+            Step(RunRequest("login").post("/login").extract().with_jmespath("body.token", "token")),
+            Step(RunRequest("profile").get("/profile").with_headers(**{"token": "$token"})),
+            Step(RunRequest("config").get("/config")),
+            Step(RunTestCase("ref").call(ReferencedCase)),
+            Step(RunRequest("items").get("/items")),
+            Step(RunRequest("logout").get("/logout/$token")),
+        ]
+        self.assertEqual(
+            build_steps_graph([step.struct() for step in steps]),
+            [set(), {0}, set(), {0, 1, 2}, {3}, {0, 3}],
+        )
@@ -1,25 +1,31 @@
-import json
+import asyncio
+import contextvars
+import copy
 import time
-from typing import Any, Dict, List, Text, Union
+from typing import Any, Callable, Dict, List, NamedTuple, Text, Union
 
 import requests
 from loguru import logger
 
-from httprunner import utils
+from httprunner import json_codec, utils
+from httprunner.client import RECORD_FULL, RECORD_TRUNCATED
 from httprunner.exceptions import ValidationFailure
 from httprunner.ext.uploader import prepare_upload_step
 from httprunner.models import (
     Hooks,
     IStep,
     MethodEnum,
+    SessionData,
     StepResult,
     TRequest,
     TStep,
     VariablesMapping,
 )
-from httprunner.parser import build_url, parse_variables_mapping
-from httprunner.response import ResponseObject
+from httprunner.parser import DataTemplate, build_url
+from httprunner.response import ResponseObject, get_step_validators_plan
+from httprunner.response_view import ResponseView
 from httprunner.runner import ALLURE, HttpRunner
+from httprunner.timing import to_ms
 
 
 def call_hooks(
@@ -80,6 +86,7 @@ def call_hooks(
                             for func_name, func_obj in module_functions.items():
                                 runner.parser.functions_mapping[func_name] = func_obj
                                 logger.info(f"添加函数到运行时: {func_name}")
+                            runner.parser.invalidate_functions_cache()
 
                             # 执行函数（默认执行第一个函数）
                             first_func_name = list(module_functions.keys())[0]
@@ -134,7 +141,6 @@ def execute_sql_hook(runner: HttpRunner, sql_hook: Dict, step_variables: Variabl
         step_variables: 步骤变量
     """
     import time
-    import json
     import traceback
     import sys
     from loguru import logger
@@ -150,7 +156,7 @@ def execute_sql_hook(runner: HttpRunner, sql_hook: Dict, step_variables: Variabl
 
     # 记录详细的钩子配置
     try:
-        hook_config = json.dumps(sql_hook, indent=2, ensure_ascii=False)  # 确保不转义中文字符
+        hook_config = json_codec.dumps(sql_hook, indent=True)  # 不转义中文字符
         logger.debug(f"{hook_prefix} 配置:\n{hook_config}")
         print(f"{hook_prefix} 配置:\n{hook_config}")  # 直接打印配置到控制台
     except Exception as e:
@@ -160,6 +166,11 @@ def execute_sql_hook(runner: HttpRunner, sql_hook: Dict, step_variables: Variabl
     sql = sql_hook.get("sql")
     db_id = sql_hook.get("db_id")
     var_name = sql_hook.get("var_name")
+    # 命名绑定参数, 如 where id = :user_id, 未指定的参数从步骤变量中获取
+    sql_params = sql_hook.get("params")
+    # 大结果集读取方式, fetch_type为aggregate时只返回行数、校验和及前几行
+    hook_fetch_type = sql_hook.get("fetch_type")
+    max_rows = sql_hook.get("max_rows", 0)
 
     # 检查SQL语句
     if not sql:
@@ -229,9 +240,19 @@ def execute_sql_hook(runner: HttpRunner, sql_hook: Dict, step_variables: Variabl
                     logger.info(exec_start_msg)
                     print(exec_start_msg)
 
+                    from httprunner.database.statement import bind_params, compile_sql
+
+                    if isinstance(sql_params, (str, dict, list)):
+                        sql_params = runner.parser.parse_data(sql_params, step_variables)
+                    sql_params = bind_params(compile_sql(sql), sql_params, step_variables)
+
                     # 确定查询类型
                     fetch_type = "all"  # 默认获取全部
-                    if sql.upper().startswith("SELECT"):
+                    if hook_fetch_type:
+                        fetch_type = hook_fetch_type
+                    elif isinstance(sql_params, list):
+                        fetch_type = "none"  # 参数列表批量执行
+                    elif sql.upper().startswith("SELECT"):
                         if "LIMIT 1" in sql.upper() or sql.strip().endswith("LIMIT 1"):
                             fetch_type = "one"
                         else:
@@ -246,7 +267,7 @@ def execute_sql_hook(runner: HttpRunner, sql_hook: Dict, step_variables: Variabl
 
                     # 执行SQL
                     query_start = time.time()
-                    sql_result = execute_sql(sql, db_uri, fetch_type)
+                    sql_result = execute_sql(sql, db_uri, fetch_type, sql_params, max_rows)
                     query_elapsed = time.time() - query_start
 
                     # 记录执行结果
@@ -293,6 +314,10 @@ def execute_sql_hook(runner: HttpRunner, sql_hook: Dict, step_variables: Variabl
                                 # 复杂结果，保持原样
                                 step_variables[var_name] = sql_result
                                 var_msg = f"{hook_prefix} SQL完整结果赋值给变量: {var_name}"
+                        else:
+                            # 多列单行或聚合结果，保持原样
+                            step_variables[var_name] = sql_result
+                            var_msg = f"{hook_prefix} SQL完整结果赋值给变量: {var_name}"
 
                         logger.info(var_msg)
                         print(var_msg)
@@ -336,34 +361,82 @@ def execute_sql_hook(runner: HttpRunner, sql_hook: Dict, step_variables: Variabl
 
 
 def pretty_format(v) -> str:
-    if isinstance(v, dict):
-        return json.dumps(v, indent=4, ensure_ascii=False)
-
-    if isinstance(v, requests.structures.CaseInsensitiveDict):
-        return json.dumps(dict(v.items()), indent=4, ensure_ascii=False)
+    if isinstance(v, (dict, requests.structures.CaseInsensitiveDict)):
+        return json_codec.dumps(v, indent=True, default=json_codec.safe_default)
 
     return repr(utils.omit_long_data(v))
 
 
-def run_step_request(runner: HttpRunner, step: TStep) -> StepResult:
-    """run teststep: request"""
+def format_request_details(method: Text, url: Text, request_dict: Dict) -> Text:
+    request_print = "====== request details ======\n"
+    request_print += f"url: {url}\n"
+    request_print += f"method: {method}\n"
+    for k, v in request_dict.items():
+        request_print += f"{k}: {pretty_format(v)}\n"
+    return request_print
+
+
+def format_response_details(resp: requests.Response) -> Text:
+    response_print = "====== response details ======\n"
+    response_print += f"status_code: {resp.status_code}\n"
+    response_print += f"headers: {pretty_format(resp.headers)}\n"
+    resp_view = ResponseView.of(resp)
+    body = resp_view.spilled.summary() if resp_view.spilled else resp_view.body
+    response_print += f"body: {pretty_format(body)}\n"
+    return response_print
+
+
+def log_details(runner: HttpRunner, name: Text, format_details: Callable[[], Text]):
+    """log request or response details, formatting is skipped if no sink consumes
+    DEBUG messages and details are not attached to allure report"""
+    logger.opt(lazy=True).debug("{}", format_details)
+    if ALLURE is not None and runner.record_level in (RECORD_TRUNCATED, RECORD_FULL):
+        ALLURE.attach(
+            format_details(),
+            name=name,
+            attachment_type=ALLURE.attachment_type.TEXT,
+        )
+
+
+class PreparedStepRequest(NamedTuple):
+    """parsed request of teststep, ready to be sent by http session"""
+
+    step_result: StepResult
+    step_variables: VariablesMapping
+    method: Text
+    url: Text
+    kwargs: Dict
+    start_time: float
+    parse_ms: float
+    hooks_ms: float
+
+
+def prepare_step_request(runner: HttpRunner, step: TStep) -> PreparedStepRequest:
+    """parse request and call setup hooks of teststep"""
     step_result = StepResult(
         name=step.name,
         step_type="request",
         success=False,
     )
     start_time = time.time()
+    parse_start = time.perf_counter()
 
     # parse
     functions = runner.parser.functions_mapping
     step_variables = runner.merge_step_variables(step.variables)
     prepare_upload_step(step, step_variables, functions)
-    # parse variables
-    step_variables = parse_variables_mapping(step_variables, functions)
 
-    request_dict = step.request.dict()
-    request_dict.pop("upload", None)
-    parsed_request_dict = runner.parser.parse_data(request_dict, step_variables)
+    # compile request once per step, static subtrees are not walked again
+    request_template = step._templates.get("request")
+    if request_template is None:
+        request_dict = step.request.dict()
+        request_dict.pop("upload", None)
+        request_template = DataTemplate(request_dict)
+        step._templates["request"] = request_template
+    parsed_request_dict = runner.parser.parse_template(request_template, step_variables)
+    if step.setup_hooks or step.teardown_hooks:
+        # hooks may modify request in place, static subtrees must not be shared
+        parsed_request_dict = copy.deepcopy(parsed_request_dict)
 
     request_headers = parsed_request_dict.pop("headers", {})
     # omit pseudo header names for HTTP/1, e.g. :authority, :method, :path, :scheme
@@ -421,10 +494,12 @@ def run_step_request(runner: HttpRunner, step: TStep) -> StepResult:
     parsed_request_dict["headers"] = request_headers
 
     step_variables["request"] = parsed_request_dict
+    parse_end = time.perf_counter()
 
     # setup hooks
     if step.setup_hooks:
         call_hooks(runner, step.setup_hooks, step_variables, "setup request")
+    hooks_end = time.perf_counter()
 
     # prepare arguments
     config = runner.get_config()
@@ -435,73 +510,114 @@ def run_step_request(runner: HttpRunner, step: TStep) -> StepResult:
     parsed_request_dict["json"] = parsed_request_dict.pop("req_json", {})
 
     # log request
-    request_print = "====== request details ======\n"
-    request_print += f"url: {url}\n"
-    request_print += f"method: {method}\n"
-    for k, v in parsed_request_dict.items():
-        request_print += f"{k}: {pretty_format(v)}\n"
+    log_details(
+        runner,
+        "request details",
+        lambda: format_request_details(method, url, parsed_request_dict),
+    )
 
-    logger.debug(request_print)
-    if ALLURE is not None:
-        ALLURE.attach(
-            request_print,
-            name="request details",
-            attachment_type=ALLURE.attachment_type.TEXT,
-        )
-    resp = runner.session.request(method, url, **parsed_request_dict)
+    return PreparedStepRequest(
+        step_result,
+        step_variables,
+        method,
+        url,
+        parsed_request_dict,
+        start_time,
+        to_ms(parse_end - parse_start),
+        to_ms(hooks_end - parse_end),
+    )
 
-    # log response
-    response_print = "====== response details ======\n"
-    response_print += f"status_code: {resp.status_code}\n"
-    response_print += f"headers: {pretty_format(resp.headers)}\n"
 
-    try:
-        resp_body = resp.json()
-    except (requests.exceptions.JSONDecodeError, json.decoder.JSONDecodeError):
-        resp_body = resp.content
+def finish_step_request(
+    runner: HttpRunner,
+    step: TStep,
+    prepared: PreparedStepRequest,
+    resp: requests.Response,
+    session_data: SessionData,
+) -> StepResult:
+    """call teardown hooks, extract and validate response of teststep"""
+    step_result, step_variables = prepared.step_result, prepared.step_variables
 
-    response_print += f"body: {pretty_format(resp_body)}\n"
-    logger.debug(response_print)
-    if ALLURE is not None:
-        ALLURE.attach(
-            response_print,
-            name="response details",
-            attachment_type=ALLURE.attachment_type.TEXT,
-        )
+    # log response
+    log_details(runner, "response details", lambda: format_response_details(resp))
     resp_obj = ResponseObject(resp, runner.parser)
     step_variables["response"] = resp_obj
 
     # teardown hooks
+    hooks_start = time.perf_counter()
     if step.teardown_hooks:
         call_hooks(runner, step.teardown_hooks, step_variables, "teardown request")
+    extract_start = time.perf_counter()
 
     # extract
     extractors = step.extract
     extract_mapping = resp_obj.extract(extractors, step_variables)
     step_result.export_vars = extract_mapping
+    validate_start = time.perf_counter()
 
     variables_mapping = step_variables
     variables_mapping.update(extract_mapping)
 
-    # validate
-    validators = step.validators
+    # validate, validators are compiled once per step
+    validators = get_step_validators_plan(step)
     try:
         resp_obj.validate(validators, variables_mapping)
         step_result.success = True
     except ValidationFailure:
         raise
     finally:
-        session_data = runner.session.data
         session_data.success = step_result.success
         session_data.validators = resp_obj.validation_results
 
+        stat = session_data.stat
+        stat.parse_ms = prepared.parse_ms
+        stat.hooks_ms = round(prepared.hooks_ms + to_ms(extract_start - hooks_start), 2)
+        stat.extract_ms = to_ms(validate_start - extract_start)
+        stat.validate_ms = to_ms(time.perf_counter() - validate_start)
+
         # save step data
         step_result.data = session_data
-        step_result.elapsed = time.time() - start_time
+        step_result.elapsed = time.time() - prepared.start_time
 
     return step_result
 
 
+def run_step_request(runner: HttpRunner, step: TStep) -> StepResult:
+    """run teststep: request"""
+    prepared = prepare_step_request(runner, step)
+    resp = runner.session.request(prepared.method, prepared.url, **prepared.kwargs)
+    return finish_step_request(runner, step, prepared, resp, runner.session.data)
+
+
+async def async_run_step_request(runner: HttpRunner, step: TStep) -> StepResult:
+    """run teststep: request with runner.async_session.
+    parsing, hooks and validation may be blocking (e.g. hooks querying database),
+    thus they are run in default executor, only sending request awaits in event loop."""
+    if step.request.upload:
+        # multipart encoder streams files, which is only supported by requests
+        return await asyncio.get_running_loop().run_in_executor(
+            None, contextvars.copy_context().run, run_step_request, runner, step
+        )
+
+    # context is copied, thus logs in executor are kept in run log of testcase
+    loop = asyncio.get_running_loop()
+    prepared = await loop.run_in_executor(
+        None, contextvars.copy_context().run, prepare_step_request, runner, step
+    )
+    session = runner.async_session
+    resp = await session.request(prepared.method, prepared.url, **prepared.kwargs)
+    return await loop.run_in_executor(
+        None,
+        contextvars.copy_context().run,
+        finish_step_request,
+        runner,
+        step,
+        prepared,
+        resp,
+        session.data,
+    )
+
+
 class StepRequestValidation(IStep):
     def __init__(self, step: TStep):
         self.__step = step
@@ -660,6 +776,9 @@ class StepRequestValidation(IStep):
     def run(self, runner: HttpRunner):
         return run_step_request(runner, self.__step)
 
+    async def async_run(self, runner: HttpRunner):
+        return await async_run_step_request(runner, self.__step)
+
 
 class StepRequestExtraction(IStep):
     def __init__(self, step: TStep):
@@ -692,6 +811,9 @@ class StepRequestExtraction(IStep):
     def run(self, runner: HttpRunner):
         return run_step_request(runner, self.__step)
 
+    async def async_run(self, runner: HttpRunner):
+        return await async_run_step_request(runner, self.__step)
+
 
 class RequestWithOptionalArgs(IStep):
     def __init__(self, step: TStep):
@@ -761,6 +883,9 @@ class RequestWithOptionalArgs(IStep):
     def run(self, runner: HttpRunner):
         return run_step_request(runner, self.__step)
 
+    async def async_run(self, runner: HttpRunner):
+        return await async_run_step_request(runner, self.__step)
+
 
 class RunRequest(object):
     def __init__(self, name: Text):
@@ -8,7 +8,8 @@ from loguru import logger
 from httprunner import utils
 from httprunner.exceptions import SqlMethodNotSupport, ValidationFailure
 from httprunner.models import IStep, SqlMethodEnum, StepResult, TSqlRequest, TStep
-from httprunner.response import SqlResponseObject
+from httprunner.parser import DataTemplate
+from httprunner.response import SqlResponseObject, get_step_validators_plan
 from httprunner.runner import ALLURE, HttpRunner
 from httprunner.step_request import (
     StepRequestExtraction,
@@ -52,8 +53,13 @@ def run_step_sql_request(runner: HttpRunner, step: TStep) -> StepResult:
     )
     step_variables = runner.merge_step_variables(step.variables)
     # parse
-    request_dict = step.sql_request.dict()
-    parsed_request_dict = runner.parser.parse_data(request_dict, step_variables)
+    request_template = step._templates.get("sql_request")
+    if request_template is None:
+        request_template = DataTemplate(step.sql_request.dict())
+        step._templates["sql_request"] = request_template
+    parsed_request_dict = runner.parser.parse_template(request_template, step_variables)
+    # db_config is filled with config defaults below, do not modify shared template
+    parsed_request_dict["db_config"] = dict(parsed_request_dict["db_config"])
     config = runner.get_config()
     parsed_request_dict["db_config"]["psm"] = (
         parsed_request_dict["db_config"]["psm"] or config.db.psm
@@ -74,15 +80,13 @@ def run_step_sql_request(runner: HttpRunner, step: TStep) -> StepResult:
         parsed_request_dict["db_config"]["database"] or config.db.database
     )
 
-    if not runner.db_engine:
+    db_engine = runner.db_engine
+    if not db_engine:
         ensure_sql_ready()
-        from httprunner.database.engine import DBEngine
+        from httprunner.database.engine import build_db_uri
 
-        runner.db_engine = DBEngine(
-            f'mysql+pymysql://{parsed_request_dict["db_config"]["user"]}:'
-            f'{parsed_request_dict["db_config"]["password"]}@{parsed_request_dict["db_config"]["ip"]}:'
-            f'{parsed_request_dict["db_config"]["port"]}/{parsed_request_dict["db_config"]["database"]}'
-            f"?charset=utf8mb4"
+        db_engine = runner.get_or_create_db_engine(
+            build_db_uri(parsed_request_dict["db_config"])
         )
 
     # parsed_request_dict["headers"].setdefault(
@@ -109,21 +113,43 @@ def run_step_sql_request(runner: HttpRunner, step: TStep) -> StepResult:
             name="sql request details",
             attachment_type=ALLURE.attachment_type.TEXT,
         )
-    logger.info(f"Executing SQL: {parsed_request_dict['sql']}")
+    # values of named bind parameters, missing ones are taken from step variables
+    from httprunner.database.statement import bind_params, compile_sql
+
+    sql = parsed_request_dict["sql"].strip()
+    params = bind_params(
+        compile_sql(sql), parsed_request_dict.get("params"), step_variables
+    )
+    json_columns = parsed_request_dict["json_columns"]
+    logger.info(f"Executing SQL: {sql}")
     if step.sql_request.method == SqlMethodEnum.FETCHONE:
-        sql_resp = runner.db_engine.fetchone(parsed_request_dict["sql"])
+        sql_resp = db_engine.fetchone(sql, params=params, json_columns=json_columns)
     elif step.sql_request.method == SqlMethodEnum.INSERT:
-        sql_resp = runner.db_engine.insert(parsed_request_dict["sql"])
+        sql_resp = db_engine.insert(sql, params=params)
     elif step.sql_request.method == SqlMethodEnum.FETCHMANY:
-        sql_resp = runner.db_engine.fetchmany(
-            parsed_request_dict["sql"], parsed_request_dict["size"]
+        sql_resp = db_engine.fetchmany(
+            sql, parsed_request_dict["size"], params=params, json_columns=json_columns
         )
     elif step.sql_request.method == SqlMethodEnum.FETCHALL:
-        sql_resp = runner.db_engine.fetchall(parsed_request_dict["sql"])
+        sql_resp = db_engine.fetchall(
+            sql,
+            params=params,
+            max_rows=parsed_request_dict["max_rows"],
+            json_columns=json_columns,
+        )
+    elif step.sql_request.method == SqlMethodEnum.AGGREGATE:
+        sql_resp = db_engine.aggregate(
+            sql,
+            params=params,
+            max_rows=parsed_request_dict["max_rows"],
+            chunk_size=parsed_request_dict["chunk_size"],
+            preview_rows=parsed_request_dict["size"],
+            json_columns=json_columns,
+        )
     elif step.sql_request.method == SqlMethodEnum.UPDATE:
-        sql_resp = runner.db_engine.update(parsed_request_dict["sql"])
+        sql_resp = db_engine.update(sql, params=params)
     elif step.sql_request.method == SqlMethodEnum.DELETE:
-        sql_resp = runner.db_engine.delete(parsed_request_dict["sql"])
+        sql_resp = db_engine.delete(sql, params=params)
     else:
         raise SqlMethodNotSupport(
             f"step.sql_request.method {parsed_request_dict['method']} not support"
@@ -172,8 +198,8 @@ def run_step_sql_request(runner: HttpRunner, step: TStep) -> StepResult:
     variables_mapping = step_variables
     variables_mapping.update(extract_mapping)
 
-    # validate
-    validators = step.validators
+    # validate, validators are compiled once per step
+    validators = get_step_validators_plan(step)
     try:
         resp_obj.validate(validators, variables_mapping)
         step_result.success = True
@@ -199,6 +225,10 @@ class StepSqlRequestValidation(StepRequestValidation):
     def run(self, runner: HttpRunner):
         return run_step_sql_request(runner, self.__step)
 
+    async def async_run(self, runner: HttpRunner):
+        # blocking step, do not inherit asyncio request from http step
+        return await IStep.async_run(self, runner)
+
 
 class StepSqlRequestExtraction(StepRequestExtraction):
     def __init__(self, step: TStep):
@@ -208,6 +238,10 @@ class StepSqlRequestExtraction(StepRequestExtraction):
     def run(self, runner: HttpRunner):
         return run_step_sql_request(runner, self.__step)
 
+    async def async_run(self, runner: HttpRunner):
+        # blocking step, do not inherit asyncio request from http step
+        return await IStep.async_run(self, runner)
+
     def validate(self) -> StepSqlRequestValidation:
         return StepSqlRequestValidation(self.__step)
 
@@ -249,9 +283,25 @@ class RunSqlRequest(IStep):
         self.__step.sql_request.size = size
         return self
 
-    def fetchall(self, sql) -> "RunSqlRequest":
+    def fetchall(self, sql, max_rows=0) -> "RunSqlRequest":
+        """max_rows: fetch at most max_rows rows with server-side cursor, 0 means
+        DEFAULT_MAX_ROWS rows"""
         self.__step.sql_request.method = SqlMethodEnum.FETCHALL
         self.__step.sql_request.sql = sql
+        self.__step.sql_request.max_rows = max_rows
+        return self
+
+    def aggregate(
+        self, sql, preview_rows=10, max_rows=0, chunk_size=1000
+    ) -> "RunSqlRequest":
+        """stream rows with server-side cursor, chunk_size rows per round trip, and
+        only keep count, checksum, columns and first preview_rows rows as response,
+        e.g. validate().assert_equal("count", 500000)"""
+        self.__step.sql_request.method = SqlMethodEnum.AGGREGATE
+        self.__step.sql_request.sql = sql
+        self.__step.sql_request.size = preview_rows
+        self.__step.sql_request.max_rows = max_rows
+        self.__step.sql_request.chunk_size = chunk_size
         return self
 
     def update(self, sql) -> "RunSqlRequest":
@@ -269,6 +319,22 @@ class RunSqlRequest(IStep):
         self.__step.sql_request.sql = sql
         return self
 
+    def with_params(self, params=None, **kwargs) -> "RunSqlRequest":
+        """values of named bind parameters in sql, e.g. `where id = :user_id`,
+        bind parameters missing in params are taken from step variables.
+        params may also be a list of dicts or variable reference like "$rows",
+        which is executed with executemany in one round trip"""
+        if isinstance(params, dict) or params is None:
+            params = {**(params or {}), **kwargs}
+        self.__step.sql_request.params = params
+        return self
+
+    def with_json_columns(self, *columns) -> "RunSqlRequest":
+        """decode json string of columns, columns declared as JSON type, e.g. MySQL
+        JSON or PostgreSQL json/jsonb, are always decoded"""
+        self.__step.sql_request.json_columns = list(columns)
+        return self
+
     def with_retry(self, retry_times, retry_interval) -> "RunSqlRequest":
         self.__step.retry_times = retry_times
         self.__step.retry_interval = retry_interval
@@ -16,7 +16,8 @@ from httprunner.models import (
     TStep,
     TThriftRequest,
 )
-from httprunner.response import ThriftResponseObject
+from httprunner.parser import DataTemplate
+from httprunner.response import ThriftResponseObject, get_step_validators_plan
 from httprunner.runner import ALLURE, HttpRunner
 from httprunner.step_request import (
     StepRequestExtraction,
@@ -62,8 +63,11 @@ def run_step_thrift_request(runner: HttpRunner, step: TStep) -> StepResult:
     )
     step_variables = runner.merge_step_variables(step.variables)
     # parse
-    request_dict = step.thrift_request.dict()
-    parsed_request_dict = runner.parser.parse_data(request_dict, step_variables)
+    request_template = step._templates.get("thrift_request")
+    if request_template is None:
+        request_template = DataTemplate(step.thrift_request.dict())
+        step._templates["thrift_request"] = request_template
+    parsed_request_dict = runner.parser.parse_template(request_template, step_variables)
     config = runner.get_config()
     parsed_request_dict["psm"] = parsed_request_dict["psm"] or config.thrift.psm
     parsed_request_dict["env"] = parsed_request_dict["env"] or config.thrift.env
@@ -175,8 +179,8 @@ def run_step_thrift_request(runner: HttpRunner, step: TStep) -> StepResult:
     variables_mapping = step_variables
     variables_mapping.update(extract_mapping)
 
-    # validate
-    validators = step.validators
+    # validate, validators are compiled once per step
+    validators = get_step_validators_plan(step)
     try:
         resp_obj.validate(validators, variables_mapping)
         step_result.success = True
@@ -202,6 +206,10 @@ class StepThriftRequestValidation(StepRequestValidation):
     def run(self, runner: HttpRunner):
         return run_step_thrift_request(runner, self.__step)
 
+    async def async_run(self, runner: HttpRunner):
+        # blocking step, do not inherit asyncio request from http step
+        return await IStep.async_run(self, runner)
+
 
 class StepThriftRequestExtraction(StepRequestExtraction):
     def __init__(self, step: TStep):
@@ -211,6 +219,10 @@ class StepThriftRequestExtraction(StepRequestExtraction):
     def run(self, runner: HttpRunner):
         return run_step_thrift_request(runner, self.__step)
 
+    async def async_run(self, runner: HttpRunner):
+        # blocking step, do not inherit asyncio request from http step
+        return await IStep.async_run(self, runner)
+
     def validate(self) -> StepThriftRequestValidation:
         return StepThriftRequestValidation(self.__step)
 
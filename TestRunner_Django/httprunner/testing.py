@@ -0,0 +1,27 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Text, Type
+
+
+class LocalServerTestCase(unittest.TestCase):
+    """serve handler_class on a random local port during tests of the class,
+    requests are sent to base_url, e.g. f"{self.base_url}/get"
+    """
+
+    handler_class: Type[BaseHTTPRequestHandler] = None
+    # host in base_url, e.g. localhost to resolve name
+    url_host: Text = "127.0.0.1"
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), cls.handler_class)
+        cls.base_url = f"http://{cls.url_host}:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
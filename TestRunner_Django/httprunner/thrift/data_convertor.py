@@ -10,6 +10,8 @@ import base64
 
 from thrift.Thrift import TType
 
+from httprunner import json_codec
+
 try:
     from _json import encode_basestring_ascii as c_encode_basestring_ascii
 except ImportError:
@@ -242,14 +244,16 @@ class ThriftJSONDecoder(json.JSONDecoder):
 
 def json2thrift(json_str, thrift_class):
     logging.debug(json_str)
-    return json.loads(
-        json_str, cls=ThriftJSONDecoder, thrift_class=thrift_class, strict=False
-    )
+    if not isinstance(json_str, dict):
+        json_str = json_codec.loads(json_str, strict=False)
+    return ThriftJSONDecoder(thrift_class=thrift_class).decode(json_str)
 
 
 def dumper(obj):
     try:
-        return json.dumps(obj, default=lambda o: o.__dict__, sort_keys=True, indent=2, ensure_ascii=False)
+        return json_codec.dumps(
+            obj, indent=True, sort_keys=True, default=lambda o: o.__dict__
+        )
     except:
         return obj.__dict__
 
@@ -446,6 +450,10 @@ class ThriftJSONEncoder(json.JSONEncoder):
 
 
 def thrift2json(obj, skip_nonutf8_value=False):
+    if not skip_nonutf8_value:
+        # 无需逐块过滤非utf-8字段时, 走json_codec快速序列化
+        return json_codec.dumps(obj, default=ThriftJSONEncoder().default)
+
     return json.dumps(
         obj,
         cls=ThriftJSONEncoder,
@@ -456,7 +464,7 @@ def thrift2json(obj, skip_nonutf8_value=False):
 
 def thrift2dict(obj):
     str = thrift2json(obj)
-    return json.loads(str)
+    return json_codec.loads(str)
 
 
 dict2thrift = json2thrift
@@ -0,0 +1,117 @@
+import socket
+import time
+from typing import Dict
+
+from requests import Response
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+
+def to_ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+class TimedConnectionMixin(object):
+    """record DNS, TCP connect and TLS handshake time of new connections.
+
+    timing is kept on connection until taken by the first response sent through it,
+    thus responses on reused connections report zero connection phases.
+    """
+
+    timing = None
+
+    def _new_conn(self):
+        dns_host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(
+                dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM
+            )
+        except socket.gaierror:
+            # let urllib3 raise NewConnectionError
+            addresses = []
+        resolved = time.perf_counter()
+
+        if not addresses:
+            conn = super(TimedConnectionMixin, self)._new_conn()
+        else:
+            conn = self.__connect_resolved(addresses)
+
+        self.timing = {
+            "dns_ms": to_ms(resolved - start),
+            "tcp_ms": to_ms(time.perf_counter() - resolved),
+            "tls_ms": 0,
+        }
+        return conn
+
+    def __connect_resolved(self, addresses):
+        # try resolved addresses in order like urllib3 does, e.g. IPv6 then IPv4
+        dns_host = self._dns_host
+        error = None
+        try:
+            for *_, sockaddr in addresses:
+                self._dns_host = sockaddr[0]
+                try:
+                    return super(TimedConnectionMixin, self)._new_conn()
+                except (NewConnectionError, ConnectTimeoutError) as ex:
+                    error = ex
+        finally:
+            self._dns_host = dns_host
+
+        raise error
+
+    def connect(self):
+        start = time.perf_counter()
+        super(TimedConnectionMixin, self).connect()
+        if isinstance(self, HTTPSConnection) and self.timing:
+            # remaining time of connect is TLS handshake (and proxy tunnel)
+            connected_ms = to_ms(time.perf_counter() - start)
+            self.timing["tls_ms"] = round(
+                max(0, connected_ms - self.timing["dns_ms"] - self.timing["tcp_ms"]), 2
+            )
+
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter creating connections with timing, proxied connections excluded"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(TimingHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+def pop_connection_timing(response: Response) -> Dict:
+    """take connection phases of new connection used by response, must be called
+    before response content is consumed, i.e. connection is released to pool"""
+    try:
+        conn = response.raw._connection
+    except AttributeError:
+        return {}
+
+    timing = getattr(conn, "timing", None)
+    if not timing:
+        return {}
+
+    conn.timing = None
+    return timing
@@ -0,0 +1,74 @@
+from http.server import BaseHTTPRequestHandler
+
+from httprunner import Config, RunRequest, Step
+from httprunner.client import HttpSession, record_timing
+from httprunner.models import RequestStat
+from httprunner.runner import SessionRunner
+from httprunner.testing import LocalServerTestCase
+
+
+class ChunkedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in (b'{"code": ', b"0}"):
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTiming(LocalServerTestCase):
+    handler_class = ChunkedHandler
+    url_host = "localhost"
+
+    def test_record_timing(self):
+        stat = RequestStat()
+        record_timing(stat, 1.5, {"dns_ms": 10, "tcp_ms": 20, "tls_ms": 30}, 5)
+        # seconds of elapsed are kept
+        self.assertEqual(stat.elapsed_ms, 1500)
+        self.assertEqual(stat.ttfb_ms, 1440)
+        self.assertEqual(stat.download_ms, 5)
+
+    def test_connection_phases(self):
+        session = HttpSession()
+        resp = session.request("GET", f"{self.base_url}/get")
+        self.assertEqual(resp.json(), {"code": 0})
+        stat = session.data.stat
+        self.assertGreater(stat.dns_ms + stat.tcp_ms, 0)
+        self.assertEqual(stat.tls_ms, 0)
+        self.assertEqual(stat.content_size, 11)
+        self.assertEqual(session.data.address.server_port, self.server.server_address[1])
+
+        # connection reused
+        session.request("GET", f"{self.base_url}/get")
+        stat = session.data.stat
+        self.assertEqual((stat.dns_ms, stat.tcp_ms, stat.tls_ms), (0, 0, 0))
+        self.assertGreater(stat.ttfb_ms, 0)
+        session.close()
+
+    def test_runner_phases(self):
+        class TestCaseTiming(SessionRunner):
+            config = Config("timing").base_url(self.base_url)
+            teststeps = [
+                Step(
+                    RunRequest("get")
+                    .get("/get")
+                    .extract()
+                    .with_jmespath("body.code", "code")
+                    .validate()
+                    .assert_equal("body.code", 0)
+                )
+            ]
+
+        runner = TestCaseTiming()
+        runner.test_start()
+        stat = runner.get_summary().step_results[0].data.stat
+        self.assertGreater(stat.parse_ms, 0)
+        self.assertGreater(stat.extract_ms, 0)
+        self.assertGreater(stat.validate_ms, 0)
@@ -1,7 +1,5 @@
 import collections
 import copy
-import itertools
-import json
 import os
 import os.path
 import platform
@@ -10,13 +8,13 @@ import sys
 import time
 import uuid
 from multiprocessing import Queue
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List
 
 import requests
 import sentry_sdk
 from loguru import logger
 
-from httprunner import __version__, exceptions
+from httprunner import __version__, exceptions, json_codec
 from httprunner.models import VariablesMapping
 
 
@@ -229,7 +227,7 @@ def print_info(info_mapping):
         if isinstance(value, (tuple, collections.deque)):
             continue
         elif isinstance(value, (dict, list)):
-            value = json.dumps(value, ensure_ascii=False)
+            value = json_codec.dumps(value, default=json_codec.safe_default)
         elif value is None:
             value = "None"
 
@@ -270,16 +268,10 @@ def sort_dict_by_custom_order(raw_dict: Dict, custom_order: List):
     )
 
 
-class ExtendJSONEncoder(json.JSONEncoder):
+class ExtendJSONEncoder(json_codec.CodecJSONEncoder):
     """especially used to safely dump json data with python object,
     such as MultipartEncoder"""
 
-    def default(self, obj):
-        try:
-            return super(ExtendJSONEncoder, self).default(obj)
-        except (UnicodeDecodeError, TypeError):
-            return repr(obj)
-
 
 def merge_variables(
     variables: VariablesMapping, variables_to_be_overridden: VariablesMapping
@@ -287,7 +279,7 @@ def merge_variables(
     """merge two variables mapping, the first variables have higher priority"""
     step_new_variables = {}
     for key, value in variables.items():
-        if f"${key}" == value or "${" + key + "}" == value:
+        if is_self_reference_variable(key, value):
             # e.g. {"base_url": "$base_url"}
             # or {"base_url": "${base_url}"}
             continue
@@ -299,6 +291,42 @@ def merge_variables(
     return merged_variables
 
 
+def is_self_reference_variable(key: Any, value: Any) -> bool:
+    """check if variable references the variable with the same name in lower priority,
+    e.g. {"base_url": "$base_url"} or {"base_url": "${base_url}"}"""
+    return f"${key}" == value or "${" + key + "}" == value
+
+
+class VariablesScope(collections.ChainMap):
+    """layered variables mapping with copy-on-write semantics.
+
+    Layers are searched from top to bottom, e.g. extracted > step > session > config,
+    writes and deletions only touch the top layer. Lower layers are shared by reference
+    and never copied, so creating a scope for each step costs O(1) whatever the size
+    of session or config variables.
+
+    Examples:
+        >>> config_variables = {"base_url": "https://httpbin.org", "token": "abc"}
+        >>> session_variables = {"token": "def"}
+        >>> scope = VariablesScope(session_variables, config_variables)
+        >>> step_scope = scope.new_step({"base_url": "$base_url", "uid": 1})
+        >>> step_scope["token"], step_scope["base_url"], step_scope["uid"]
+            ("def", "https://httpbin.org", 1)
+        >>> step_scope["token"] = "xyz"  # session_variables is unchanged
+
+    """
+
+    def new_step(self, step_variables: VariablesMapping) -> "VariablesScope":
+        """create child scope with step variables layer,
+        variables referencing itself are omitted to inherit lower layer values"""
+        step_layer = {
+            key: value
+            for key, value in step_variables.items()
+            if not is_self_reference_variable(key, value)
+        }
+        return self.new_child(step_layer)
+
+
 def is_support_multiprocessing() -> bool:
     try:
         Queue()
@@ -339,15 +367,62 @@ def gen_cartesian_product(*args: List[Dict]) -> List[Dict]:
     elif len(args) == 1:
         return args[0]
 
-    product_list = []
-    for product_item_tuple in itertools.product(*args):
-        product_item_dict = {}
-        for item in product_item_tuple:
-            product_item_dict.update(item)
+    return list(iter_cartesian_product(*args))
+
 
-        product_list.append(product_item_dict)
+def iter_cartesian_product(
+    *args: Iterable[Dict], shard_index: int = 0, shard_count: int = 1
+) -> Iterator[Dict]:
+    """generate cartesian product lazily, in the same order as gen_cartesian_product.
+
+    The first iterable is consumed as a stream, e.g. rows read from a large csv file,
+    the others are loaded into memory since they are iterated repeatedly. Put the
+    largest parameter first to keep memory usage low.
+
+    With sharding, only items whose index i in the whole product satisfy
+    i % shard_count == shard_index are generated, thus N workers can split the
+    parameter space without materializing it. Skipped items are never built.
+
+    Examples:
+        >>> arg1 = [{"a": 1}, {"a": 2}]
+        >>> arg2 = [{"x": 111}, {"x": 121}]
+        >>> list(iter_cartesian_product(arg1, arg2, shard_index=1, shard_count=2))
+            [{'a': 1, 'x': 121}, {'a': 2, 'x': 121}]
+
+    """
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise exceptions.ParamsError(
+            f"invalid shard: index {shard_index} of {shard_count}"
+        )
+
+    if not args:
+        return
+
+    outer, inners = args[0], [list(arg) for arg in args[1:]]
+    inner_count = 1
+    for inner in inners:
+        inner_count *= len(inner)
+    if inner_count == 0:
+        return
 
-    return product_list
+    for outer_index, outer_item in enumerate(outer):
+        # index of the first inner item belonging to this shard
+        start = (shard_index - outer_index * inner_count) % shard_count
+        for inner_index in range(start, inner_count, shard_count):
+            if not inners:
+                yield outer_item
+                continue
+
+            # decode inner index in mixed radix, the last inner iterable varies fastest
+            inner_items = []
+            for inner in reversed(inners):
+                inner_index, item_index = divmod(inner_index, len(inner))
+                inner_items.append(inner[item_index])
+
+            product_item_dict = dict(outer_item)
+            for item in reversed(inner_items):
+                product_item_dict.update(item)
+            yield product_item_dict
 
 
 LOGGER_FORMAT = (
@@ -6,7 +6,7 @@ from pathlib import Path
 
 import toml
 
-from httprunner import __version__, loader, utils
+from httprunner import __version__, exceptions, loader, utils
 from httprunner.utils import ExtendJSONEncoder, merge_variables, ga4_client
 
 
@@ -127,6 +127,25 @@ class TestUtils(unittest.TestCase):
             {"base_url": "https://postman-echo.com", "foo1": "bar1"},
         )
 
+    def test_variables_scope(self):
+        config_variables = {"base_url": "https://postman-echo.com", "foo1": "bar111"}
+        session_variables = {"token": "abc"}
+        scope = utils.VariablesScope(session_variables, config_variables)
+        step_scope = scope.new_step({"base_url": "$base_url", "foo1": "bar1"})
+        self.assertEqual(step_scope["base_url"], "https://postman-echo.com")
+        self.assertEqual(step_scope["foo1"], "bar1")
+        self.assertEqual(step_scope["token"], "abc")
+
+        # writes only touch the top layer
+        step_scope["token"] = "def"
+        del step_scope["foo1"]
+        self.assertEqual(step_scope["token"], "def")
+        self.assertEqual(step_scope["foo1"], "bar111")
+        self.assertEqual(session_variables, {"token": "abc"})
+        self.assertEqual(
+            config_variables, {"base_url": "https://postman-echo.com", "foo1": "bar111"}
+        )
+
     def test_cartesian_product_one(self):
         parameters_content_list = [[{"a": 1}, {"a": 2}]]
         product_list = utils.gen_cartesian_product(*parameters_content_list)
@@ -148,6 +167,30 @@ class TestUtils(unittest.TestCase):
             ],
         )
 
+    def test_iter_cartesian_product_sharding(self):
+        parameters_content_list = [
+            [{"a": 1}, {"a": 2}, {"a": 3}],
+            [{"x": 111}, {"x": 121}],
+            [{"y": 1}, {"y": 2}],
+        ]
+        product_list = utils.gen_cartesian_product(*parameters_content_list)
+        self.assertEqual(len(product_list), 12)
+
+        for shard_count in (1, 3, 5):
+            for shard_index in range(shard_count):
+                shard = utils.iter_cartesian_product(
+                    iter(parameters_content_list[0]),
+                    *parameters_content_list[1:],
+                    shard_index=shard_index,
+                    shard_count=shard_count,
+                )
+                self.assertEqual(
+                    list(shard), product_list[shard_index::shard_count]
+                )
+
+        with self.assertRaises(exceptions.ParamsError):
+            list(utils.iter_cartesian_product([{"a": 1}], shard_index=2, shard_count=2))
+
     def test_cartesian_product_empty(self):
         parameters_content_list = []
         product_list = utils.gen_cartesian_product(*parameters_content_list)
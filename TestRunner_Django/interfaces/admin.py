@@ -20,7 +20,7 @@ class InterfaceResource(resources.ModelResource):
             # HTTP字段
             'method', 'url', 'headers', 'params', 'body',
             # SQL字段
-            'sql_method', 'sql', 'sql_params', 'sql_size',
+            'sql_method', 'sql', 'sql_params', 'sql_size', 'sql_max_rows',
             # 通用字段
             'setup_hooks', 'teardown_hooks', 'variables', 'validators', 'extract',
             'created_by'
@@ -66,7 +66,7 @@ class InterfaceAdmin(ImportExportModelAdmin):
             'description': _('仅HTTP接口需要配置')
         }),
         (_('SQL接口配置'), {
-            'fields': ('sql_method', 'sql', 'sql_params', 'sql_size'),
+            'fields': ('sql_method', 'sql', 'sql_params', 'sql_size', 'sql_max_rows'),
             'classes': ('collapse',),  # 默认折叠
             'description': _('仅SQL接口需要配置，sql_size仅用于fetchmany方法')
         }),
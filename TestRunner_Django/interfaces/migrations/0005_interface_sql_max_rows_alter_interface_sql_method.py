@@ -0,0 +1,42 @@
+# Generated by Django 4.2.17 on 2026-10-17 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interfaces", "0004_interface_sql_interface_sql_method_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="interface",
+            name="sql_max_rows",
+            field=models.IntegerField(
+                blank=True,
+                default=0,
+                help_text="fetchall和aggregate使用服务端游标最多读取的行数，0表示不限制",
+                verbose_name="最大行数",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="interface",
+            name="sql_method",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("fetchone", "查询单条"),
+                    ("fetchmany", "查询多条"),
+                    ("fetchall", "查询所有"),
+                    ("insert", "插入"),
+                    ("update", "更新"),
+                    ("delete", "删除"),
+                    ("aggregate", "聚合统计"),
+                ],
+                max_length=20,
+                null=True,
+                verbose_name="SQL方法",
+            ),
+        ),
+    ]
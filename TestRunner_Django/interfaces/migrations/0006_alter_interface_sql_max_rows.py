@@ -0,0 +1,23 @@
+# Generated by Django 4.2.17 on 2026-10-17 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interfaces", "0005_interface_sql_max_rows_alter_interface_sql_method"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="interface",
+            name="sql_max_rows",
+            field=models.IntegerField(
+                blank=True,
+                default=0,
+                help_text="fetchall和aggregate使用服务端游标最多读取的行数，0表示fetchall最多读取10万行、aggregate不限制",
+                verbose_name="最大行数",
+            ),
+        ),
+    ]
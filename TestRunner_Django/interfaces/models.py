@@ -30,7 +30,8 @@ class Interface(models.Model):
         ('fetchall', '查询所有'),
         ('insert', '插入'),
         ('update', '更新'),
-        ('delete', '删除')
+        ('delete', '删除'),
+        ('aggregate', '聚合统计')
     ]
     
     # 基本信息
@@ -66,6 +67,10 @@ class Interface(models.Model):
     sql = models.TextField("SQL语句", blank=True, null=True)
     sql_params = models.JSONField("SQL参数", default=dict, blank=True)
     sql_size = models.IntegerField("查询条数", default=10, blank=True, help_text="仅用于fetchmany方法")
+    sql_max_rows = models.IntegerField(
+        "最大行数", default=0, blank=True,
+        help_text="fetchall和aggregate使用服务端游标最多读取的行数，0表示fetchall最多读取10万行、aggregate不限制"
+    )
     
     # httprunner 相关字段
     setup_hooks = models.JSONField(
@@ -146,6 +151,7 @@ class Interface(models.Model):
             self.sql = None
             self.sql_params = {}
             self.sql_size = 10
+            self.sql_max_rows = 0
         elif self.type == self.TYPE_SQL:
             self.method = None
             self.url = None
@@ -180,7 +186,8 @@ class Interface(models.Model):
                 'method': self.sql_method,
                 'sql': self.sql,
                 'params': self.sql_params,
-                'size': self.sql_size
+                'size': self.sql_size,
+                'max_rows': self.sql_max_rows
             })
             
         return data
@@ -392,7 +392,12 @@ class InterfaceRunner(HttpRunner):
             size = self.interface_data.get('size', 10)
             step_obj = step_obj.fetchmany(sql, size)
         elif sql_method == 'fetchall':
-            step_obj = step_obj.fetchall(sql)
+            step_obj = step_obj.fetchall(sql, self.interface_data.get('max_rows', 0))
+        elif sql_method == 'aggregate':
+            # 大结果集只保留行数、校验和及前几行
+            step_obj = step_obj.aggregate(
+                sql, self.interface_data.get('size', 10), self.interface_data.get('max_rows', 0)
+            )
         elif sql_method == 'insert':
             step_obj = step_obj.insert(sql)
         elif sql_method == 'update':
@@ -402,6 +407,10 @@ class InterfaceRunner(HttpRunner):
         else:
             logger.warning(f"不支持的SQL方法: {sql_method}，将使用fetchone")
             step_obj = step_obj.fetchone(sql)
+
+        # 命名绑定参数, SQL中使用 :name 引用
+        if self.interface_data.get('params'):
+            step_obj = step_obj.with_params(self.interface_data['params'])
         
         # 添加teardown hooks（SQL步骤）
         if self.interface_data.get('teardown_hooks'):
@@ -419,7 +419,7 @@ class InterfaceViewSet(viewsets.ModelViewSet, BaseAPIView):
             if interface_type == 'http':
                 fields = ['method', 'url', 'headers', 'params', 'body']
             elif interface_type == 'sql':
-                fields = ['sql_method', 'sql', 'sql_params', 'sql_size']
+                fields = ['sql_method', 'sql', 'sql_params', 'sql_size', 'sql_max_rows']
             else:
                 fields = []
 
@@ -1129,6 +1129,7 @@ class InterfaceViewSet(viewsets.ModelViewSet, BaseAPIView):
                     'sql': sql,
                     'params': request.data.get('sql_params', {}),
                     'size': request.data.get('sql_size', 10),
+                    'max_rows': request.data.get('sql_max_rows', 0),
                 })
 
             # 设置通用字段
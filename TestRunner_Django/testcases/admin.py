@@ -163,7 +163,7 @@ class TestReportDetailAdmin(admin.ModelAdmin):
     search_fields = ['report__name', 'step__name']
     readonly_fields = [
         'report', 'step', 'success', 'elapsed',
-        'request', 'response', 'validators',
+        'request', 'response', 'timing', 'validators',
         'extracted_variables', 'attachment'
     ]
     ordering = ['report', 'id']
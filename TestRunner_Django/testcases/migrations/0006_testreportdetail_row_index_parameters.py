@@ -0,0 +1,23 @@
+# Generated by Django 4.2.17 on 2026-10-17 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testcases", "0005_remove_testcase_module"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="testreportdetail",
+            name="row_index",
+            field=models.IntegerField(blank=True, null=True, verbose_name="参数行序号"),
+        ),
+        migrations.AddField(
+            model_name="testreportdetail",
+            name="parameters",
+            field=models.JSONField(blank=True, null=True, verbose_name="参数化数据"),
+        ),
+    ]
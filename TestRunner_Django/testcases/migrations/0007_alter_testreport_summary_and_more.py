@@ -0,0 +1,61 @@
+# Generated by Django 4.2.17 on 2026-10-17 16:20
+
+from django.db import migrations, models
+import httprunner.json_codec
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testcases", "0006_testreportdetail_row_index_parameters"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="testreport",
+            name="summary",
+            field=models.JSONField(
+                decoder=httprunner.json_codec.CodecJSONDecoder,
+                encoder=httprunner.json_codec.CodecJSONEncoder,
+                help_text={
+                    "in_out": {"config_vars": "配置变量", "export_vars": "导出变量"},
+                    "log": "执行日志",
+                    "name": "用例名称",
+                    "success": "是否成功",
+                    "time": {"duration": "执行时长", "start_at": "开始时间"},
+                },
+                verbose_name="执行汇总",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="testreportdetail",
+            name="request",
+            field=models.JSONField(
+                decoder=httprunner.json_codec.CodecJSONDecoder,
+                encoder=httprunner.json_codec.CodecJSONEncoder,
+                help_text={
+                    "body": "请求体",
+                    "headers": "请求头",
+                    "method": "请求方法",
+                    "url": "请求地址",
+                },
+                verbose_name="请求信息",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="testreportdetail",
+            name="response",
+            field=models.JSONField(
+                decoder=httprunner.json_codec.CodecJSONDecoder,
+                encoder=httprunner.json_codec.CodecJSONEncoder,
+                help_text={
+                    "body": "响应体",
+                    "content_size": "响应大小",
+                    "headers": "响应头",
+                    "response_time": "响应时间",
+                    "status_code": "状态码",
+                },
+                verbose_name="响应信息",
+            ),
+        ),
+    ]
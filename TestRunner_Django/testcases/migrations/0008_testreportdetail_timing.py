@@ -0,0 +1,33 @@
+# Generated by Django 4.2.17 on 2026-10-17 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testcases", "0007_alter_testreport_summary_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="testreportdetail",
+            name="timing",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text={
+                    "dns_ms": "DNS解析",
+                    "download_ms": "响应体下载",
+                    "extract_ms": "变量提取",
+                    "hooks_ms": "钩子执行",
+                    "parse_ms": "请求解析",
+                    "tcp_ms": "TCP连接",
+                    "tls_ms": "TLS握手",
+                    "ttfb_ms": "首字节时间",
+                    "validate_ms": "断言校验",
+                },
+                verbose_name="耗时分解",
+            ),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.conf import settings
 
+from httprunner.json_codec import CodecJSONDecoder, CodecJSONEncoder
+
 
 class TestCaseTag(models.Model):
     """测试用例标签"""
@@ -259,7 +261,9 @@ class TestReport(models.Model):
                 "export_vars": "导出变量"
             },
             "log": "执行日志"
-        }
+        },
+        encoder=CodecJSONEncoder,
+        decoder=CodecJSONDecoder
     )
     
     # 关联关系
@@ -321,7 +325,9 @@ class TestReportDetail(models.Model):
             "url": "请求地址",
             "headers": "请求头",
             "body": "请求体"
-        }
+        },
+        encoder=CodecJSONEncoder,
+        decoder=CodecJSONDecoder
     )
     
     # 响应信息
@@ -333,13 +339,37 @@ class TestReportDetail(models.Model):
             "body": "响应体",
             "content_size": "响应大小",
             "response_time": "响应时间"
-        }
+        },
+        encoder=CodecJSONEncoder,
+        decoder=CodecJSONDecoder
     )
     
+    # 耗时分解(ms), 区分目标服务、网络与执行器本身的耗时
+    timing = models.JSONField(
+        "耗时分解",
+        default=dict,
+        blank=True,
+        help_text={
+            "dns_ms": "DNS解析",
+            "tcp_ms": "TCP连接",
+            "tls_ms": "TLS握手",
+            "ttfb_ms": "首字节时间",
+            "download_ms": "响应体下载",
+            "parse_ms": "请求解析",
+            "hooks_ms": "钩子执行",
+            "extract_ms": "变量提取",
+            "validate_ms": "断言校验"
+        }
+    )
+
     # 其他信息
     validators = models.JSONField("断言结果", default=list)
     extracted_variables = models.JSONField("提取的变量", default=dict)
     attachment = models.TextField("附加信息", blank=True)
+
+    # 数据驱动模式下的参数行
+    row_index = models.IntegerField("参数行序号", null=True, blank=True)
+    parameters = models.JSONField("参数化数据", null=True, blank=True)
     
     class Meta:
         verbose_name = "报告详情"
@@ -1,16 +1,38 @@
+import asyncio
+import hashlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Dict, List, Optional, Text
 import json
 import logging
+import time
 import types
 from httprunner import HttpRunner, Config, Step, RunRequest, RunSqlRequest
+from httprunner.async_client import AsyncHttpSession, create_connector
+from httprunner.connection_pool import ConnectionPoolRegistry
+from httprunner.http2_client import HTTPX_READY, create_http2_client
+from httprunner.memoize import FunctionCache
+from httprunner.parser import iter_parameters
 from httprunner.models import TestCaseSummary
 from httprunner.step_sql_request import SqlMethodEnum
 from .models import TestCase, TestCaseStep
 
 logger = logging.getLogger('testrunner')
 
-def load_custom_functions(project_id):
-    """加载项目的自定义函数"""
+# 执行引擎: requests为阻塞会话, asyncio可在一个线程中复用大量用例的请求,
+# http2在一个连接上多路复用并发请求(需安装httpx[http2])
+ENGINE_REQUESTS = 'requests'
+ENGINE_ASYNCIO = 'asyncio'
+ENGINE_HTTP2 = 'http2'
+# asyncio引擎批量执行时同时执行的用例数
+ASYNC_CONCURRENCY = 100
+
+def load_custom_functions(project_id, function_cache: Optional[FunctionCache] = None):
+    """加载项目的自定义函数
+
+    Args:
+        project_id: 项目ID
+        function_cache: 纯函数结果缓存, 为空时不缓存
+    """
     functions = {}
     loaded_count = 0
     error_count = 0
@@ -52,6 +74,17 @@ def load_custom_functions(project_id):
                     if name in functions:
                         logger.warning(f"函数名冲突: {name}, 将使用最新定义的函数")
 
+                # 纯函数按参数缓存结果, 缓存键包含函数记录ID和代码摘要, 避免同名函数共用结果
+                if func.is_pure and function_cache is not None:
+                    code_digest = hashlib.sha1(func.code.encode('utf-8')).hexdigest()
+                    module_functions = {
+                        name: function_cache.memoize(
+                            obj, scope=func.cache_scope, ttl=func.cache_ttl,
+                            namespace=f"{func.id}:{code_digest}:{name}"
+                        )
+                        for name, obj in module_functions.items()
+                    }
+
                 functions.update(module_functions)
                 loaded_count += 1
                 logger.debug(f"成功加载函数: {func.name}, 包含方法: {list(module_functions.keys())}")
@@ -70,9 +103,24 @@ def load_custom_functions(project_id):
 
     return functions
 
+def create_pool_registry(environment: Optional[Dict] = None) -> ConnectionPoolRegistry:
+    """按环境的连接池配置创建连接池, 供一次执行中的所有用例共享"""
+    environment = environment or {}
+    return ConnectionPoolRegistry(
+        pool_maxsize=environment.get('pool_maxsize') or 10,
+        keep_alive=environment.get('keep_alive', True),
+        max_retries=environment.get('max_retries') or 0
+    )
+
+
 class TestCaseRunner(HttpRunner):
     """测试用例执行器"""
 
+    # 数据驱动模式下每行参数的执行结果, 为None表示普通模式
+    row_results: Optional[List[Dict]] = None
+    # 执行引擎, 由用例配置engine指定
+    engine: Text = ENGINE_REQUESTS
+
     def _create_http_step(self, step_name: str, interface_data: Dict) -> RunRequest:
         """创建HTTP请求步骤
 
@@ -196,7 +244,12 @@ class TestCaseRunner(HttpRunner):
             size = interface_data.get('sql_size', 10)
             step_obj = step_obj.fetchmany(sql, size)
         elif sql_method == 'FETCHALL':
-            step_obj = step_obj.fetchall(sql)
+            step_obj = step_obj.fetchall(sql, interface_data.get('sql_max_rows', 0))
+        elif sql_method == 'AGGREGATE':
+            # 大结果集只保留行数、校验和及前几行
+            step_obj = step_obj.aggregate(
+                sql, interface_data.get('sql_size', 10), interface_data.get('sql_max_rows', 0)
+            )
         elif sql_method == 'INSERT':
             step_obj = step_obj.insert(sql)
         elif sql_method == 'UPDATE':
@@ -207,6 +260,10 @@ class TestCaseRunner(HttpRunner):
             logger.warning(f"不支持的SQL方法: {sql_method}，将使用fetchone")
             step_obj = step_obj.fetchone(sql)
 
+        # 命名绑定参数, SQL中使用 :name 引用, 未指定的参数从步骤变量中获取
+        if interface_data.get('sql_params'):
+            step_obj = step_obj.with_params(interface_data['sql_params'])
+
         # 添加teardown hooks
         if interface_data.get('teardown_hooks'):
             for hook in interface_data['teardown_hooks']:
@@ -231,16 +288,25 @@ class TestCaseRunner(HttpRunner):
 
         return step_obj
 
-    def __init__(self, testcase: TestCase):
+    def __init__(self, testcase: TestCase, function_cache: Optional[FunctionCache] = None,
+                 pool_registry: Optional[ConnectionPoolRegistry] = None,
+                 record_level: Optional[Text] = None):
         # 先初始化父类
         super().__init__()
         self.testcase = testcase
         # 初始化测试步骤列表
         self.teststeps = []
+        # 纯函数结果缓存, 任务执行时由多个用例共享
+        self.with_function_cache(function_cache if function_cache is not None else FunctionCache())
+        # 连接池, 批量或任务执行时由多个用例共享, cookie仍按用例隔离
+        self.with_pool_registry(pool_registry)
+        # 请求和响应的记录级别, 大批量执行时可降低记录开销
+        if record_level:
+            self.with_record_level(record_level)
 
         # 加载并注册自定义函数
         try:
-            custom_functions = load_custom_functions(testcase.project_id)
+            custom_functions = load_custom_functions(testcase.project_id, self.function_cache)
             if custom_functions:
                 # 注册到HttpRunner的functions中
                 self.functions = custom_functions
@@ -297,6 +363,15 @@ class TestCaseRunner(HttpRunner):
                 self.config.base_url(self.base_url)
             if self.verify is not None:  # 只有在明确设置时才配置verify
                 self.config.verify(self.verify)
+            # 执行引擎: requests(默认) 或 asyncio
+            self.engine = self.testcase.config.get('engine') or ENGINE_REQUESTS
+            # 步骤并发数, 大于1时互不依赖的步骤并发执行
+            step_concurrency = self.testcase.config.get('step_concurrency')
+            if step_concurrency:
+                try:
+                    self.config.concurrent_steps(int(step_concurrency))
+                except (TypeError, ValueError):
+                    logger.warning(f"用例[{testcase.name}]的步骤并发数配置无效: {step_concurrency}")
             # 只有当 variables 是非空字典时才配置
             if self.variables and isinstance(self.variables, dict):
                 self.config.variables(**self.variables)
@@ -493,9 +568,55 @@ class TestCaseRunner(HttpRunner):
         Returns:
             TestCaseRunner: 返回自身，便于链式调用
         """
+        self.prepare_environment(environment)
+
+        if self.engine == ENGINE_HTTP2 and not HTTPX_READY:
+            logger.warning("未安装httpx[http2], 执行引擎回退为requests")
+            self.engine = ENGINE_REQUESTS
+
+        # HTTP/2客户端由参数行和并发步骤共享, 执行结束后关闭
+        http2_client = None
+        if self.engine == ENGINE_HTTP2:
+            http2_client = create_http2_client(
+                self.config.struct().verify,
+                (environment or {}).get('pool_maxsize') or 10
+            )
+            self.with_http2_client(http2_client)
+
+        # 执行测试
+        try:
+            parameters = self.testcase.config.get('parameters')
+            if parameters:
+                # 数据驱动模式: 按参数行执行
+                self.run_parameters(parameters, self.testcase.config.get('concurrency', 1))
+            elif self.engine == ENGINE_ASYNCIO:
+                asyncio.run(self.async_test_start())
+            else:
+                self.test_start()
+            logger.info(f"测试用例执行完成: {self.testcase.name}")
+        except Exception as e:
+            logger.error(f"测试用例执行异常: {str(e)}")
+            raise
+        finally:
+            if http2_client is not None:
+                http2_client.close()
+                self.with_http2_client(None)
+
+        return self
+
+    def prepare_environment(self, environment: Optional[Dict] = None) -> "TestCaseRunner":
+        """应用环境配置和全局请求头, 需要在事件循环外调用(查询数据库)"""
         logger.info(f"开始执行测试用例: {self.testcase.name}")
 
         if environment:
+            # 环境启用HTTP/2时, 默认的requests引擎切换为http2
+            if environment.get('http2') and self.engine == ENGINE_REQUESTS:
+                self.engine = ENGINE_HTTP2
+
+            # 响应体落盘阈值, 0表示不启用
+            if environment.get('spill_threshold_mb') is not None:
+                self.with_spill_threshold(environment['spill_threshold_mb'] * 1024 * 1024)
+
             # 使用环境的base_url
             if environment.get('base_url'):
                 self.config.base_url(environment['base_url'])
@@ -571,22 +692,145 @@ class TestCaseRunner(HttpRunner):
             logger.error(f"应用全局请求头时出错: {str(e)}")
             # 继续执行，不中断测试
 
-        # 执行测试
+        return self
+
+    def run_parameters(self, parameters: Dict, concurrency: int = 1) -> "TestCaseRunner":
+        """数据驱动执行, 每行参数使用独立的会话和变量, 在有界线程池中并发执行
+
+        Args:
+            parameters: 参数化配置, 格式同httprunner的parameters, 支持${parameterize(...)}/${P(...)}
+            concurrency: 并发数, 默认串行执行
+        """
         try:
-            self.test_start()
-            logger.info(f"测试用例执行完成: {self.testcase.name}")
-        except Exception as e:
-            logger.error(f"测试用例执行异常: {str(e)}")
-            raise
+            concurrency = max(1, int(concurrency or 1))
+        except (TypeError, ValueError):
+            logger.warning(f"用例[{self.testcase.name}]的并发数配置无效: {concurrency}, 使用串行执行")
+            concurrency = 1
+
+        functions_mapping = self.parser.functions_mapping if self.parser else None
+        rows = iter_parameters(parameters, functions_mapping=functions_mapping)
+        logger.info(f"用例[{self.testcase.name}]开始数据驱动执行, 并发数: {concurrency}")
+
+        self.row_results = None
+        self.rows_start_at = time.time()
+        if self.engine == ENGINE_ASYNCIO:
+            # 所有参数行在一个事件循环中并发执行, 请求共享连接池
+            row_results = asyncio.run(self._async_run_parameters(rows, concurrency))
+        else:
+            row_results = self._run_parameters_in_threads(rows, concurrency)
 
+        self.rows_duration = time.time() - self.rows_start_at
+        self.row_results = sorted(row_results, key=lambda row: row['index'])
+        success_count = len([row for row in self.row_results if row['success']])
+        logger.info(f"用例[{self.testcase.name}]数据驱动执行完成: 共{len(self.row_results)}行, "
+                    f"成功{success_count}行, 耗时{self.rows_duration:.2f}s")
         return self
 
+    def _run_parameters_in_threads(self, rows, concurrency: int) -> List[Dict]:
+        """参数行在有界线程池中并发执行"""
+        row_results = []
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix=f"testcase-{self.testcase.id}"
+        ) as executor:
+            # 参数行按需读取, 最多同时提交2倍并发数的任务
+            pending = set()
+            for index, param in enumerate(rows):
+                pending.add(executor.submit(self._run_parameter_row, index, param))
+                if len(pending) >= concurrency * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    row_results.extend(future.result() for future in done)
+        row_results.extend(future.result() for future in pending)
+        return row_results
+
+    async def _async_run_parameters(self, rows, concurrency: int) -> List[Dict]:
+        """参数行在当前事件循环中并发执行, 最多同时执行concurrency行"""
+        semaphore = asyncio.Semaphore(concurrency)
+        connector = create_connector(concurrency)
+
+        async def run_row(index: int, param: Dict) -> Dict:
+            try:
+                return await self._async_run_parameter_row(index, param, connector)
+            finally:
+                semaphore.release()
+
+        tasks = []
+        try:
+            # 参数行按需读取
+            for index, param in enumerate(rows):
+                await semaphore.acquire()
+                tasks.append(asyncio.ensure_future(run_row(index, param)))
+            return list(await asyncio.gather(*tasks))
+        finally:
+            await connector.close()
+
+    def _run_parameter_row(self, index: int, param: Dict) -> Dict:
+        """使用独立的执行器执行一行参数"""
+        runner = self.fork()
+        start_at = time.time()
+        error = None
+        try:
+            runner.test_start(param)
+        except Exception as e:
+            logger.error(f"用例[{self.testcase.name}]第{index + 1}行参数执行异常: {str(e)}")
+            error = str(e)
+        finally:
+            # 工作线程中打开的数据库连接需要在线程内关闭
+            from django.db import connections
+            connections.close_all()
+
+        return self._get_row_result(runner, index, param, error, start_at)
+
+    async def _async_run_parameter_row(self, index: int, param: Dict, connector) -> Dict:
+        """使用独立的执行器和异步会话执行一行参数, 连接池由所有参数行共享"""
+        runner = self.fork()
+        async_session = AsyncHttpSession(connector, self.record_level, self.spill_threshold)
+        runner.with_async_session(async_session)
+        start_at = time.time()
+        error = None
+        try:
+            await runner.async_test_start(param)
+        except Exception as e:
+            logger.error(f"用例[{self.testcase.name}]第{index + 1}行参数执行异常: {str(e)}")
+            error = str(e)
+        finally:
+            await async_session.close()
+            runner.with_async_session(None)
+
+        return self._get_row_result(runner, index, param, error, start_at)
+
+    def _get_row_result(self, runner: "TestCaseRunner", index: int, param: Dict,
+                        error: Optional[str], start_at: float) -> Dict:
+        """一行参数的执行结果"""
+        try:
+            summary = runner.get_summary()
+            step_results = summary['step_results']
+        except Exception as e:
+            logger.error(f"获取第{index + 1}行参数执行结果失败: {str(e)}")
+            summary, step_results = {'success': False}, []
+
+        return {
+            'index': index,
+            'parameters': param,
+            'success': error is None and summary['success'],
+            'error': error,
+            'duration': time.time() - start_at,
+            'step_results': step_results,
+        }
+
     def get_step_results(self) -> List[Dict]:
         """获取步骤执行结果"""
+        if self.row_results is not None:
+            # 数据驱动模式: 汇总所有参数行的步骤结果
+            results = []
+            for row in self.row_results:
+                for step_result in row['step_results']:
+                    results.append(dict(step_result, row_index=row['index'], parameters=row['parameters']))
+            return results
+
         summary = super().get_summary()
         results = []
 
-        for step_result in summary.step_results:
+        for step_index, step_result in enumerate(summary.step_results):
             # 检查步骤类型
             step_type = step_result.step_type
 
@@ -608,6 +852,7 @@ class TestCaseRunner(HttpRunner):
             # 初始化结果字典
             result = {
                 'name': step_result.name,
+                'step_index': step_index,
                 'success': success,
                 'elapsed': step_result.elapsed,
                 'step_type': step_type,
@@ -622,9 +867,11 @@ class TestCaseRunner(HttpRunner):
             if step_type == 'request':
                 # HTTP请求类型
                 req_resp = step_result.data.req_resps[-1] if step_result.data.req_resps else None
+                # 记录级别为none时没有请求响应记录, 状态码取自统计数据
+                status_code = req_resp.response.status_code if req_resp else step_result.data.stat.status_code
 
                 # 检查响应状态码
-                if req_resp and req_resp.response.status_code >= 400:
+                if status_code and status_code >= 400:
                     result['success'] = False
 
                 # 添加HTTP特有的数据
@@ -636,12 +883,15 @@ class TestCaseRunner(HttpRunner):
                         'body': req_resp.request.body if req_resp else None
                     },
                     'response': {
-                        'status_code': req_resp.response.status_code if req_resp else None,
+                        'status_code': status_code or None,
                         'headers': req_resp.response.headers if req_resp else {},
                         'body': req_resp.response.body if req_resp else None,
                         'content_size': step_result.data.stat.content_size,
                         'response_time_ms': step_result.data.stat.response_time_ms,
-                    }
+                    },
+                    'timing': step_result.data.stat.dict(
+                        exclude={'status_code', 'content_size', 'response_time_ms'}
+                    )
                 })
             elif step_type == 'sql':
                 # SQL请求类型
@@ -666,6 +916,9 @@ class TestCaseRunner(HttpRunner):
 
     def get_summary(self) -> Dict:
         """获取执行结果汇总"""
+        if self.row_results is not None:
+            return self._get_rows_summary()
+
         summary = super().get_summary()
         step_results = self.get_step_results()
 
@@ -679,7 +932,7 @@ class TestCaseRunner(HttpRunner):
                 break
 
             # 对于HTTP请求，检查响应状态码
-            if step['step_type'] == 'request' and step['data'].get('response', {}).get('status_code', 0) >= 400:
+            if step['step_type'] == 'request' and (step['data'].get('response', {}).get('status_code') or 0) >= 400:
                 success = False
                 break
 
@@ -702,6 +955,74 @@ class TestCaseRunner(HttpRunner):
             'step_results': step_results
         }
 
+    def _get_rows_summary(self) -> Dict:
+        """数据驱动模式的执行结果汇总"""
+        return {
+            'success': all(row['success'] for row in self.row_results),
+            'name': self.testcase.name,
+            'time': {
+                'start_at': self.rows_start_at,
+                'duration': self.rows_duration
+            },
+            'in_out': {
+                'config_vars': self.variables,
+                'export_vars': {}
+            },
+            'log': None,
+            'rows': [
+                {key: row[key] for key in ('index', 'parameters', 'success', 'error', 'duration')}
+                for row in self.row_results
+            ],
+            'step_results': self.get_step_results()
+        }
+
+def run_runners_async(runners: List[TestCaseRunner], concurrency: int = ASYNC_CONCURRENCY) -> None:
+    """
+    在一个事件循环中并发执行asyncio引擎的用例, 请求共享连接池, 一个线程即可复用大量用例的请求.
+    执行器需已调用prepare_environment(查询数据库的准备工作在事件循环外完成),
+    执行异常记录日志, 结果通过各执行器的get_summary获取
+
+    Args:
+        runners: 用例执行器列表
+        concurrency: 同时执行的用例数
+    """
+    asyncio.run(_run_runners(runners, max(1, int(concurrency or 1))))
+
+
+async def _run_runners(runners: List[TestCaseRunner], concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = create_connector(concurrency)
+
+    async def run_runner(runner: TestCaseRunner):
+        async with semaphore:
+            parameters = runner.testcase.config.get('parameters')
+            try:
+                if parameters:
+                    # 数据驱动模式的参数行在独立的事件循环中并发执行
+                    await asyncio.get_running_loop().run_in_executor(
+                        None, runner.run_parameters, parameters,
+                        runner.testcase.config.get('concurrency', 1)
+                    )
+                    return
+
+                async_session = AsyncHttpSession(
+                    connector, runner.record_level, runner.spill_threshold
+                )
+                runner.with_async_session(async_session)
+                try:
+                    await runner.async_test_start()
+                finally:
+                    await async_session.close()
+                    runner.with_async_session(None)
+            except Exception as e:
+                logger.error(f"测试用例[{runner.testcase.name}]执行异常: {str(e)}")
+
+    try:
+        await asyncio.gather(*[run_runner(runner) for runner in runners])
+    finally:
+        await connector.close()
+
+
 class BatchRunner:
     """批量执行器"""
 
@@ -709,30 +1030,71 @@ class BatchRunner:
         self.testcases = testcases
         self.results = []
 
-    def run(self, environment: Optional[Dict] = None) -> List[Dict]:
+    def run_async(self, environment: Optional[Dict] = None,
+                  concurrency: int = ASYNC_CONCURRENCY) -> List[Dict]:
         """
-        批量执行测试用例
+        在一个事件循环中并发执行测试用例, 请求共享连接池, 适合IO密集的被测服务
 
         Args:
             environment: 环境变量配置
+            concurrency: 同时执行的用例数
 
         Returns:
             List[Dict]: 执行结果列表
         """
+        function_cache = FunctionCache()
+        pool_registry = create_pool_registry(environment)
+        runners = []
         for testcase in self.testcases:
-            # 执行测试用例
-            runner = TestCaseRunner(testcase)
-            runner.run_testcase(environment)
+            # 查询数据库的准备工作在事件循环外完成
+            runner = TestCaseRunner(testcase, function_cache, pool_registry)
+            runner.prepare_environment(environment)
+            runners.append(runner)
 
-            # 收集结果
+        try:
+            run_runners_async(runners, concurrency)
+        finally:
+            pool_registry.close()
+
+        for runner in runners:
             self.results.append({
-                'testcase_id': testcase.id,
-                'testcase_name': testcase.name,
+                'testcase_id': runner.testcase.id,
+                'testcase_name': runner.testcase.name,
                 'summary': runner.get_summary()
             })
 
         return self.results
 
+    def run(self, environment: Optional[Dict] = None) -> List[Dict]:
+        """
+        批量执行测试用例
+
+        Args:
+            environment: 环境变量配置
+
+        Returns:
+            List[Dict]: 执行结果列表
+        """
+        # 批量执行期间共享纯函数缓存和连接池
+        function_cache = FunctionCache()
+        pool_registry = create_pool_registry(environment)
+        try:
+            for testcase in self.testcases:
+                # 执行测试用例
+                runner = TestCaseRunner(testcase, function_cache, pool_registry)
+                runner.run_testcase(environment)
+
+                # 收集结果
+                self.results.append({
+                    'testcase_id': testcase.id,
+                    'testcase_name': testcase.name,
+                    'summary': runner.get_summary()
+                })
+        finally:
+            pool_registry.close()
+
+        return self.results
+
     def get_statistics(self) -> Dict:
         """获取统计信息"""
         if not self.results:
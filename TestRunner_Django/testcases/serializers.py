@@ -575,8 +575,9 @@ class TestReportDetailSerializer(serializers.ModelSerializer):
         model = TestReportDetail
         fields = [
             'id', 'step_name', 'success', 'elapsed',
-            'request', 'response', 'validators',
-            'extracted_variables', 'attachment'
+            'request', 'response', 'timing', 'validators',
+            'extracted_variables', 'attachment',
+            'row_index', 'parameters'
         ]
 
 
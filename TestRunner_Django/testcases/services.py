@@ -2,9 +2,11 @@ from typing import Dict, List, Optional, Tuple
 import logging
 from django.utils import timezone
 from django.db import transaction
+from httprunner.connection_pool import ConnectionPoolRegistry
+from httprunner.memoize import FunctionCache
 from interfaces.models import Interface
 from .models import TestCase, TestCaseStep, TestReport, TestReportDetail
-from .runner import TestCaseRunner
+from .runner import ENGINE_ASYNCIO, TestCaseRunner, create_pool_registry, run_runners_async
 
 logger = logging.getLogger('testrunner')
 
@@ -210,14 +212,26 @@ class TestExecutionService:
             "export": config.get('export', []),
             
             # parameters: 只使用用例的配置，使用处理后的值
-            "parameters": case_parameters
+            "parameters": case_parameters,
+
+            # concurrency: 数据驱动模式下参数行的并发数
+            "concurrency": config.get('concurrency', 1),
+
+            # step_concurrency: 互不依赖的步骤并发执行的线程数
+            "step_concurrency": config.get('step_concurrency', 0),
+
+            # engine: 执行引擎, requests(默认)、asyncio 或 http2
+            "engine": config.get('engine', 'requests')
         }
         
         logger.info(f"配置合并结果: {final_config}")
         return final_config
     
     @staticmethod
-    def run_testcase(testcase: TestCase, environment: Optional[Dict] = None, user = None) -> TestReport:
+    def run_testcase(testcase: TestCase, environment: Optional[Dict] = None, user = None,
+                     function_cache: Optional[FunctionCache] = None,
+                     pool_registry: Optional[ConnectionPoolRegistry] = None,
+                     record_level: Optional[str] = None) -> TestReport:
         """
         执行测试用例
         
@@ -225,20 +239,71 @@ class TestExecutionService:
             testcase: 测试用例
             environment: 环境变量
             user: 执行用户
+            function_cache: 纯函数结果缓存, 批量或任务执行时共享
+            pool_registry: 连接池, 批量或任务执行时共享
+            record_level: 请求和响应的记录级别: none/metadata/truncated/full
             
         Returns:
             TestReport: 测试报告
         """
-        # 1. 处理配置数据
+        # 1. 处理配置数据并创建执行器
+        runner = TestExecutionService._create_runner(
+            testcase, environment, function_cache, pool_registry, record_level
+        )
+
+        # 2. 运行测试
+        runner.run_testcase(environment)
+        return TestExecutionService._save_report(runner, environment, user)
+
+    @staticmethod
+    def run_testcases_async(testcases: List[TestCase], environment: Optional[Dict] = None, user = None,
+                            function_cache: Optional[FunctionCache] = None,
+                            pool_registry: Optional[ConnectionPoolRegistry] = None,
+                            record_level: Optional[str] = None) -> List[TestReport]:
+        """
+        在一个事件循环中并发执行asyncio引擎的测试用例, 请求共享连接池
+
+        Args:
+            testcases: 测试用例列表, 执行引擎为asyncio
+            其他参数同run_testcase
+
+        Returns:
+            List[TestReport]: 测试报告列表, 与用例顺序一致
+        """
+        runners = []
+        for testcase in testcases:
+            runner = TestExecutionService._create_runner(
+                testcase, environment, function_cache, pool_registry, record_level
+            )
+            # 查询数据库的准备工作在事件循环外完成
+            runner.prepare_environment(environment)
+            runners.append(runner)
+
+        run_runners_async(runners)
+        return [TestExecutionService._save_report(runner, environment, user) for runner in runners]
+
+    @staticmethod
+    def is_async_testcase(testcase: TestCase) -> bool:
+        """用例是否使用asyncio引擎执行"""
+        return (testcase.config or {}).get('engine') == ENGINE_ASYNCIO
+
+    @staticmethod
+    def _create_runner(testcase: TestCase, environment: Optional[Dict] = None,
+                       function_cache: Optional[FunctionCache] = None,
+                       pool_registry: Optional[ConnectionPoolRegistry] = None,
+                       record_level: Optional[str] = None) -> TestCaseRunner:
+        """处理用例配置并创建执行器"""
         logger.info(f"处理用例[{testcase.name}]配置前: {testcase.config}")
         config = TestExecutionService._prepare_config(testcase.config, environment)
         testcase.config = config
         logger.info(f"处理用例[{testcase.name}]配置后: {config}")
-        
-        # 2. 创建执行器并运行测试
-        runner = TestCaseRunner(testcase)
-        runner.run_testcase(environment)
-        
+        return TestCaseRunner(testcase, function_cache, pool_registry, record_level)
+
+    @staticmethod
+    def _save_report(runner: TestCaseRunner, environment: Optional[Dict] = None, user = None) -> TestReport:
+        """根据执行结果创建测试报告"""
+        testcase = runner.testcase
+
         # 3. 获取结果
         summary = runner.get_summary()
         step_results = runner.get_step_results()
@@ -268,19 +333,22 @@ class TestExecutionService:
                 step_name = step_result['name']
                 
                 try:
+                    # 数据驱动模式下多行参数的步骤结果依次排列, 使用行内的步骤序号
+                    step_index = step_result.get('step_index', i)
+
                     # 首先尝试通过顺序位置获取步骤（最可靠的方式）
-                    step = steps_by_order.get(i+1)  # 步骤顺序通常从1开始
+                    step = steps_by_order.get(step_index+1)  # 步骤顺序通常从1开始
                     
                     # 如果找不到步骤，则尝试通过名称查找对应的步骤ID
                     if step is None:
-                        logger.warning(f"找不到顺序为 {i+1} 的步骤，尝试通过名称 '{step_name}' 匹配")
+                        logger.warning(f"找不到顺序为 {step_index+1} 的步骤，尝试通过名称 '{step_name}' 匹配")
                         # 获取按顺序排列的所有步骤
                         ordered_steps = list(testcase.steps.all().order_by('order'))
                         # 确保索引在范围内
-                        if i < len(ordered_steps):
-                            step = ordered_steps[i]
+                        if step_index < len(ordered_steps):
+                            step = ordered_steps[step_index]
                         else:
-                            logger.error(f"步骤索引 {i} 超出范围，总步骤数: {len(ordered_steps)}")
+                            logger.error(f"步骤索引 {step_index} 超出范围，总步骤数: {len(ordered_steps)}")
                             continue
                     
                     # 检查验证器结果，确保断言失败时步骤被标记为失败
@@ -307,9 +375,12 @@ class TestExecutionService:
                         elapsed=step_result['elapsed'],
                         request=step_result['data']['request'],
                         response=step_result['data']['response'],
+                        timing=step_result['data'].get('timing') or {},
                         validators=step_result['data']['validators'],
                         extracted_variables=step_result['data']['extracted_variables'],
-                        attachment=step_result['attachment']
+                        attachment=step_result['attachment'],
+                        row_index=step_result.get('row_index'),
+                        parameters=step_result.get('parameters')
                     )
                 except Exception as e:
                     logger.error(f"创建测试报告详情失败: {str(e)}")
@@ -331,11 +402,30 @@ class TestExecutionService:
         Returns:
             List[TestReport]: 测试报告列表
         """
-        reports = []
-        for testcase in testcases:
-            report = TestExecutionService.run_testcase(testcase, environment, user)
-            reports.append(report)
-        return reports
+        reports = {}
+        function_cache = FunctionCache()
+        pool_registry = create_pool_registry(environment)
+        try:
+            # asyncio引擎的用例在一个事件循环中并发执行, 其他用例依次执行
+            async_testcases = [
+                testcase for testcase in testcases if TestExecutionService.is_async_testcase(testcase)
+            ]
+            if async_testcases:
+                async_reports = TestExecutionService.run_testcases_async(
+                    async_testcases, environment, user, function_cache, pool_registry
+                )
+                reports.update(zip(map(id, async_testcases), async_reports))
+
+            for testcase in testcases:
+                if id(testcase) in reports:
+                    continue
+                reports[id(testcase)] = TestExecutionService.run_testcase(
+                    testcase, environment, user, function_cache, pool_registry
+                )
+        finally:
+            logger.info(f"批量执行连接池统计: {pool_registry.get_stats()}")
+            pool_registry.close()
+        return [reports[id(testcase)] for testcase in testcases]
 
     @staticmethod
     def get_statistics(reports: List[TestReport]) -> Dict:
@@ -301,6 +301,11 @@ class TestCaseViewSet(BaseModelViewSet):
                     'id': env.id,
                     'base_url': env.base_url,
                     'verify_ssl': env.verify_ssl,
+                    'pool_maxsize': env.pool_maxsize,
+                    'keep_alive': env.keep_alive,
+                    'max_retries': env.max_retries,
+                    'http2': env.http2,
+                    'spill_threshold_mb': env.spill_threshold_mb,
                     'variables': env.get_all_variables()
                 }
             except Environment.DoesNotExist:
@@ -366,6 +371,11 @@ class TestCaseViewSet(BaseModelViewSet):
                     'id': env.id,
                     'base_url': env.base_url,
                     'verify_ssl': env.verify_ssl,
+                    'pool_maxsize': env.pool_maxsize,
+                    'keep_alive': env.keep_alive,
+                    'max_retries': env.max_retries,
+                    'http2': env.http2,
+                    'spill_threshold_mb': env.spill_threshold_mb,
                     'variables': env.get_all_variables()
                 }
             except Environment.DoesNotExist:
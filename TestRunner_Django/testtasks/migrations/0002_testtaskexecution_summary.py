@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-17 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testtasks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="testtaskexecution",
+            name="summary",
+            field=models.JSONField(blank=True, default=dict, verbose_name="执行摘要"),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.17 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testtasks", "0002_testtaskexecution_summary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="testtaskexecution",
+            name="record_level",
+            field=models.CharField(
+                choices=[
+                    ("none", "不记录"),
+                    ("metadata", "仅元数据"),
+                    ("truncated", "截断大报文"),
+                    ("full", "完整记录"),
+                ],
+                default="truncated",
+                max_length=20,
+                verbose_name="记录级别",
+            ),
+        ),
+    ]
@@ -93,6 +93,13 @@ class TestTaskExecution(models.Model):
         ('failed', '执行失败'),
         ('canceled', '已取消')
     ]
+
+    RECORD_LEVEL_CHOICES = [
+        ('none', '不记录'),
+        ('metadata', '仅元数据'),
+        ('truncated', '截断大报文'),
+        ('full', '完整记录')
+    ]
     
     task_suite = models.ForeignKey(
         TestTaskSuite,
@@ -139,6 +146,17 @@ class TestTaskExecution(models.Model):
     
     # 任务ID，用于异步任务
     task_id = models.CharField("任务ID", max_length=100, blank=True)
+
+    # 请求和响应的记录级别
+    record_level = models.CharField(
+        "记录级别",
+        max_length=20,
+        choices=RECORD_LEVEL_CHOICES,
+        default='truncated'
+    )
+
+    # 执行摘要, 如连接池命中统计
+    summary = models.JSONField("执行摘要", default=dict, blank=True)
     
     # 创建信息
     created_time = models.DateTimeField("创建时间", auto_now_add=True)
@@ -171,13 +189,15 @@ class TestTaskExecution(models.Model):
         self.start_time = timezone.now()
         self.save()
     
-    def complete(self, success_count, fail_count, error_count):
+    def complete(self, success_count, fail_count, error_count, summary=None):
         """完成执行"""
         self.status = 'completed'
         self.end_time = timezone.now()
         self.success_count = success_count
         self.fail_count = fail_count
         self.error_count = error_count
+        if summary is not None:
+            self.summary = summary
         self.save()
     
     def fail(self):
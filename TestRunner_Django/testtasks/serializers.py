@@ -137,11 +137,11 @@ class TestTaskExecutionSerializer(serializers.ModelSerializer):
             'start_time', 'end_time', 'duration',
             'total_count', 'success_count', 'fail_count', 'error_count',
             'success_rate', 'executed_by', 'executed_by_name',
-            'created_time', 'case_results'
+            'created_time', 'record_level', 'summary', 'case_results'
         ]
         read_only_fields = ['id', 'status', 'start_time', 'end_time',
                            'total_count', 'success_count', 'fail_count', 'error_count',
-                           'executed_by', 'created_time']
+                           'executed_by', 'created_time', 'summary']
     
     def create(self, validated_data):
         # 获取当前用户
@@ -180,6 +180,10 @@ class TestTaskExecutionCreateSerializer(serializers.Serializer):
     """测试任务执行创建序列化器"""
     task_suite_id = serializers.IntegerField(help_text="任务集ID")
     environment_id = serializers.IntegerField(help_text="环境ID", required=False, allow_null=True)
+    record_level = serializers.ChoiceField(
+        choices=TestTaskExecution.RECORD_LEVEL_CHOICES, default='truncated',
+        help_text="请求和响应的记录级别: none/metadata/truncated/full"
+    )
     
     def validate_task_suite_id(self, value):
         # 验证任务集是否存在
@@ -2,7 +2,10 @@ from typing import Dict, List, Optional, Tuple
 import logging
 from django.utils import timezone
 from django.db import transaction, models
+from httprunner.memoize import FunctionCache
+from httprunner.response import get_jmespath_cache_info
 from testcases.models import TestCase, TestReport
+from testcases.runner import create_pool_registry
 from testcases.services import TestExecutionService
 from .models import TestTaskSuite, TestTaskCase, TestTaskExecution, TestTaskCaseResult
 
@@ -121,7 +124,8 @@ class TestTaskExecutionService:
     """测试任务执行服务类"""
     
     @staticmethod
-    def create_execution(task_suite: TestTaskSuite, environment_id: Optional[int] = None, user = None) -> TestTaskExecution:
+    def create_execution(task_suite: TestTaskSuite, environment_id: Optional[int] = None, user = None,
+                         record_level: str = 'truncated') -> TestTaskExecution:
         """
         创建测试任务执行记录
         
@@ -129,6 +133,7 @@ class TestTaskExecutionService:
             task_suite: 任务集
             environment_id: 环境ID
             user: 执行用户
+            record_level: 请求和响应的记录级别
             
         Returns:
             TestTaskExecution: 创建的执行记录
@@ -139,6 +144,7 @@ class TestTaskExecutionService:
                 task_suite=task_suite,
                 environment_id=environment_id,
                 executed_by=user,
+                record_level=record_level,
                 total_count=task_suite.task_cases.count()
             )
             
@@ -187,7 +193,12 @@ class TestTaskExecutionService:
                     'name': execution.environment.name,
                     'base_url': execution.environment.base_url,
                     'variables': env_variables,  # 使用 get_all_variables() 获取的字典
-                    'verify_ssl': execution.environment.verify_ssl
+                    'verify_ssl': execution.environment.verify_ssl,
+                    'pool_maxsize': execution.environment.pool_maxsize,
+                    'keep_alive': execution.environment.keep_alive,
+                    'max_retries': execution.environment.max_retries,
+                    'http2': execution.environment.http2,
+                    'spill_threshold_mb': execution.environment.spill_threshold_mb
                 }
                 logger.info(f"环境[{execution.environment.name}]配置: base_url={execution.environment.base_url}, variables={env_variables}")
             except Exception as e:
@@ -213,63 +224,124 @@ class TestTaskExecutionService:
         fail_count = 0
         error_count = 0
         
-        # 执行每个用例
-        for case_result in case_results:
-            # 标记开始执行
-            case_result.status = 'running'
-            case_result.start_time = timezone.now()
-            case_result.save()
+        # 任务执行期间共享纯函数缓存和连接池
+        function_cache = FunctionCache()
+        pool_registry = create_pool_registry(environment)
+
+        try:
+            # 未设置快速失败时, asyncio引擎的用例在一个事件循环中并发执行
+            async_results = []
+            if not task_suite.fail_fast:
+                async_results = [
+                    case_result for case_result in case_results
+                    if TestExecutionService.is_async_testcase(case_result.testcase)
+                ]
+            if async_results:
+                for case_result in async_results:
+                    case_result.status = 'running'
+                    case_result.start_time = timezone.now()
+                    case_result.save()
+                try:
+                    reports = TestExecutionService.run_testcases_async(
+                        [case_result.testcase for case_result in async_results], environment,
+                        execution.executed_by, function_cache, pool_registry, execution.record_level
+                    )
+                except Exception as e:
+                    logger.error(f"并发执行asyncio引擎用例异常: {str(e)}")
+                    reports = [None] * len(async_results)
+                    error_message = str(e)
+                for case_result, report in zip(async_results, reports):
+                    case_result.end_time = timezone.now()
+                    case_result.duration = (case_result.end_time - case_result.start_time).total_seconds()
+                    if report is None:
+                        case_result.status = 'error'
+                        case_result.error_message = error_message
+                        error_count += 1
+                    elif report.status == 'success':
+                        case_result.report = report
+                        case_result.status = 'success'
+                        success_count += 1
+                    else:
+                        case_result.report = report
+                        case_result.status = 'failure'
+                        fail_count += 1
+                    case_result.save()
+            async_result_ids = {case_result.id for case_result in async_results}
+
+            # 依次执行其余用例
+            for case_result in case_results:
+                if case_result.id in async_result_ids:
+                    continue
+                # 标记开始执行
+                case_result.status = 'running'
+                case_result.start_time = timezone.now()
+                case_result.save()
             
-            try:
-                # 执行测试用例
-                testcase = case_result.testcase
-                report = TestExecutionService.run_testcase(testcase, environment, execution.executed_by)
+                try:
+                    # 执行测试用例
+                    testcase = case_result.testcase
+                    report = TestExecutionService.run_testcase(
+                        testcase, environment, execution.executed_by, function_cache, pool_registry,
+                        execution.record_level
+                    )
                 
-                # 更新用例结果
-                case_result.report = report
-                case_result.end_time = timezone.now()
-                case_result.duration = (case_result.end_time - case_result.start_time).total_seconds()
+                    # 更新用例结果
+                    case_result.report = report
+                    case_result.end_time = timezone.now()
+                    case_result.duration = (case_result.end_time - case_result.start_time).total_seconds()
                 
-                # 根据报告状态更新结果状态
-                if report.status == 'success':
-                    case_result.status = 'success'
-                    success_count += 1
-                else:
-                    case_result.status = 'failure'
-                    fail_count += 1
+                    # 根据报告状态更新结果状态
+                    if report.status == 'success':
+                        case_result.status = 'success'
+                        success_count += 1
+                    else:
+                        case_result.status = 'failure'
+                        fail_count += 1
                 
-                case_result.save()
+                    case_result.save()
                 
-                # 如果设置了快速失败且当前用例执行失败，则停止执行后续用例
-                if task_suite.fail_fast and report.status != 'success':
-                    logger.info(f"任务集[{task_suite.name}]设置了快速失败，当前用例[{testcase.name}]执行失败，停止执行后续用例")
-                    # 将剩余用例标记为已跳过
-                    for remaining in case_results.filter(status='pending'):
-                        remaining.status = 'skipped'
-                        remaining.save()
-                    break
+                    # 如果设置了快速失败且当前用例执行失败，则停止执行后续用例
+                    if task_suite.fail_fast and report.status != 'success':
+                        logger.info(f"任务集[{task_suite.name}]设置了快速失败，当前用例[{testcase.name}]执行失败，停止执行后续用例")
+                        # 将剩余用例标记为已跳过
+                        for remaining in case_results.filter(status='pending'):
+                            remaining.status = 'skipped'
+                            remaining.save()
+                        break
                 
-            except Exception as e:
-                # 处理执行异常
-                logger.error(f"执行用例[{case_result.testcase.name}]异常: {str(e)}")
-                case_result.status = 'error'
-                case_result.end_time = timezone.now()
-                case_result.duration = (case_result.end_time - case_result.start_time).total_seconds()
-                case_result.error_message = str(e)
-                case_result.save()
-                error_count += 1
+                except Exception as e:
+                    # 处理执行异常
+                    logger.error(f"执行用例[{case_result.testcase.name}]异常: {str(e)}")
+                    case_result.status = 'error'
+                    case_result.end_time = timezone.now()
+                    case_result.duration = (case_result.end_time - case_result.start_time).total_seconds()
+                    case_result.error_message = str(e)
+                    case_result.save()
+                    error_count += 1
                 
-                # 如果设置了快速失败，则停止执行后续用例
-                if task_suite.fail_fast:
-                    logger.info(f"任务集[{task_suite.name}]设置了快速失败，当前用例[{case_result.testcase.name}]执行异常，停止执行后续用例")
-                    # 将剩余用例标记为已跳过
-                    for remaining in case_results.filter(status='pending'):
-                        remaining.status = 'skipped'
-                        remaining.save()
-                    break
-        
+                    # 如果设置了快速失败，则停止执行后续用例
+                    if task_suite.fail_fast:
+                        logger.info(f"任务集[{task_suite.name}]设置了快速失败，当前用例[{case_result.testcase.name}]执行异常，停止执行后续用例")
+                        # 将剩余用例标记为已跳过
+                        for remaining in case_results.filter(status='pending'):
+                            remaining.status = 'skipped'
+                            remaining.save()
+                        break
+        finally:
+            # 先统计再关闭, 执行异常时连接池同样被关闭
+            pool_stats = pool_registry.get_stats()
+            pool_registry.close()
+
+        from utils.db_utils import get_database_pool_stats
+
         # 更新执行记录
-        execution.complete(success_count, fail_count, error_count)
+        execution.complete(success_count, fail_count, error_count, summary={
+            'connection_pool': pool_stats,
+            # 进程内累计的jmespath表达式编译缓存统计
+            'jmespath_cache': get_jmespath_cache_info(),
+            # 进程内共享的数据库引擎连接池统计
+            'database_pool': get_database_pool_stats()
+        })
         
     @staticmethod
     def execute_task_async(execution_id: int) -> None:
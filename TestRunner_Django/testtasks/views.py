@@ -389,7 +389,8 @@ class TestTaskExecutionViewSet(mixins.CreateModelMixin,
         execution = TestTaskExecutionService.create_execution(
             task_suite=task_suite,
             environment_id=environment_id,
-            user=request.user
+            user=request.user,
+            record_level=serializer.validated_data['record_level']
         )
         
         # 异步执行任务
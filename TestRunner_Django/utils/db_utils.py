@@ -108,8 +108,12 @@ add_log_handler(
 )
 
 try:
-    from sqlalchemy import create_engine, text
-    from sqlalchemy.orm import sessionmaker
+    from httprunner.database.engine import SESSION_STATE_PATTERN
+    from httprunner.database.pool import engine_registry
+    from httprunner.database.statement import compile_sql
+    from httprunner.database.stream import (
+        DEFAULT_CHUNK_SIZE, DEFAULT_MAX_ROWS, aggregate_rows, fetch_limited, limit_query, stream_rows
+    )
     SQL_READY = True
 except ImportError:
     SQL_READY = False
@@ -286,7 +290,10 @@ def get_database_connection(db_id: Optional[int] = None) -> Optional[str]:
 def execute_sql(
     sql: str, 
     db_uri: str, 
-    fetch_type: str = "all"
+    fetch_type: str = "all",
+    params: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None,
+    max_rows: int = 0,
+    chunk_size: int = 1000
 ) -> Union[Dict[str, Any], List[Dict[str, Any]], Dict[str, int]]:
     """
     执行SQL语句
@@ -294,12 +301,17 @@ def execute_sql(
     Args:
         sql: SQL语句
         db_uri: 数据库连接URI
-        fetch_type: 获取类型，可以是"one"、"all"或"none"
+        fetch_type: 获取类型，可以是"one"、"all"、"aggregate"或"none"
+        params: 命名绑定参数的值，如 where id = :id，传入字典列表时使用executemany批量执行
+        max_rows: "all"和"aggregate"最多读取的行数，超出部分不再读取，
+            "all"未设置时最多读取DEFAULT_MAX_ROWS行，"aggregate"未设置时不限制
+        chunk_size: 服务端游标每次往返读取的行数
         
     Returns:
         根据fetch_type返回不同类型的结果：
         - "one": 单条记录字典
         - "all": 记录字典列表
+        - "aggregate": 行数、校验和及前几行记录，不在内存中保留全部记录
         - "none": 执行结果字典，包含rowcount
     """
     # 验证SQL依赖
@@ -386,20 +398,39 @@ def execute_sql(
     logger.debug(f"准备执行SQL[{fetch_type}]: {sql}", db_uri=db_uri)
     
     operation_name = f"执行SQL({fetch_type})"
-    session = None
+    connection = None
     
     try:
-        # 创建数据库引擎和会话
-        engine = create_engine(db_uri)
-        Session = sessionmaker(bind=engine)
-        session = Session()
+        # 从进程内共享的引擎连接池获取连接，避免每条SQL都新建引擎和连接
+        connection = engine_registry.checkout(db_uri)
         
         # 执行SQL
         start_time = time.time()
         logger.debug(f"执行SQL: {sql}")
         
-        # 使用text()函数包装SQL语句，确保正确处理
-        result = session.execute(text(sql))
+        # 同一SQL模板只编译一次，参数值通过绑定参数传入而不是拼接到SQL中
+        statement = compile_sql(sql).statement
+        if isinstance(params, (list, tuple)):
+            # 批量执行，一次往返写入多行
+            fetch_type = "none"
+        
+        if fetch_type == "aggregate" or (fetch_type == "all" and sql.strip().upper()[:6] == "SELECT"):
+            # 使用服务端游标分批读取，避免大结果集占满内存
+            if fetch_type == "all" and not (max_rows and max_rows > 0):
+                max_rows = DEFAULT_MAX_ROWS
+            # 追加LIMIT, 服务端读满上限即停止发送, 否则关闭游标时仍会传输剩余行
+            statement = compile_sql(limit_query(sql, max_rows)).statement
+            rows = stream_rows(connection, statement, params, chunk_size or DEFAULT_CHUNK_SIZE)
+            if fetch_type == "aggregate":
+                result_data = aggregate_rows(rows, max_rows)
+            else:
+                result_data = [dict(row._mapping) for row in fetch_limited(rows, max_rows)]
+            elapsed = time.time() - start_time
+            logger.debug(f"SQL执行耗时: {elapsed:.3f}秒，流式读取完成")
+            log_db_operation(operation_name, db_uri=db_uri, sql=sql, result=result_data)
+            return result_data
+        
+        result = connection.execute(statement, params or None)
         
         # 获取结果
         if fetch_type == "one":
@@ -433,7 +464,7 @@ def execute_sql(
         else:
             # 非查询操作，返回影响的行数
             result_dict = {"rowcount": result.rowcount}
-            session.commit()
+            connection.commit()
             elapsed = time.time() - start_time
             logger.debug(f"SQL执行耗时: {elapsed:.3f}秒，影响行数: {result.rowcount}")
             log_db_operation(operation_name, db_uri=db_uri, sql=sql, result=result_dict)
@@ -449,12 +480,30 @@ def execute_sql(
         if 'elapsed' not in locals():
             elapsed = time.time() - start_time if 'start_time' in locals() else 0
         logger.debug(f"SQL执行结束，总耗时: {elapsed:.3f}秒")
-        if session:
+        if connection:
             try:
-                session.close()
-                logger.debug("数据库会话已关闭")
+                if SESSION_STATE_PATTERN.match(sql):
+                    # SET @var/SET SESSION/USE/临时表等会话状态不能带入连接池, 丢弃该连接
+                    connection.invalidate()
+                    logger.debug("SQL修改了会话状态, 数据库连接已丢弃")
+                # 未提交的事务回滚后连接归还连接池
+                connection.close()
+                logger.debug("数据库连接已归还连接池")
             except Exception as e:
-                logger.warning(f"关闭数据库会话失败: {str(e)}") 
+                logger.warning(f"归还数据库连接失败: {str(e)}")
+
+def dispose_database_engine(db_uri: str) -> bool:
+    """释放数据库连接URI对应的引擎及连接池，数据库配置变更或删除时调用"""
+    if not SQL_READY or not db_uri:
+        return False
+    return engine_registry.dispose(db_uri)
+
+def get_database_pool_stats() -> Dict[str, Any]:
+    """获取进程内数据库引擎连接池统计，包括连接获取耗时和连接使用情况"""
+    if not SQL_READY:
+        return {}
+    return engine_registry.get_stats()
+
 
 # 安全地关闭所有日志处理器
 def close_all_log_handlers():